@@ -0,0 +1,153 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Tuple, Optional
+from .ml_models import SequenceForecastDetector, TrainingReport
+from .model_registry import ModelRecord, ModelRegistry, to_watermark
+
+class AutoregressiveAnomalyDetector(SequenceForecastDetector):
+    METHOD = 'ar_forecast'
+    CHECKPOINT_NAME = 'ar'
+
+    def __init__(self, sequence_length: int = 10, threshold: float = 2.0,
+                 ridge_alpha: float = 1.0, registry: Optional[ModelRegistry] = None):
+        """
+        Initialize the autoregressive anomaly detector
+
+        A drop-in replacement for LSTMAnomalyDetector on CPU-only workers: the
+        next scaled close is forecast by a ridge-regularized linear model over
+        the same sequence_length windows, fitted in closed form with NumPy.
+
+        Args:
+            sequence_length (int): Number of time steps to use for prediction
+            threshold (float): Threshold for anomaly detection
+            ridge_alpha (float): L2 penalty on the AR coefficients
+            registry (ModelRegistry, optional): Registry the coefficients of each
+                symbol are checkpointed to after training, so incremental runs
+                can score new bars without the history
+        """
+        super().__init__(sequence_length, threshold, registry)
+        self.ridge_alpha = ridge_alpha
+        self.coef_ = None
+        self.intercept_ = 0.0
+
+    def train(self, data: pd.DataFrame, epochs: int = 50, batch_size: int = 32,
+              symbol: Optional[str] = None) -> TrainingReport:
+        """
+        Fit the AR coefficients and record the forecast error scale on data
+
+        Args:
+            data (pd.DataFrame): Training data
+            epochs (int): Ignored, the fit is closed-form; kept so the detector
+                can replace LSTMAnomalyDetector
+            batch_size (int): Ignored, see epochs
+            symbol (str, optional): Stock symbol the fit is checkpointed for;
+                training always refits, it is cheaper than loading a checkpoint
+
+        Returns:
+            TrainingReport: Time used by the fit
+        """
+        started = time.perf_counter()
+        X, y = self.prepare_sequences(data)
+        if len(X) == 0:
+            raise ValueError(f"Need more than {self.sequence_length} rows to train")
+        X, y = X[:, :, 0], y[:, 0]
+
+        # Ridge normal equations on centered windows, leaving the intercept unpenalized
+        n = len(X)
+        x_mean = X.mean(axis=0)
+        y_mean = y.mean()
+        gram = X.T @ X - n * np.outer(x_mean, x_mean)
+        gram[np.diag_indices_from(gram)] += self.ridge_alpha
+        cross = X.T @ y - n * x_mean * y_mean
+        self.coef_ = np.linalg.solve(gram, cross)
+        self.intercept_ = float(y_mean - x_mean @ self.coef_)
+        # One cheap pass, so cascade runs on this data skip the full forecast
+        self._fit_error_stats(data, self._scale(data, fit_scaler=False))
+        self._checkpoint = None
+        if self.registry is not None and symbol is not None:
+            self._save_checkpoint(symbol, data)
+
+        return TrainingReport(
+            symbol=symbol,
+            epochs=1,
+            max_epochs=1,
+            seconds=time.perf_counter() - started,
+            stop_reason='closed_form',
+            train_sequences=n
+        )
+
+    @property
+    def checkpoint_key(self) -> str:
+        """
+        Key of the model parameters and inputs a checkpoint depends on
+        """
+        return f"close|sequence_length={self.sequence_length}|ridge_alpha={self.ridge_alpha}"
+
+    def _save_checkpoint(self, symbol: str, data: pd.DataFrame) -> None:
+        record = self.registry.save(
+            symbol, self.CHECKPOINT_NAME, self.checkpoint_key,
+            watermark=to_watermark(data['date'].iloc[-1]),
+            payload={'coef': self.coef_, 'intercept': self.intercept_, 'scaler': self.scaler,
+                     'error_stats': self._error_stats},
+            metadata={'training_rows': len(data)}
+        )
+        self._checkpoint = (symbol, record.version)
+
+    def _restore_checkpoint(self, record: ModelRecord) -> None:
+        """
+        Load the coefficients, scaler and error stats of a checkpoint unless already loaded
+
+        Args:
+            record (ModelRecord): Checkpoint to load
+        """
+        if self._checkpoint != (record.symbol, record.version):
+            payload = self.registry.load(record)
+            self.coef_ = payload['coef']
+            self.intercept_ = payload['intercept']
+            self.scaler = payload['scaler']
+            self._forget_forecasts()
+            self._error_stats = payload['error_stats']
+            self._checkpoint = (record.symbol, record.version)
+
+    def _predict_sequences(self, data: pd.DataFrame, fit_scaler: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Forecast the next value after every sequence of data
+
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            fit_scaler (bool): Fit the scaler on this data instead of reusing it
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Scaled targets and predictions, (n, 1)
+        """
+        if self.coef_ is None:
+            raise RuntimeError("train() must be called before detecting anomalies")
+
+        scaled_data = self._scale(data, fit_scaler)
+        return scaled_data[self.sequence_length:], self._predict_scaled(scaled_data)
+
+    def _predict_scaled(self, scaled_data: np.ndarray, starts: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Forecast the value after windows of scaled data
+
+        Args:
+            scaled_data (np.ndarray): Scaled values with shape (n, 1)
+            starts (np.ndarray, optional): Start positions of the windows to use,
+                defaults to every window
+
+        Returns:
+            np.ndarray: Scaled predictions, (windows, 1)
+        """
+        if self.coef_ is None:
+            raise RuntimeError("train() must be called before detecting anomalies")
+
+        if starts is not None:
+            X, _ = self._windows(scaled_data, starts)
+            return (X[:, :, 0] @ self.coef_ + self.intercept_)[:, np.newaxis]
+        if len(scaled_data) <= self.sequence_length:
+            return np.empty((0, 1))
+
+        # Dot every window with the coefficients without materializing the windows
+        y_pred = np.convolve(scaled_data[:-1, 0], self.coef_[::-1], mode='valid') + self.intercept_
+        return y_pred[:, np.newaxis]
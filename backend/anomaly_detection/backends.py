@@ -0,0 +1,136 @@
+import importlib
+import importlib.util
+import logging
+from typing import List, Dict, Tuple, Optional, Sequence
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class DetectorBackend:
+    name: str
+    packages: Tuple[str, ...]
+    methods: Tuple[str, ...]
+
+# Backends in the order the hybrid detector runs their methods
+BACKENDS: Dict[str, DetectorBackend] = {
+    'statistical': DetectorBackend(
+        name='statistical',
+        packages=('numpy', 'pandas'),
+        methods=('bollinger_bands', 'zscore', 'volume')
+    ),
+    'isolation_forest': DetectorBackend(
+        name='isolation_forest',
+        packages=('sklearn',),
+        methods=('isolation_forest',)
+    ),
+    'lstm': DetectorBackend(
+        name='lstm',
+        packages=('sklearn', 'tensorflow'),
+        methods=('lstm',)
+    ),
+    'ar': DetectorBackend(
+        name='ar',
+        packages=('sklearn',),
+        methods=('lstm',)
+    )
+}
+
+# Backends that can fill the forecasting slot, reported under the 'lstm' key
+FORECASTERS: Tuple[str, ...] = ('lstm', 'ar')
+
+ALL_METHODS: Tuple[str, ...] = tuple(dict.fromkeys(
+    method for backend in BACKENDS.values() for method in backend.methods
+))
+
+def get_backend(name: str) -> DetectorBackend:
+    """
+    Look up a detector backend by name
+
+    Args:
+        name (str): Backend name, e.g. 'statistical' or 'lstm'
+
+    Returns:
+        DetectorBackend: The backend
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown detector backend '{name}', expected one of {list(BACKENDS)}")
+    return BACKENDS[name]
+
+def backend_for_method(method: str, forecaster: str = 'lstm') -> DetectorBackend:
+    """
+    Find the backend that produces a hybrid detection method
+
+    Args:
+        method (str): Method key, e.g. 'zscore' or 'isolation_forest'
+        forecaster (str): Backend filling the forecasting slot, 'lstm' or 'ar'
+
+    Returns:
+        DetectorBackend: Backend providing the method
+    """
+    if forecaster not in FORECASTERS:
+        raise ValueError(f"Unknown forecaster '{forecaster}', expected one of {list(FORECASTERS)}")
+    for backend in BACKENDS.values():
+        if method in backend.methods and (backend.name not in FORECASTERS or backend.name == forecaster):
+            return backend
+    raise ValueError(f"Unknown detection method '{method}', expected one of {list(ALL_METHODS)}")
+
+def missing_packages(name: str) -> List[str]:
+    """
+    List the packages of a backend that are not installed, without importing them
+
+    Args:
+        name (str): Backend name
+
+    Returns:
+        List[str]: Missing package names
+    """
+    return [package for package in get_backend(name).packages
+            if importlib.util.find_spec(package) is None]
+
+def is_available(name: str) -> bool:
+    return not missing_packages(name)
+
+def available_backends() -> List[str]:
+    return [name for name in BACKENDS if is_available(name)]
+
+def require(*names: str, preload: bool = False) -> None:
+    """
+    Declare the detector backends a process needs
+
+    Fails fast when a backend's packages are missing instead of when the first
+    detection runs. With preload, the packages are imported right away, e.g. to
+    pay TensorFlow's startup cost before a worker starts serving requests.
+
+    Args:
+        *names (str): Backend names
+        preload (bool): Import the backend packages now
+    """
+    missing = {name: missing_packages(name) for name in names}
+    missing = {name: packages for name, packages in missing.items() if packages}
+    if missing:
+        details = ', '.join(f"{name} needs {', '.join(packages)}" for name, packages in missing.items())
+        raise ImportError(f"Detector backends are not installed: {details}")
+
+    if preload:
+        for name in names:
+            for package in get_backend(name).packages:
+                importlib.import_module(package)
+            logger.info(f"Preloaded detector backend {name}")
+
+def resolve_methods(methods: Optional[Sequence[str]] = None, forecaster: str = 'lstm') -> List[str]:
+    """
+    Validate a selection of hybrid detection methods
+
+    Args:
+        methods (Sequence[str], optional): Method keys to run, defaults to all
+        forecaster (str): Backend filling the forecasting slot, 'lstm' or 'ar'
+
+    Returns:
+        List[str]: Selected methods in the order the hybrid detector runs them
+    """
+    if methods is None:
+        methods = ALL_METHODS
+    backends = list(dict.fromkeys(backend_for_method(method, forecaster).name for method in methods))
+    require(*backends)
+    return [method for method in ALL_METHODS if method in methods]
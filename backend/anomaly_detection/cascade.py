@@ -0,0 +1,73 @@
+import numpy as np
+from typing import Dict
+from dataclasses import dataclass, field
+
+# Methods the cascade restricts to candidate bars
+CASCADED_METHODS = ('isolation_forest', 'lstm')
+
+@dataclass
+class CascadeConfig:
+    """
+    Settings of the cheap-to-expensive detector cascade
+
+    near_threshold: Bars whose close or volume Z-score reaches this fraction of
+        num_std are candidates; 1.0 keeps only bars the statistical detectors flag
+    margin_before: Bars before each candidate that are scored too
+    margin_after: Bars after each candidate that are scored too
+    include_warm_up: Always score the first window_size bars, which have no
+        Z-score to screen them with
+    """
+    near_threshold: float = 0.6
+    margin_before: int = 2
+    margin_after: int = 2
+    include_warm_up: bool = True
+
+def candidate_rows(ratios: np.ndarray, config: CascadeConfig, warm_up: int = 0) -> np.ndarray:
+    """
+    Positions of the bars the expensive detectors score
+
+    Args:
+        ratios (np.ndarray): Threshold ratio of every bar, see
+            StatisticalAnomalyDetector.threshold_ratios
+        config (CascadeConfig): Cascade settings
+        warm_up (int): Number of leading bars without a full rolling window
+
+    Returns:
+        np.ndarray: Sorted positions of the near-threshold bars and their margins
+    """
+    near = np.asarray(ratios) >= config.near_threshold
+    if config.include_warm_up:
+        near[:warm_up] = True
+
+    # Bar j is scored if a near bar lies in [j - margin_after, j + margin_before]
+    n = len(near)
+    counts = np.concatenate([[0], np.cumsum(near)])
+    positions = np.arange(n)
+    upper = np.minimum(n, positions + config.margin_before + 1)
+    lower = np.maximum(0, positions - config.margin_after)
+    return np.flatnonzero(counts[upper] > counts[lower])
+
+@dataclass
+class CascadeReport:
+    """
+    Cascade run compared with a full run on the same data
+
+    recall is the share of each cascaded method's full-run anomaly dates the
+    cascade also reported; extra counts cascade anomalies on other dates.
+    """
+    bars: int
+    candidate_bars: int
+    full_seconds: float
+    cascade_seconds: float
+    full_anomalies: Dict[str, int] = field(default_factory=dict)
+    cascade_anomalies: Dict[str, int] = field(default_factory=dict)
+    recall: Dict[str, float] = field(default_factory=dict)
+    extra: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def scored_fraction(self) -> float:
+        return self.candidate_bars / self.bars if self.bars else 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.full_seconds / self.cascade_seconds if self.cascade_seconds else float('inf')
@@ -0,0 +1,152 @@
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, Optional
+
+ROLLING_STATS = ('mean', 'std', 'zscore')
+
+_ROLLING_PATTERN = re.compile(r'^(?P<column>.+)_rolling_(?P<stat>[a-z]+)_(?P<window>\d+)$')
+
+# Derived features computed from the raw OHLCV columns
+FEATURES: Dict[str, Callable[[pd.DataFrame], pd.Series]] = {
+    'returns': lambda data: data['close'].pct_change(),
+    'volume_change': lambda data: data['volume'].pct_change(),
+}
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """
+    Fingerprint of a DataFrame's index, columns, dtypes and values
+
+    Args:
+        data (pd.DataFrame): DataFrame to fingerprint
+
+    Returns:
+        str: Hex digest that changes whenever the data changes
+    """
+    digest = hashlib.sha1()
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in data.dtypes.items()]).encode())
+    digest.update(np.ascontiguousarray(pd.util.hash_pandas_object(data, index=True).to_numpy()).tobytes())
+    return digest.hexdigest()
+
+def rolling_feature(column: str, stat: str, window: int) -> str:
+    """
+    Name of a rolling feature
+
+    Args:
+        column (str): Aggregated column
+        stat (str): Rolling statistic, one of ROLLING_STATS
+        window (int): Size of the rolling window
+
+    Returns:
+        str: Feature name, e.g. 'close_rolling_mean_20'
+    """
+    if stat not in ROLLING_STATS:
+        raise ValueError(f"Unknown rolling statistic '{stat}', expected one of {list(ROLLING_STATS)}")
+    return f"{column}_rolling_{stat}_{window}"
+
+def feature_column(data: pd.DataFrame, name: str) -> pd.Series:
+    """
+    Read a feature from data, computing it if data doesn't carry it yet
+
+    Detectors call this for every feature they use, so a frame built by a
+    FeatureStore is read as-is and a plain OHLCV frame still works.
+
+    Args:
+        data (pd.DataFrame): OHLCV data, optionally with feature columns
+        name (str): Raw column, derived feature or rolling feature name
+
+    Returns:
+        pd.Series: Feature aligned with data
+    """
+    if name in data.columns:
+        return data[name]
+    if name in FEATURES:
+        return FEATURES[name](data).rename(name)
+
+    match = _ROLLING_PATTERN.match(name)
+    if match is None or match['stat'] not in ROLLING_STATS:
+        raise KeyError(f"Unknown feature '{name}'")
+    column, stat, window = match['column'], match['stat'], int(match['window'])
+    if stat == 'zscore':
+        mean = feature_column(data, rolling_feature(column, 'mean', window))
+        std = feature_column(data, rolling_feature(column, 'std', window))
+        return ((data[column] - mean) / std).rename(name)
+    return getattr(data[column].rolling(window=window), stat)().rename(name)
+
+class FeatureStore:
+    def __init__(self, max_entries: int = 8):
+        """
+        Initialize the feature store
+
+        Features are computed once per symbol and data range (identified by the
+        data fingerprint) and cached as one frame holding the raw columns and
+        every feature requested so far. Detectors declare their features with
+        required_features() and read them with feature_column(), so detectors
+        sharing a store share a single pass over the data.
+
+        Args:
+            max_entries (int): Maximum number of cached feature frames
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, data: pd.DataFrame, features: Iterable[str], symbol: Optional[str] = None,
+            fingerprint: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get data extended with the requested features
+
+        Features already cached for this symbol and data are reused; only the
+        missing ones are computed and added to the cached frame.
+
+        Args:
+            data (pd.DataFrame): OHLCV data
+            features (Iterable[str]): Feature names, see feature_column()
+            symbol (str, optional): Stock symbol the data belongs to
+            fingerprint (str, optional): data_fingerprint(data), if the caller
+                already computed it
+
+        Returns:
+            pd.DataFrame: The data columns followed by the feature columns
+        """
+        key = (symbol, fingerprint or data_fingerprint(data))
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is not None:
+                self._entries.move_to_end(key)
+        if frame is None:
+            frame = data.copy(deep=False)
+
+        missing = [name for name in dict.fromkeys(features) if name not in frame.columns]
+        if missing or key not in self._entries:
+            # Compute in declaration order so later features reuse earlier ones
+            for name in missing:
+                frame = frame.assign(**{name: feature_column(frame, name)})
+            with self._lock:
+                self._entries[key] = frame
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        # Copy-on-write keeps callers from modifying the cached frame
+        return frame.copy(deep=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """
+        Drop all cached feature frames
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __getstate__(self) -> Dict:
+        # Locks can't be pickled and cached frames aren't worth shipping to workers
+        return {'max_entries': self.max_entries}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state['max_entries'])
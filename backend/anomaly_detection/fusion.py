@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+from typing import List, Dict
+from .statistical_methods import AnomalyResult
+
+class AnomalyMatrix:
+    def __init__(self, all_anomalies: Dict[str, List[AnomalyResult]]):
+        """
+        Align the anomalies of several methods on a dates x methods matrix
+
+        Dates are numbered in order of first appearance, walking the methods in
+        dictionary order, so every reduction below visits anomalies in the same
+        order as a per-date loop would.
+
+        Args:
+            all_anomalies (Dict[str, List[AnomalyResult]]): Anomalies keyed by method
+        """
+        self.methods = list(all_anomalies)
+        self.anomalies = [anomaly for anomalies in all_anomalies.values() for anomaly in anomalies]
+        self.method_index = np.repeat(
+            np.arange(len(self.methods)),
+            [len(anomalies) for anomalies in all_anomalies.values()]
+        )
+        self.scores = np.array([anomaly.score for anomaly in self.anomalies], dtype=float)
+
+        dates = np.empty(len(self.anomalies), dtype=object)
+        dates[:] = [anomaly.date for anomaly in self.anomalies]
+        self.codes = self._date_codes(dates)
+        # Keep the first date object seen for every code, like the keys of a dict
+        _, first_seen = np.unique(self.codes, return_index=True)
+        self.dates = dates[first_seen]
+
+        # Number of anomalies each method reported on each date
+        self.counts = np.zeros((len(self.dates), len(self.methods)), dtype=np.int64)
+        np.add.at(self.counts, (self.codes, self.method_index), 1)
+
+    @staticmethod
+    def _date_codes(dates: np.ndarray) -> np.ndarray:
+        """
+        Number the dates in order of first appearance
+
+        Timestamps are hashed as int64 nanoseconds, which is much faster than
+        hashing the objects; other dates (strings, date objects, mixed time
+        zones) fall back to object equality.
+
+        Args:
+            dates (np.ndarray): Object array of dates
+
+        Returns:
+            np.ndarray: Code of every date
+        """
+        if pd.api.types.infer_dtype(dates, skipna=False) == 'datetime':
+            try:
+                return pd.factorize(pd.DatetimeIndex(dates).asi8)[0]
+            except (TypeError, ValueError, AttributeError):
+                pass
+        return pd.factorize(dates, use_na_sentinel=False)[0]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def anomaly_counts(self) -> np.ndarray:
+        """
+        Number of anomalies reported on each date, over all methods
+
+        Returns:
+            np.ndarray: Counts per date
+        """
+        return self.counts.sum(axis=1)
+
+    def detecting_methods(self, row: int) -> List[str]:
+        return [self.methods[column] for column in np.flatnonzero(self.counts[row])]
+
+    def weighted_scores(self, method_weights: Dict[str, float]) -> np.ndarray:
+        """
+        Sum of weight * score per date, missing methods weighing 0
+
+        Args:
+            method_weights (Dict[str, float]): Weight of each method
+
+        Returns:
+            np.ndarray: Weighted score per date, accumulated in anomaly order
+        """
+        weights = np.array([method_weights.get(method, 0.0) for method in self.methods], dtype=float)
+        sums = np.zeros(len(self.dates))
+        # add.at is unbuffered and applies in order, matching a running += per date
+        np.add.at(sums, self.codes, weights[self.method_index] * self.scores)
+        return sums
+
+    def best_anomalies(self) -> np.ndarray:
+        """
+        Position of the highest scoring anomaly of each date
+
+        Ties go to the first anomaly in method order, and a NaN score that
+        comes first wins, exactly like max() over the date's anomalies.
+
+        Returns:
+            np.ndarray: Index into anomalies for every date
+        """
+        n = len(self.anomalies)
+        order = np.lexsort((np.arange(n), -self.scores, self.codes))
+        sorted_codes = self.codes[order]
+        group_start = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]] if n else np.zeros(0, dtype=bool)
+        best = np.empty(len(self.dates), dtype=np.int64)
+        best[sorted_codes[group_start]] = order[group_start]
+
+        first = np.full(len(self.dates), n, dtype=np.int64)
+        np.minimum.at(first, self.codes, np.arange(n))
+        nan_first = np.isnan(self.scores[first]) if n else np.zeros(0, dtype=bool)
+        best[nan_first] = first[nan_first]
+        return best
+
+def consensus_anomalies(all_anomalies: Dict[str, List[AnomalyResult]],
+                        min_methods: int = 2) -> List[AnomalyResult]:
+    """
+    Anomalies reported at least min_methods times on the same date
+
+    Args:
+        all_anomalies (Dict[str, List[AnomalyResult]]): Anomalies keyed by method
+        min_methods (int): Minimum number of methods that must detect an anomaly
+
+    Returns:
+        List[AnomalyResult]: Highest scoring anomaly of each consensus date with
+        the detecting methods added to its details, sorted by date
+    """
+    matrix = AnomalyMatrix(all_anomalies)
+    counts = matrix.anomaly_counts()
+    best = matrix.best_anomalies()
+
+    consensus = []
+    for row in np.flatnonzero(counts >= min_methods):
+        best_anomaly = matrix.anomalies[best[row]]
+        consensus.append(AnomalyResult(
+            date=best_anomaly.date,
+            score=best_anomaly.score,
+            threshold=best_anomaly.threshold,
+            is_anomaly=best_anomaly.is_anomaly,
+            method=best_anomaly.method,
+            details={
+                **best_anomaly.details,
+                'detecting_methods': matrix.detecting_methods(row),
+                'method_count': int(counts[row])
+            }
+        ))
+    return sorted(consensus, key=lambda x: x.date)
+
+def weighted_anomalies(all_anomalies: Dict[str, List[AnomalyResult]],
+                       method_weights: Dict[str, float]) -> List[AnomalyResult]:
+    """
+    Combine the scores of all methods on each date into one weighted score
+
+    Args:
+        all_anomalies (Dict[str, List[AnomalyResult]]): Anomalies keyed by method
+        method_weights (Dict[str, float]): Weight of each method
+
+    Returns:
+        List[AnomalyResult]: One 'hybrid_weighted' anomaly per date with a
+        positive weighted score, sorted by date
+    """
+    matrix = AnomalyMatrix(all_anomalies)
+    scores = matrix.weighted_scores(method_weights)
+    best = matrix.best_anomalies()
+
+    weighted = []
+    for row in np.flatnonzero(scores > 0):
+        base_anomaly = matrix.anomalies[best[row]]
+        weighted.append(AnomalyResult(
+            date=matrix.dates[row],
+            score=scores[row],
+            threshold=1.0,  # Normalized threshold
+            is_anomaly=True,
+            method='hybrid_weighted',
+            details={
+                **base_anomaly.details,
+                'weighted_score': scores[row],
+                'detecting_methods': matrix.detecting_methods(row),
+                'method_weights': method_weights
+            }
+        ))
+    return sorted(weighted, key=lambda x: x.date)
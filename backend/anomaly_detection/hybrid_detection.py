@@ -1,7 +1,89 @@
-from typing import List, Dict
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import astuple
+from typing import Callable, List, Dict, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
+from .backends import resolve_methods
 from .statistical_methods import StatisticalAnomalyDetector, AnomalyResult
-from .ml_models import MLAnomalyDetector, LSTMAnomalyDetector
+from .ml_models import MLAnomalyDetector, LSTMAnomalyDetector, TrainingBudget
+from .autoregressive import AutoregressiveAnomalyDetector
+from .fusion import consensus_anomalies, weighted_anomalies
+from .feature_store import FeatureStore, data_fingerprint
+from .model_registry import ModelRegistry, RefitPolicy
+from .watermarks import WatermarkStore
+from .cascade import CASCADED_METHODS, CascadeConfig, CascadeReport, candidate_rows
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ('thread', 'process')
+
+# Methods whose models are fitted on, and score against, the whole history;
+# incremental runs score new bars with their stored models, or load the full
+# history when a model has to be fitted first
+FULL_HISTORY_METHODS = ('isolation_forest', 'lstm')
+
+# How often detector_timeout checks whether queued detectors have started
+_TIMEOUT_POLL_SECONDS = 0.05
+
+def _run_detector(unit: str, detector, methods: Sequence[str], data: pd.DataFrame,
+                  symbol: Optional[str], rows: Optional[np.ndarray] = None,
+                  fitted_only: bool = False) -> Dict[str, Optional[List[AnomalyResult]]]:
+    """
+    Run one detector of a hybrid run
+    
+    Defined at module level so process pools can pickle it.
+    
+    Args:
+        unit (str): 'statistical', 'isolation_forest', or the forecaster name
+        detector: Detector to run
+        methods (Sequence[str]): Selected detection methods
+        data (pd.DataFrame): DataFrame with price and volume data
+        symbol (str, optional): Stock symbol, used to reuse fitted models
+        rows (np.ndarray, optional): Cascade candidates, the only bars the
+            Isolation Forest and forecaster score; all bars if None
+        fitted_only (bool): Score with the registered Isolation Forest and
+            forecaster checkpoint instead of fitting on data
+        
+    Returns:
+        Dict[str, Optional[List[AnomalyResult]]]: Anomalies of each method the
+        detector ran; with fitted_only, None for a method whose model has to
+        be fitted first
+    """
+    results = {}
+    if unit == 'statistical':
+        if 'bollinger_bands' in methods:
+            results['bollinger_bands'] = detector.detect_bollinger_anomalies(data)
+        if 'zscore' in methods:
+            results['zscore'] = detector.detect_zscore_anomalies(data)
+        if 'volume' in methods:
+            results['volume'] = detector.detect_volume_anomalies(data)
+    elif unit == 'isolation_forest':
+        if fitted_only:
+            batch = detector.detect_registered_batch(data, symbol, rows)
+            results['isolation_forest'] = None if batch is None else batch.to_results()
+        else:
+            results['isolation_forest'] = detector.detect_isolation_forest_anomalies(data, symbol, rows=rows)
+    elif fitted_only:
+        batch = detector.detect_checkpoint_batch(data, symbol, rows)
+        results['lstm'] = None if batch is None else batch.to_results()
+    else:
+        # Train the forecaster (or restore and fine-tune its checkpoint) and detect anomalies
+        detector.train(data, symbol=symbol)
+        results['lstm'] = detector.detect_lstm_anomalies(data, rows)
+    return results
+
+def _warm_up_worker() -> int:
+    """
+    No-op task that makes a pool worker start and import this module
+    """
+    return os.getpid()
 
 class HybridAnomalyDetector:
     def __init__(self, 
@@ -9,7 +91,18 @@ class HybridAnomalyDetector:
                  num_std: float = 2.0,
                  contamination: float = 0.1,
                  sequence_length: int = 10,
-                 lstm_threshold: float = 2.0):
+                 lstm_threshold: float = 2.0,
+                 model_registry: Optional[ModelRegistry] = None,
+                 refit_policy: Optional[RefitPolicy] = None,
+                 methods: Optional[Sequence[str]] = None,
+                 forecaster: str = 'lstm',
+                 lstm_training_budget: Optional[TrainingBudget] = None,
+                 executor: Optional[str] = None,
+                 max_workers: Optional[int] = None,
+                 detector_timeout: Optional[float] = None,
+                 cache_size: int = 8,
+                 feature_store: Optional[FeatureStore] = None,
+                 cascade: Optional[CascadeConfig] = None):
         """
         Initialize the hybrid anomaly detector
         
@@ -19,106 +112,590 @@ class HybridAnomalyDetector:
             contamination (float): Expected proportion of anomalies for Isolation Forest
             sequence_length (int): Number of time steps for LSTM
             lstm_threshold (float): Threshold for LSTM anomaly detection
+            model_registry (ModelRegistry, optional): Registry of fitted models and
+                LSTM checkpoints reused across runs for each symbol
+            refit_policy (RefitPolicy, optional): When registered models are refitted
+            methods (Sequence[str], optional): Detection methods to run, any of
+                'bollinger_bands', 'zscore', 'volume', 'isolation_forest' and
+                'lstm'; defaults to all. Detectors of unselected methods are not
+                built, so e.g. TensorFlow is never loaded without 'lstm'
+            forecaster (str): Forecasting model behind the 'lstm' method, 'lstm'
+                for the Keras LSTM or 'ar' for the NumPy autoregressive model
+            lstm_training_budget (TrainingBudget, optional): Early stopping and
+                epoch / time caps for LSTM training
+            executor (str, optional): Run the statistical, Isolation Forest and
+                forecasting detectors concurrently in a 'thread' or 'process'
+                pool; by default they run one after another. Process pools work
+                on copies of the detectors, so fitted state stays in the workers
+                (registry checkpoints are still written)
+            max_workers (int, optional): Pool size, defaults to one worker per
+                detector
+            detector_timeout (float, optional): Seconds each detector may take,
+                counted from when it starts running; methods of detectors that
+                time out are left out of the results and listed in timed_out.
+                With the thread executor a timed-out detector keeps running in
+                its thread, so it is replaced by a fresh, unfitted detector
+            cache_size (int): Number of detection runs memoized by data
+                fingerprint, symbol and detector parameters, evicting the least
+                recently used; 0 disables memoization
+            feature_store (FeatureStore, optional): Store the detectors read
+                their features from, computed once per symbol and data range;
+                pass one store to several detectors to share it between them
+            cascade (CascadeConfig, optional): Screen bars with the statistical
+                Z-scores first and let Isolation Forest and the forecaster score
+                only candidate bars around near-threshold ones; see
+                evaluate_cascade() for the savings and recall
         """
-        self.statistical_detector = StatisticalAnomalyDetector(
-            window_size=window_size,
-            num_std=num_std
-        )
+        if executor is not None and executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {list(EXECUTORS)}")
+        self.methods = resolve_methods(methods, forecaster)
+        self.forecaster = forecaster
+        self.executor = executor
+        self.max_workers = max_workers
+        self.detector_timeout = detector_timeout
+        self.timed_out = []
+        self._executor = None
+        self.cache_size = cache_size
+        self._results_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.feature_store = feature_store if feature_store is not None else FeatureStore()
+        self.cascade = cascade
         
-        self.ml_detector = MLAnomalyDetector(
-            contamination=contamination
-        )
+        # Kept so detectors abandoned by a timed-out thread can be rebuilt
+        self._detector_settings = {
+            'window_size': window_size,
+            'num_std': num_std,
+            'contamination': contamination,
+            'sequence_length': sequence_length,
+            'lstm_threshold': lstm_threshold,
+            'model_registry': model_registry,
+            'refit_policy': refit_policy,
+            'lstm_training_budget': lstm_training_budget
+        }
+        self.statistical_detector = self._build_detector('statistical')
+        self.ml_detector = self._build_detector('isolation_forest') if 'isolation_forest' in self.methods else None
+        self.lstm_detector = self._build_detector(forecaster) if 'lstm' in self.methods else None
+
+    def _build_detector(self, unit: str):
+        """
+        Build a fresh, unfitted detector of a run
         
-        self.lstm_detector = LSTMAnomalyDetector(
-            sequence_length=sequence_length,
-            threshold=lstm_threshold
+        Args:
+            unit (str): 'statistical', 'isolation_forest', or the forecaster name
+            
+        Returns:
+            The detector
+        """
+        settings = self._detector_settings
+        if unit == 'statistical':
+            # Rolling aggregates come from the feature store, computed once per data
+            return StatisticalAnomalyDetector(
+                window_size=settings['window_size'],
+                num_std=settings['num_std'],
+                feature_store=self.feature_store
+            )
+        if unit == 'isolation_forest':
+            return MLAnomalyDetector(
+                contamination=settings['contamination'],
+                registry=settings['model_registry'],
+                refit_policy=settings['refit_policy']
+            )
+        if unit == 'ar':
+            return AutoregressiveAnomalyDetector(
+                sequence_length=settings['sequence_length'],
+                threshold=settings['lstm_threshold'],
+                registry=settings['model_registry']
+            )
+        return LSTMAnomalyDetector(
+            sequence_length=settings['sequence_length'],
+            threshold=settings['lstm_threshold'],
+            registry=settings['model_registry'],
+            training_budget=settings['lstm_training_budget']
         )
+
+    def _replace_detector(self, unit: str) -> None:
+        """
+        Swap a detector for a fresh one, leaving the old one to its thread
+        
+        Args:
+            unit (str): 'statistical', 'isolation_forest', or the forecaster name
+        """
+        if unit == 'statistical':
+            self.statistical_detector = self._build_detector(unit)
+        elif unit == 'isolation_forest':
+            self.ml_detector = self._build_detector(unit)
+        else:
+            self.lstm_detector = self._build_detector(unit)
         
-    def detect_anomalies(self, data: pd.DataFrame) -> Dict[str, List[AnomalyResult]]:
+
+    def detect_anomalies(self, data: pd.DataFrame,
+                         symbol: Optional[str] = None) -> Dict[str, List[AnomalyResult]]:
         """
         Detect anomalies using all methods
         
         Args:
             data (pd.DataFrame): DataFrame with price and volume data
+            symbol (str, optional): Stock symbol, used to reuse fitted models
+            
+        Returns:
+            Dict[str, List[AnomalyResult]]: Dictionary of anomalies detected by
+            each selected method. Results may be shared with the memoized run,
+            so treat them as read-only
+        """
+        fingerprint = data_fingerprint(data)
+        key = (fingerprint, symbol, self._params_key()) if self.cache_size > 0 else None
+        if key is not None:
+            with self._cache_lock:
+                cached = self._results_cache.get(key)
+                if cached is not None:
+                    self._results_cache.move_to_end(key)
+            if cached is not None:
+                self.timed_out = []
+                return {method: list(anomalies) for method, anomalies in cached.items()}
+        
+        results = self._run(data, symbol, fingerprint)
+        
+        # Incomplete runs are not memoized so a later call can retry the slow detectors
+        if key is not None and not self.timed_out:
+            with self._cache_lock:
+                self._results_cache[key] = results
+                while len(self._results_cache) > self.cache_size:
+                    self._results_cache.popitem(last=False)
+        return {method: list(anomalies) for method, anomalies in results.items()}
+
+    def _run(self, data: pd.DataFrame, symbol: Optional[str],
+             fingerprint: Optional[str] = None,
+             new_rows: Optional[np.ndarray] = None) -> Dict[str, Optional[List[AnomalyResult]]]:
+        """
+        Run the selected detectors, without memoization
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price and volume data
+            symbol (str, optional): Stock symbol, used to reuse fitted models
+            fingerprint (str, optional): data_fingerprint(data), if already computed
+            new_rows (np.ndarray, optional): Positions of the bars an incremental
+                run adds; if given, the Isolation Forest and forecaster score
+                only these bars with their stored models, see _run_detector
             
         Returns:
-            Dict[str, List[AnomalyResult]]: Dictionary of anomalies detected by each method
+            Dict[str, Optional[List[AnomalyResult]]]: Anomalies of each method,
+            in method order
         """
-        # Detect anomalies using statistical methods
-        bollinger_anomalies = self.statistical_detector.detect_bollinger_anomalies(data)
-        zscore_anomalies = self.statistical_detector.detect_zscore_anomalies(data)
-        volume_anomalies = self.statistical_detector.detect_volume_anomalies(data)
+        units = self._detector_units()
+        # One pass computes the features of every detector in the run
+        data = self.feature_store.get(data, self.required_features(), symbol, fingerprint)
+        rows = self.cascade_rows(data)
+        fitted_only = new_rows is not None
+        if fitted_only:
+            rows = new_rows if rows is None else np.intersect1d(rows, new_rows)
+        if self.executor is None:
+            self.timed_out = []
+            unit_results = {
+                unit: _run_detector(unit, detector, self.methods, data, symbol, rows, fitted_only)
+                for unit, detector in units
+            }
+        else:
+            unit_results = self._run_concurrently(units, data, symbol, rows, fitted_only)
         
-        # Detect anomalies using Isolation Forest
-        isolation_forest_anomalies = self.ml_detector.detect_isolation_forest_anomalies(data)
+        results = {}
+        for unit_result in unit_results.values():
+            results.update(unit_result)
+        # Merge in method order, whatever order the detectors finished in
+        return {method: results[method] for method in self.methods if method in results}
+
+    def cascade_rows(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Bars the expensive detectors score in cascade mode
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price and volume data
+            
+        Returns:
+            Optional[np.ndarray]: Candidate positions, None without a cascade
+        """
+        if self.cascade is None or not any(method in self.methods for method in CASCADED_METHODS):
+            return None
+        ratios = self.statistical_detector.threshold_ratios(data)
+        return candidate_rows(ratios, self.cascade, warm_up=self.statistical_detector.window_size)
+
+    def evaluate_cascade(self, data: pd.DataFrame, symbol: Optional[str] = None,
+                         cascade: Optional[CascadeConfig] = None) -> CascadeReport:
+        """
+        Compare a cascade run with a full run of the same detectors
+        
+        Neither run is memoized. Fitted state carries over from the full run to
+        the cascade run as it would between two normal runs.
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price and volume data
+            symbol (str, optional): Stock symbol, used to reuse fitted models
+            cascade (CascadeConfig, optional): Settings to evaluate, defaults to
+                the detector's cascade or CascadeConfig()
+            
+        Returns:
+            CascadeReport: Scored bars, timings and recall of the cascaded methods
+        """
+        configured = self.cascade
+        cascade = cascade or configured or CascadeConfig()
+        fingerprint = data_fingerprint(data)
+        try:
+            self.cascade = None
+            started = time.perf_counter()
+            full = self._run(data, symbol, fingerprint)
+            full_seconds = time.perf_counter() - started
+            
+            self.cascade = cascade
+            started = time.perf_counter()
+            cascaded = self._run(data, symbol, fingerprint)
+            cascade_seconds = time.perf_counter() - started
+            rows = self.cascade_rows(self.feature_store.get(data, self.required_features(), symbol, fingerprint))
+        finally:
+            self.cascade = configured
+        
+        report = CascadeReport(
+            bars=len(data),
+            candidate_bars=len(data) if rows is None else len(rows),
+            full_seconds=full_seconds,
+            cascade_seconds=cascade_seconds
+        )
+        for method in CASCADED_METHODS:
+            if method not in full or method not in cascaded:
+                continue
+            full_dates = {anomaly.date for anomaly in full[method]}
+            cascade_dates = {anomaly.date for anomaly in cascaded[method]}
+            report.full_anomalies[method] = len(full_dates)
+            report.cascade_anomalies[method] = len(cascade_dates)
+            report.recall[method] = len(full_dates & cascade_dates) / len(full_dates) if full_dates else 1.0
+            report.extra[method] = len(cascade_dates - full_dates)
+        return report
+
+    def required_features(self) -> Tuple[str, ...]:
+        """
+        Features read by the detectors of the selected methods
+        
+        Returns:
+            Tuple[str, ...]: Feature names, without duplicates
+        """
+        features = []
+        for unit, detector in self._detector_units():
+            if unit == 'statistical':
+                features += detector.required_features(self.methods)
+            else:
+                features += detector.required_features()
+        if self.cascade is not None:
+            # Candidates are screened with the close and volume Z-scores
+            features += self.statistical_detector.required_features(('zscore', 'volume'))
+        return tuple(dict.fromkeys(features))
+
+    def _params_key(self) -> Tuple:
+        """
+        Detector parameters that detection results depend on
+        
+        Returns:
+            Tuple: Hashable parameter values
+        """
+        key = [tuple(self.methods), self.forecaster,
+               self.statistical_detector.window_size, self.statistical_detector.num_std]
+        if self.ml_detector is not None:
+            key.append(self.ml_detector.contamination)
+        if self.lstm_detector is not None:
+            key.extend([self.lstm_detector.sequence_length, self.lstm_detector.threshold])
+        key.append(None if self.cascade is None else astuple(self.cascade))
+        return tuple(key)
+
+    def clear_cache(self) -> None:
+        """
+        Drop all memoized detection results and cached features
+        """
+        with self._cache_lock:
+            self._results_cache.clear()
+        self.feature_store.clear()
+
+    def _detector_units(self) -> List[Tuple[str, object]]:
+        """
+        Independent detectors of a run, in method order
         
-        # Train LSTM model and detect anomalies
-        self.lstm_detector.train(data)
-        lstm_anomalies = self.lstm_detector.detect_lstm_anomalies(data)
+        Returns:
+            List[Tuple[str, object]]: Detector names and detectors
+        """
+        units = []
+        if any(method in self.methods for method in ('bollinger_bands', 'zscore', 'volume')):
+            units.append(('statistical', self.statistical_detector))
+        if self.ml_detector is not None:
+            units.append(('isolation_forest', self.ml_detector))
+        if self.lstm_detector is not None:
+            units.append((self.forecaster, self.lstm_detector))
+        return units
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            workers = self.max_workers or max(len(self._detector_units()), 1)
+            if self.executor == 'thread':
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hybrid-detector')
+            else:
+                # Forking a process that has loaded TensorFlow can deadlock
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+                )
+                # Start the workers now so their startup doesn't count against detector_timeout
+                for future in [self._executor.submit(_warm_up_worker) for _ in range(workers)]:
+                    future.result()
+        return self._executor
+
+    def _discard_executor(self) -> None:
+        """
+        Drop a pool whose workers are stuck in timed-out detectors
+        """
+        executor, self._executor = self._executor, None
+        executor.shutdown(wait=False, cancel_futures=True)
+        if isinstance(executor, ProcessPoolExecutor):
+            # Threads can't be interrupted, but worker processes can be stopped
+            terminate = getattr(executor, 'terminate_workers', None)
+            if terminate is not None:
+                terminate()
+            else:
+                for process in list((getattr(executor, '_processes', None) or {}).values()):
+                    process.terminate()
+
+    def _run_concurrently(self, units: List[Tuple[str, object]], data: pd.DataFrame,
+                          symbol: Optional[str], rows: Optional[np.ndarray] = None,
+                          fitted_only: bool = False) -> Dict[str, Dict[str, List[AnomalyResult]]]:
+        """
+        Run detectors in the executor, waiting at most detector_timeout for each
         
-        return {
-            'bollinger_bands': bollinger_anomalies,
-            'zscore': zscore_anomalies,
-            'volume': volume_anomalies,
-            'isolation_forest': isolation_forest_anomalies,
-            'lstm': lstm_anomalies
+        Args:
+            units (List[Tuple[str, object]]): Detector names and detectors
+            data (pd.DataFrame): DataFrame with price and volume data
+            symbol (str, optional): Stock symbol, used to reuse fitted models
+            rows (np.ndarray, optional): Cascade candidates, see _run_detector
+            fitted_only (bool): Score with stored models only, see _run_detector
+            
+        Returns:
+            Dict[str, Dict[str, List[AnomalyResult]]]: Results of each detector
+            that finished in time
+        """
+        executor = self._get_executor()
+        pending = {
+            executor.submit(_run_detector, unit, detector, self.methods, data, symbol, rows, fitted_only): unit
+            for unit, detector in units
         }
         
+        finished = {}
+        self.timed_out = []
+        if self.detector_timeout is None:
+            wait(pending)
+            finished = {unit: future for future, unit in pending.items()}
+            pending = {}
+        started = {}
+        while pending:
+            # Each detector's budget starts when a worker picks it up, so one slow
+            # detector doesn't use up the time of those queued behind it
+            now = time.monotonic()
+            for future in pending:
+                if future not in started and (future.running() or future.done()):
+                    started[future] = now
+            for future in [future for future in pending if future.done()]:
+                finished[pending.pop(future)] = future
+            for future in [future for future, start in started.items()
+                           if future in pending and now - start >= self.detector_timeout]:
+                unit = pending.pop(future)
+                future.cancel()
+                self.timed_out.append(unit)
+                logger.warning(f"{unit} detector timed out after {self.detector_timeout}s for {symbol}")
+            if pending:
+                remaining = [self.detector_timeout - (now - started[future])
+                             for future in pending if future in started]
+                wait(pending, timeout=min(remaining + [_TIMEOUT_POLL_SECONDS]),
+                     return_when=FIRST_COMPLETED)
+        
+        # Collect in submission order so a failing detector raises like a sequential run
+        unit_results = {unit: finished[unit].result() for unit, _ in units if unit in finished}
+        
+        if self.timed_out:
+            if isinstance(executor, ThreadPoolExecutor):
+                # The abandoned threads still hold and modify these detectors
+                for unit in self.timed_out:
+                    self._replace_detector(unit)
+            # Workers stuck in a timed-out detector can't be reused, start a fresh pool next run
+            self._discard_executor()
+        return unit_results
+
+    def close(self) -> None:
+        """
+        Shut down the detector pool, if one was started
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> 'HybridAnomalyDetector':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+        
+    def warm_up_rows(self) -> int:
+        """
+        Rows of history a new bar needs before every selected method scores it
+        
+        Returns:
+            int: Number of bars to load before the watermark
+        """
+        # Returns and volume changes need the previous bar
+        rows = [1]
+        if any(method in self.methods for method in ('bollinger_bands', 'zscore', 'volume')):
+            rows.append(self.statistical_detector.window_size)
+        if self.lstm_detector is not None:
+            rows.append(self.lstm_detector.sequence_length)
+        return max(rows)
+
+    def detect_new_anomalies(self, data: pd.DataFrame, symbol: str,
+                             watermarks: WatermarkStore) -> Dict[str, List[AnomalyResult]]:
+        """
+        Detect anomalies and report only those after each method's watermark
+        
+        The watermark of every method that completed is then moved to the last
+        bar of data; methods that timed out keep theirs and rescan next time.
+        
+        Args:
+            data (pd.DataFrame): Warm-up rows followed by the new rows
+            symbol (str): Stock symbol
+            watermarks (WatermarkStore): Store of the last scored bar per method
+            
+        Returns:
+            Dict[str, List[AnomalyResult]]: Anomalies of each method newer than
+            its watermark
+        """
+        if len(data) == 0:
+            return {method: [] for method in self.methods}
+        return self._report_new_anomalies(self.detect_anomalies(data, symbol), data, symbol, watermarks)
+
+    def _report_new_anomalies(self, results: Dict[str, List[AnomalyResult]], data: pd.DataFrame,
+                              symbol: str, watermarks: WatermarkStore) -> Dict[str, List[AnomalyResult]]:
+        """
+        Keep the anomalies after each method's watermark and move the watermarks
+        
+        Args:
+            results (Dict[str, List[AnomalyResult]]): Anomalies of each method
+                that completed on data
+            data (pd.DataFrame): Data the methods ran on
+            symbol (str): Stock symbol
+            watermarks (WatermarkStore): Store of the last scored bar per method
+            
+        Returns:
+            Dict[str, List[AnomalyResult]]: Anomalies of each method newer than
+            its watermark
+        """
+        stored = watermarks.get_many(symbol, self.methods)
+        new_anomalies = {}
+        for method, anomalies in results.items():
+            if stored[method] is None:
+                new_anomalies[method] = anomalies
+            else:
+                cutoff = pd.Timestamp(stored[method])
+                new_anomalies[method] = [anomaly for anomaly in anomalies
+                                         if pd.Timestamp(anomaly.date) > cutoff]
+        
+        last_date = data['date'].max()
+        watermarks.update(symbol, {method: last_date for method in results})
+        return new_anomalies
+
+    def _has_fitted_models(self, symbol: str) -> bool:
+        """
+        Whether every selected model method has a stored model for a symbol
+        
+        Args:
+            symbol (str): Stock symbol
+            
+        Returns:
+            bool: True if the Isolation Forest and forecaster, when selected,
+            can score new bars without the history
+        """
+        if self.ml_detector is not None and not self.ml_detector.has_registered_model(symbol):
+            return False
+        if self.lstm_detector is not None and not self.lstm_detector.has_checkpoint(symbol):
+            return False
+        return True
+
+    def detect_incremental(self, load_data: Callable[[str, Optional[str], int], pd.DataFrame],
+                           symbol: str, watermarks: WatermarkStore,
+                           warm_up_rows: Optional[int] = None) -> Dict[str, List[AnomalyResult]]:
+        """
+        Load and score only the bars added since the last run
+        
+        Only warm_up_rows of history before the oldest watermark are loaded.
+        The statistical methods give the same anomalies as a full run. The
+        Isolation Forest and forecaster score the new bars with the models
+        stored in the model registry, as a scoring-only full run would; the
+        full history is loaded, and the models fitted on it, only when a
+        method was never scored, a model isn't stored yet or the Isolation
+        Forest's refit policy asks for a refit. Forecaster checkpoints only
+        move forward in full runs (detect_anomalies), which fine-tune them.
+        
+        Args:
+            load_data (Callable): Loader called as load_data(symbol, watermark,
+                warm_up_rows) that returns the warm-up rows at or before the
+                watermark followed by the newer rows, e.g.
+                DatabaseManager.get_stock_data_since
+            symbol (str): Stock symbol
+            watermarks (WatermarkStore): Store of the last scored bar per method
+            warm_up_rows (int, optional): History loaded before the watermark,
+                defaults to warm_up_rows()
+            
+        Returns:
+            Dict[str, List[AnomalyResult]]: Anomalies of each method newer than
+            its watermark
+        """
+        stored = watermarks.get_many(symbol, self.methods)
+        # Load from the oldest watermark; a method never scored needs the full history
+        oldest = min(stored.values(), key=pd.Timestamp) if all(stored.values()) else None
+        uses_models = any(method in FULL_HISTORY_METHODS for method in self.methods)
+        since = oldest if not uses_models or self._has_fitted_models(symbol) else None
+        
+        if warm_up_rows is None:
+            warm_up_rows = self.warm_up_rows()
+        data = load_data(symbol, since, warm_up_rows)
+        if len(data) == 0 or (oldest is not None and pd.Timestamp(data['date'].max()) <= pd.Timestamp(oldest)):
+            logger.info(f"No new bars for {symbol} since {oldest}")
+            return {method: [] for method in self.methods}
+        if since is None or not uses_models:
+            return self.detect_new_anomalies(data, symbol, watermarks)
+        
+        new_rows = np.flatnonzero((pd.to_datetime(data['date']) > pd.Timestamp(oldest)).to_numpy())
+        results = self._run(data, symbol, new_rows=new_rows)
+        refit = [method for method, anomalies in results.items() if anomalies is None]
+        if refit:
+            logger.info(f"{refit} must be fitted for {symbol}, loading the full history")
+            return self.detect_new_anomalies(load_data(symbol, None, warm_up_rows), symbol, watermarks)
+        return self._report_new_anomalies(results, data, symbol, watermarks)
+
     def get_consensus_anomalies(self, data: pd.DataFrame, 
-                              min_methods: int = 2) -> List[AnomalyResult]:
+                              min_methods: int = 2,
+                              symbol: Optional[str] = None) -> List[AnomalyResult]:
         """
         Get anomalies detected by multiple methods
         
         Args:
             data (pd.DataFrame): DataFrame with price and volume data
             min_methods (int): Minimum number of methods that must detect an anomaly
+            symbol (str, optional): Stock symbol, used to reuse fitted models
             
         Returns:
             List[AnomalyResult]: List of consensus anomalies
         """
-        all_anomalies = self.detect_anomalies(data)
-        
-        # Create a dictionary to count anomalies by date
-        anomaly_counts = {}
-        
-        # Count anomalies by date for each method
-        for method, anomalies in all_anomalies.items():
-            for anomaly in anomalies:
-                date = anomaly.date
-                if date not in anomaly_counts:
-                    anomaly_counts[date] = {
-                        'count': 0,
-                        'methods': set(),
-                        'anomalies': []
-                    }
-                anomaly_counts[date]['count'] += 1
-                anomaly_counts[date]['methods'].add(method)
-                anomaly_counts[date]['anomalies'].append(anomaly)
-        
-        # Filter for dates with enough method agreement
-        consensus_anomalies = []
-        for date, info in anomaly_counts.items():
-            if info['count'] >= min_methods:
-                # Use the anomaly with the highest score
-                best_anomaly = max(info['anomalies'], 
-                                 key=lambda x: x.score)
-                
-                # Add method information to details
-                best_anomaly.details['detecting_methods'] = list(info['methods'])
-                best_anomaly.details['method_count'] = info['count']
-                
-                consensus_anomalies.append(best_anomaly)
-        
-        return sorted(consensus_anomalies, key=lambda x: x.date)
+        all_anomalies = self.detect_anomalies(data, symbol)
+        return consensus_anomalies(all_anomalies, min_methods)
         
     def get_weighted_anomalies(self, data: pd.DataFrame,
-                             method_weights: Dict[str, float] = None) -> List[AnomalyResult]:
+                             method_weights: Dict[str, float] = None,
+                             symbol: Optional[str] = None) -> List[AnomalyResult]:
         """
         Get weighted anomaly scores combining all methods
         
         Args:
             data (pd.DataFrame): DataFrame with price and volume data
             method_weights (Dict[str, float]): Weights for each method
+            symbol (str, optional): Stock symbol, used to reuse fitted models
             
         Returns:
             List[AnomalyResult]: List of weighted anomalies
@@ -132,48 +709,5 @@ class HybridAnomalyDetector:
                 'lstm': 0.2
             }
             
-        all_anomalies = self.detect_anomalies(data)
-        
-        # Create a dictionary to store weighted scores by date
-        weighted_scores = {}
-        
-        # Calculate weighted scores for each date
-        for method, anomalies in all_anomalies.items():
-            weight = method_weights.get(method, 0.0)
-            for anomaly in anomalies:
-                date = anomaly.date
-                if date not in weighted_scores:
-                    weighted_scores[date] = {
-                        'score': 0.0,
-                        'methods': set(),
-                        'anomalies': []
-                    }
-                weighted_scores[date]['score'] += weight * anomaly.score
-                weighted_scores[date]['methods'].add(method)
-                weighted_scores[date]['anomalies'].append(anomaly)
-        
-        # Create weighted anomaly results
-        weighted_anomalies = []
-        for date, info in weighted_scores.items():
-            if info['score'] > 0:  # Only include dates with positive weighted scores
-                # Use the anomaly with the highest score as base
-                base_anomaly = max(info['anomalies'], 
-                                 key=lambda x: x.score)
-                
-                # Create new anomaly result with weighted score
-                weighted_anomaly = AnomalyResult(
-                    date=date,
-                    score=info['score'],
-                    threshold=1.0,  # Normalized threshold
-                    is_anomaly=True,
-                    method='hybrid_weighted',
-                    details={
-                        **base_anomaly.details,
-                        'weighted_score': info['score'],
-                        'detecting_methods': list(info['methods']),
-                        'method_weights': method_weights
-                    }
-                )
-                weighted_anomalies.append(weighted_anomaly)
-        
-        return sorted(weighted_anomalies, key=lambda x: x.date) 
\ No newline at end of file
+        all_anomalies = self.detect_anomalies(data, symbol)
+        return weighted_anomalies(all_anomalies, method_weights)
@@ -0,0 +1,392 @@
+import math
+import pandas as pd
+from typing import List, Dict, Optional
+from .statistical_methods import AnomalyResult
+
+class RollingWindow:
+    def __init__(self, window_size: int, resync_interval: Optional[int] = None):
+        """
+        Initialize a fixed-size ring buffer with running sums
+
+        Sums are kept relative to a shift value to limit cancellation error and
+        are recomputed from the buffer every resync_interval updates, which keeps
+        the amortized cost per update constant. NaNs are kept out of the sums
+        and counted, so like pandas rolling() the window is NaN exactly while
+        it holds one.
+
+        Args:
+            window_size (int): Number of values in the window
+            resync_interval (int, optional): Updates between exact recomputations
+                of the running sums, defaults to window_size
+        """
+        self.window_size = window_size
+        self.resync_interval = resync_interval or window_size
+        self.buffer = [0.0] * window_size
+        self.position = 0
+        self.count = 0
+        self.shift = 0.0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.updates = 0
+        self.last_value = None
+        self.same_count = 0
+        self.nan_count = 0
+
+    def push(self, value: float) -> None:
+        """
+        Add a value to the window, evicting the oldest one when full
+
+        Args:
+            value (float): New value
+        """
+        value = float(value)
+        if self.count == self.window_size:
+            evicted = self.buffer[self.position]
+            if math.isnan(evicted):
+                self.nan_count -= 1
+            else:
+                old = evicted - self.shift
+                self.total -= old
+                self.total_sq -= old * old
+        else:
+            self.count += 1
+
+        self.buffer[self.position] = value
+        self.position = (self.position + 1) % self.window_size
+
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            delta = value - self.shift
+            self.total += delta
+            self.total_sq += delta * delta
+
+        # Track runs of identical values so flat windows report an exact zero std
+        if value == self.last_value:
+            self.same_count += 1
+        else:
+            self.last_value = value
+            self.same_count = 1
+
+        self.updates += 1
+        if self.updates % self.resync_interval == 0:
+            self._resync()
+
+    def _resync(self) -> None:
+        """
+        Recompute the running sums from the buffer around the latest value
+        """
+        values = [v for v in self._values() if not math.isnan(v)]
+        if self.last_value is not None and not math.isnan(self.last_value):
+            self.shift = self.last_value
+        self.total = sum(v - self.shift for v in values)
+        self.total_sq = sum((v - self.shift) ** 2 for v in values)
+        self.nan_count = self.count - len(values)
+
+    def _values(self) -> List[float]:
+        if self.count < self.window_size:
+            return self.buffer[:self.count]
+        return self.buffer[self.position:] + self.buffer[:self.position]
+
+    def is_full(self) -> bool:
+        return self.count == self.window_size
+
+    def mean(self) -> float:
+        """
+        Mean of the values in the window
+
+        Returns:
+            float: Window mean, NaN while the window holds a NaN
+        """
+        if self.nan_count:
+            return math.nan
+        if self.same_count >= self.count:
+            return self.last_value
+        return self.shift + self.total / self.count
+
+    def std(self) -> float:
+        """
+        Sample standard deviation (ddof=1) of the values in the window
+
+        Returns:
+            float: Window standard deviation, NaN with fewer than two values or
+            while the window holds a NaN
+        """
+        if self.count < 2 or self.nan_count:
+            return math.nan
+        if self.same_count >= self.count:
+            return 0.0
+        variance = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def to_dict(self) -> Dict:
+        return {
+            'window_size': self.window_size,
+            'resync_interval': self.resync_interval,
+            'values': self._values(),
+            'updates': self.updates,
+            'same_count': self.same_count
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'RollingWindow':
+        window = cls(state['window_size'], state['resync_interval'])
+        for value in state['values']:
+            window.push(value)
+        window.updates = state['updates']
+        window.same_count = state['same_count']
+        window._resync()
+        return window
+
+def _bar_time(date) -> pd.Timestamp:
+    """
+    Normalize a bar date for ordering, keeping the local wall time like storage
+
+    Args:
+        date: Date of a bar
+
+    Returns:
+        pd.Timestamp: Naive timestamp
+    """
+    timestamp = pd.Timestamp(date)
+    return timestamp.tz_localize(None) if timestamp.tzinfo is not None else timestamp
+
+class IncrementalStatisticalDetector:
+    def __init__(self, window_size: int = 20, num_std: float = 2.0,
+                 resync_interval: Optional[int] = None):
+        """
+        Initialize the incremental statistical anomaly detector
+
+        Keeps a ring buffer of closes and volumes per symbol and scores each new
+        bar in constant time with the same rules as StatisticalAnomalyDetector.
+        Bars at or before the last bar pushed for a symbol are skipped, so
+        overlapping fetches can't add a bar to the windows twice.
+
+        Args:
+            window_size (int): Size of the rolling window for calculations
+            num_std (float): Number of standard deviations for threshold
+            resync_interval (int, optional): Updates between exact recomputations
+                of the running sums, defaults to window_size
+        """
+        self.window_size = window_size
+        self.num_std = num_std
+        self.resync_interval = resync_interval
+        self.states = {}
+
+    def _get_state(self, symbol: str) -> Dict:
+        if symbol not in self.states:
+            self.states[symbol] = {
+                'bars': 0,
+                'last_date': None,
+                'close': RollingWindow(self.window_size, self.resync_interval),
+                'volume': RollingWindow(self.window_size, self.resync_interval)
+            }
+        return self.states[symbol]
+
+    def has_symbol(self, symbol: str) -> bool:
+        return symbol in self.states
+
+    def last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """
+        Date of the last bar pushed for a symbol
+
+        Args:
+            symbol (str): Stock symbol
+
+        Returns:
+            Optional[pd.Timestamp]: Naive date, None if no bar was pushed
+        """
+        state = self.states.get(symbol)
+        return None if state is None else state['last_date']
+
+    def update(self, symbol: str, date, close: float, volume: float) -> List[AnomalyResult]:
+        """
+        Add a new bar for a symbol and score it
+
+        Args:
+            symbol (str): Stock symbol
+            date: Date of the bar
+            close (float): Close price
+            volume (float): Traded volume
+
+        Returns:
+            List[AnomalyResult]: Anomalies detected on this bar by any method,
+            empty if the bar is not newer than the last one pushed
+        """
+        state = self._get_state(symbol)
+        bar_time = _bar_time(date)
+        if state['last_date'] is not None and bar_time <= state['last_date']:
+            return []
+        state['last_date'] = bar_time
+        state['close'].push(close)
+        state['volume'].push(volume)
+        state['bars'] += 1
+
+        # The batch detectors skip the first window_size rows
+        if state['bars'] <= self.window_size:
+            return []
+
+        anomalies = []
+        mean = state['close'].mean()
+        std = state['close'].std()
+
+        bollinger = self._score_bollinger(date, close, mean, std)
+        if bollinger is not None:
+            anomalies.append(bollinger)
+
+        zscore = self._score_zscore(date, close, mean, std, 'price', 'zscore')
+        if zscore is not None:
+            anomalies.append(zscore)
+
+        volume_anomaly = self._score_zscore(date, volume, state['volume'].mean(),
+                                            state['volume'].std(), 'volume', 'volume_zscore')
+        if volume_anomaly is not None:
+            anomalies.append(volume_anomaly)
+
+        return anomalies
+
+    def _score_bollinger(self, date, price: float, mean: float, std: float) -> Optional[AnomalyResult]:
+        upper_band = mean + (std * self.num_std)
+        lower_band = mean - (std * self.num_std)
+
+        if not (price > upper_band or price < lower_band):
+            return None
+
+        upper_deviation = (price - upper_band) / upper_band * 100
+        lower_deviation = (price - lower_band) / lower_band * 100
+        return AnomalyResult(
+            date=date,
+            score=max(abs(upper_deviation), abs(lower_deviation)),
+            threshold=self.num_std,
+            is_anomaly=True,
+            method='bollinger_bands',
+            details={
+                'price': price,
+                'middle_band': mean,
+                'upper_band': upper_band,
+                'lower_band': lower_band,
+                'upper_deviation': upper_deviation,
+                'lower_deviation': lower_deviation
+            }
+        )
+
+    def _score_zscore(self, date, value: float, mean: float, std: float,
+                      detail_key: str, method: str) -> Optional[AnomalyResult]:
+        if std == 0:
+            # Matches pandas: a flat window gives an undefined or infinite z-score
+            z_score = math.nan if value == mean else math.copysign(math.inf, value - mean)
+        else:
+            z_score = (value - mean) / std
+
+        if not abs(z_score) > self.num_std:
+            return None
+
+        return AnomalyResult(
+            date=date,
+            score=abs(z_score),
+            threshold=self.num_std,
+            is_anomaly=True,
+            method=method,
+            details={
+                detail_key: value,
+                'z_score': z_score,
+                'rolling_mean': mean,
+                'rolling_std': std
+            }
+        )
+
+    def warm_up(self, symbol: str, data: pd.DataFrame) -> List[AnomalyResult]:
+        """
+        Feed historical bars for a symbol in date order
+
+        Args:
+            symbol (str): Stock symbol
+            data (pd.DataFrame): DataFrame with 'date', 'close' and 'volume'
+
+        Returns:
+            List[AnomalyResult]: Anomalies detected while replaying the history
+        """
+        anomalies = []
+        for date, close, volume in zip(data['date'], data['close'], data['volume']):
+            anomalies.extend(self.update(symbol, date, close, volume))
+        return anomalies
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """
+        Drop the state of one symbol, or of all symbols
+
+        Args:
+            symbol (str, optional): Symbol to reset
+        """
+        if symbol is None:
+            self.states.clear()
+        else:
+            self.states.pop(symbol, None)
+
+    def snapshot(self) -> Dict:
+        """
+        Capture the detector state as a JSON-serializable dictionary
+
+        Returns:
+            Dict: Detector parameters and per-symbol window state
+        """
+        return {
+            'window_size': self.window_size,
+            'num_std': self.num_std,
+            'resync_interval': self.resync_interval,
+            'symbols': {
+                symbol: {
+                    'bars': state['bars'],
+                    'last_date': None if state['last_date'] is None else state['last_date'].isoformat(),
+                    'close': state['close'].to_dict(),
+                    'volume': state['volume'].to_dict()
+                }
+                for symbol, state in self.states.items()
+            }
+        }
+
+    def load_snapshot(self, snapshot: Dict) -> None:
+        """
+        Replace the per-symbol state with the state saved in a snapshot
+
+        The detector keeps its own num_std and resync_interval; only the
+        window size has to match, since the saved windows hold that many bars.
+
+        Args:
+            snapshot (Dict): Output of snapshot()
+
+        Raises:
+            ValueError: If the snapshot was taken with another window size
+        """
+        if snapshot['window_size'] != self.window_size:
+            raise ValueError(f"Snapshot window size {snapshot['window_size']} doesn't match "
+                             f"the detector window size {self.window_size}")
+        states = {}
+        for symbol, state in snapshot['symbols'].items():
+            last_date = state.get('last_date')
+            states[symbol] = {
+                'bars': state['bars'],
+                'last_date': None if last_date is None else pd.Timestamp(last_date),
+                'close': RollingWindow.from_dict({**state['close'], 'resync_interval': self.resync_interval}),
+                'volume': RollingWindow.from_dict({**state['volume'], 'resync_interval': self.resync_interval})
+            }
+        self.states = states
+
+    @classmethod
+    def restore(cls, snapshot: Dict) -> 'IncrementalStatisticalDetector':
+        """
+        Rebuild a detector from a snapshot
+
+        Args:
+            snapshot (Dict): Output of snapshot()
+
+        Returns:
+            IncrementalStatisticalDetector: Detector with the saved state
+        """
+        detector = cls(
+            window_size=snapshot['window_size'],
+            num_std=snapshot['num_std'],
+            resync_interval=snapshot['resync_interval']
+        )
+        detector.load_snapshot(snapshot)
+        return detector
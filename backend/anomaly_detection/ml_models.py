@@ -1,184 +1,1517 @@
+import time
+import logging
 import numpy as np
 import pandas as pd
+from abc import ABC, abstractmethod
+from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
+import sklearn
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional, Iterator, TYPE_CHECKING
 from dataclasses import dataclass
-from .statistical_methods import AnomalyResult
+from .statistical_methods import AnomalyResult, AnomalyBatch
+from .feature_store import feature_column, data_fingerprint
+from .model_registry import ModelRecord, ModelRegistry, RefitPolicy, AgeRefitPolicy, to_watermark
+
+if TYPE_CHECKING:
+    import tensorflow as tf
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class TrainingBudget:
+    """
+    Compute budget for LSTM training
+    
+    max_epochs caps the epochs passed to train(), max_seconds stops training
+    once another epoch would exceed the wall-clock budget, and the last
+    validation_fraction of the sequences (in time order, per symbol) is held
+    out for early stopping with the given patience.
+    """
+    max_epochs: Optional[int] = None
+    max_seconds: Optional[float] = None
+    patience: int = 5
+    min_delta: float = 0.0
+    validation_fraction: float = 0.1
+
+@dataclass
+class TrainingReport:
+    symbol: Optional[str]
+    epochs: int
+    max_epochs: int
+    seconds: float
+    stop_reason: str
+    train_sequences: int
+    validation_sequences: int = 0
+    best_val_loss: Optional[float] = None
+
+def _load_tensorflow():
+    """
+    Import TensorFlow on first use
+    
+    TensorFlow takes seconds and hundreds of MB to import, so it is only loaded
+    once an LSTM model is actually built or trained.
+    
+    Returns:
+        module: The tensorflow module
+    """
+    import tensorflow as tf
+    return tf
+
+def _time_budget_callback(max_seconds: float):
+    """
+    Keras callback that stops training before an epoch would exceed max_seconds
+    
+    Args:
+        max_seconds (float): Wall-clock budget for the whole fit
+        
+    Returns:
+        tf.keras.callbacks.Callback: Callback with an exhausted flag
+    """
+    tf = _load_tensorflow()
+    
+    class TimeBudget(tf.keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self.exhausted = False
+            
+        def on_train_begin(self, logs=None):
+            self.start = time.perf_counter()
+            
+        def on_epoch_end(self, epoch, logs=None):
+            # Stop unless one more epoch of average length still fits the budget
+            elapsed = time.perf_counter() - self.start
+            if epoch + 1 < self.params.get('epochs', 0) and elapsed * (epoch + 2) / (epoch + 1) > max_seconds:
+                self.exhausted = True
+                self.model.stop_training = True
+                
+    return TimeBudget()
 
 class MLAnomalyDetector:
-    def __init__(self, contamination: float = 0.1):
+    FEATURES = ('close', 'volume', 'returns', 'volume_change')
+
+    def __init__(self, contamination: float = 0.1,
+                 registry: Optional[ModelRegistry] = None,
+                 refit_policy: Optional[RefitPolicy] = None):
         """
         Initialize the ML-based anomaly detector
         
         Args:
             contamination (float): Expected proportion of anomalies in the data
+            registry (ModelRegistry, optional): Registry of fitted models; when
+                set, detection for a symbol reuses the stored scaler and forest
+            refit_policy (RefitPolicy, optional): When to refit a stored model,
+                defaults to refitting models older than a week
         """
         self.contamination = contamination
-        self.isolation_forest = IsolationForest(
-            contamination=contamination,
+        self.isolation_forest = self._build_isolation_forest()
+        self.scaler = StandardScaler()
+        self.registry = registry
+        self.refit_policy = refit_policy or AgeRefitPolicy()
+
+    def _build_isolation_forest(self) -> IsolationForest:
+        return IsolationForest(
+            contamination=self.contamination,
             random_state=42
         )
-        self.scaler = StandardScaler()
+
+    @property
+    def feature_key(self) -> str:
+        """
+        Key of the feature set and parameters a fitted model depends on
+        """
+        return f"{','.join(self.FEATURES)}|contamination={self.contamination}"
+
+    def required_features(self) -> Tuple[str, ...]:
+        """
+        Features this detector reads, see FeatureStore
+        """
+        return self.FEATURES
+
+    def _feature_rows(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+        """
+        Build unscaled features along with the data rows they belong to
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price and volume data
+            
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray]: Features without rows that have
+            missing values, and the position in data of each feature row
+        """
+        features = pd.DataFrame({name: feature_column(data, name) for name in self.FEATURES})
+        complete = features.notna().all(axis=1).to_numpy()
+        return features[complete], np.flatnonzero(complete)
+
+    def build_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build unscaled features for ML models
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price and volume data
+            
+        Returns:
+            pd.DataFrame: Features, without rows that have missing values
+        """
+        return self._feature_rows(data)[0]
         
     def prepare_data(self, data: pd.DataFrame) -> np.ndarray:
         """
         Prepare data for ML models
         
+        The unscaled features and their row positions in data are kept in
+        features_ and feature_rows_ so detection can reuse them.
+        
         Args:
             data (pd.DataFrame): DataFrame with price and volume data
             
         Returns:
             np.ndarray: Scaled features
         """
-        features = data[['close', 'volume']].copy()
-        features['returns'] = data['close'].pct_change()
-        features['volume_change'] = data['volume'].pct_change()
-        features = features.dropna()
+        self.features_, self.feature_rows_ = self._feature_rows(data)
+        return self.scaler.fit_transform(self.features_)
+
+    def _fit_or_load(self, data: pd.DataFrame, symbol: str, force_refit: bool = False) -> np.ndarray:
+        """
+        Reuse the registered scaler and forest for a symbol, refitting when needed
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price and volume data
+            symbol (str): Stock symbol
+            force_refit (bool): Refit even if the refit policy keeps the model
+            
+        Returns:
+            np.ndarray: Features scaled with the scaler that will be used
+        """
+        self.features_, self.feature_rows_ = self._feature_rows(data)
+        features = self.features_
+        if not force_refit and self._load_registered(symbol, features):
+            return self.scaler.transform(features)
+        
+        # Fit fresh objects so previously loaded models are never mutated
+        self.scaler = StandardScaler()
+        self.isolation_forest = self._build_isolation_forest()
+        scaled = self.scaler.fit_transform(features)
+        self.isolation_forest.fit(scaled)
+        self.registry.save(
+            symbol, 'isolation_forest', self.feature_key,
+            watermark=to_watermark(data['date'].iloc[-1]),
+            payload={'scaler': self.scaler, 'model': self.isolation_forest},
+            metadata={'sklearn_version': sklearn.__version__, 'training_rows': len(features)}
+        )
+        return scaled
+
+    def _load_registered(self, symbol: str, features: pd.DataFrame) -> bool:
+        """
+        Load the registered scaler and forest of a symbol unless a refit is due
+        
+        Args:
+            symbol (str): Stock symbol
+            features (pd.DataFrame): Unscaled features the model will score
+            
+        Returns:
+            bool: True if the model was loaded, False if there is none, it was
+            fitted with another scikit-learn version or the refit policy asks
+            for a refit
+        """
+        record = self.registry.latest(symbol, 'isolation_forest', self.feature_key)
+        if record is None:
+            return False
+        payload = self.registry.load(record)
+        if record.metadata.get('sklearn_version') != sklearn.__version__:
+            return False
+        if self.refit_policy.should_refit(record, payload, features):
+            return False
+        self.scaler = payload['scaler']
+        self.isolation_forest = payload['model']
+        return True
+
+    def has_registered_model(self, symbol: str) -> bool:
+        """
+        Whether the registry holds a fitted model for a symbol
+        
+        Args:
+            symbol (str): Stock symbol
+            
+        Returns:
+            bool: True if a model version is stored
+        """
+        return (self.registry is not None
+                and self.registry.latest(symbol, 'isolation_forest', self.feature_key) is not None)
+
+    def detect_registered_batch(self, data: pd.DataFrame, symbol: str,
+                                rows: Optional[np.ndarray] = None) -> Optional[AnomalyBatch]:
+        """
+        Score data with the registered model of a symbol, without fitting
+        
+        Used by incremental runs, which load only the recent bars: the model
+        keeps scoring against the history it was fitted on.
         
-        return self.scaler.fit_transform(features)
+        Args:
+            data (pd.DataFrame): DataFrame with price and volume data
+            symbol (str): Stock symbol
+            rows (np.ndarray, optional): Positions in data to score, all rows by default
+            
+        Returns:
+            Optional[AnomalyBatch]: Detected anomalies, None if the model has
+            to be (re)fitted on the full history first
+        """
+        if self.registry is None:
+            return None
+        self.features_, self.feature_rows_ = self._feature_rows(data)
+        if not self._load_registered(symbol, self.features_):
+            return None
+        return self._collect_isolation_forest_anomalies(data, self.scaler.transform(self.features_), rows)
 
-    def detect_isolation_forest_anomalies(self, data: pd.DataFrame) -> List[AnomalyResult]:
+    def detect_isolation_forest_anomalies(self, data: pd.DataFrame, symbol: Optional[str] = None,
+                                          force_refit: bool = False,
+                                          rows: Optional[np.ndarray] = None) -> List[AnomalyResult]:
         """
         Detect anomalies using Isolation Forest
         
         Args:
             data (pd.DataFrame): DataFrame with price and volume data
+            symbol (str, optional): Stock symbol; with a registry, the stored
+                model for the symbol is reused and scoring is predict-only
+            force_refit (bool): Refit and store a new model version
+            rows (np.ndarray, optional): Positions in data to score, all rows
+                by default; the forest is still fitted on all rows
             
         Returns:
             List[AnomalyResult]: List of detected anomalies
         """
-        features = self.prepare_data(data)
+        return self.detect_isolation_forest_batch(data, symbol, force_refit, rows).to_results()
+
+    def _collect_isolation_forest_anomalies(self, data: pd.DataFrame, scaled: np.ndarray,
+                                            rows: Optional[np.ndarray] = None) -> AnomalyBatch:
+        """
+        Score the prepared features once and gather the flagged rows
+        
+        Args:
+            data (pd.DataFrame): DataFrame the features were built from
+            scaled (np.ndarray): Scaled features from prepare_data or _fit_or_load
+            rows (np.ndarray, optional): Positions in data to score, all by default
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        if rows is None:
+            scored = np.arange(len(scaled))
+        else:
+            scored = np.flatnonzero(np.isin(self.feature_rows_, rows))
+            scaled = scaled[scored]
+        
+        # predict() is score_samples() compared with offset_, so score only once
+        scores = self.isolation_forest.score_samples(scaled)
+        is_flagged = scores < self.isolation_forest.offset_
+        scores = scores[is_flagged]
+        flagged = scored[is_flagged]
+        rows = self.feature_rows_[flagged]
+        features = self.features_
+        
+        return AnomalyBatch.from_arrays(
+            dates=data['date'].iloc[rows].to_numpy(),
+            scores=-scores,  # Negative score for anomalies
+            threshold=self.contamination,
+            method='isolation_forest',
+            details={
+                'price': features['close'].to_numpy()[flagged],
+                'volume': features['volume'].to_numpy()[flagged],
+                'returns': features['returns'].to_numpy()[flagged],
+                'volume_change': features['volume_change'].to_numpy()[flagged],
+                'raw_score': scores
+            }
+        )
+
+    def detect_isolation_forest_batch(self, data: pd.DataFrame, symbol: Optional[str] = None,
+                                      force_refit: bool = False,
+                                      rows: Optional[np.ndarray] = None) -> AnomalyBatch:
+        """
+        Detect anomalies using Isolation Forest as a columnar batch
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price and volume data
+            symbol (str, optional): Stock symbol used to look up a registered model
+            force_refit (bool): Refit and store a new model version
+            rows (np.ndarray, optional): Positions in data to score, all rows by default
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        if self.registry is not None and symbol is not None:
+            features = self._fit_or_load(data, symbol, force_refit)
+        else:
+            features = self.prepare_data(data)
+            self.isolation_forest.fit(features)
+        
+        return self._collect_isolation_forest_anomalies(data, features, rows)
+
+class OnlineIsolationForestDetector:
+    def __init__(self, window_size: int = 1000, contamination: float = 0.1,
+                 n_groups: int = 5, trees_per_group: int = 20,
+                 refresh_interval: Optional[int] = None, max_samples: int = 256,
+                 random_state: int = 42):
+        """
+        Initialize the sliding-window online Isolation Forest detector
+        
+        Each symbol keeps the feature vectors of its last window_size bars and a
+        forest made of n_groups small tree groups. Every refresh_interval bars a
+        new group is fitted on the current window and replaces the oldest one,
+        so the forest follows the window without refitting on the whole history
+        and memory is bounded by the window and the group count. New bars are
+        scored immediately, before they enter the window.
+        
+        Args:
+            window_size (int): Number of recent feature vectors kept per symbol
+            contamination (float): Expected proportion of anomalies in the window
+            n_groups (int): Number of tree groups in the forest
+            trees_per_group (int): Trees fitted per group
+            refresh_interval (int, optional): Bars between group replacements,
+                defaults to window_size // n_groups so the forest turns over
+                once per window
+            max_samples (int): Samples drawn to build each tree
+            random_state (int): Seed of the first group, later groups use the
+                following seeds
+        """
+        self.window_size = window_size
+        self.contamination = contamination
+        self.n_groups = n_groups
+        self.trees_per_group = trees_per_group
+        self.refresh_interval = refresh_interval or max(window_size // n_groups, 1)
+        self.max_samples = max_samples
+        self.min_samples = min(max_samples, window_size)
+        self.random_state = random_state
+        self.states = {}
+
+    def _get_state(self, symbol: str) -> Dict:
+        if symbol not in self.states:
+            self.states[symbol] = {
+                'window': deque(maxlen=self.window_size),
+                'groups': deque(maxlen=self.n_groups),
+                'offset': None,
+                'last': None,
+                'since_refresh': 0,
+                'fits': 0
+            }
+        return self.states[symbol]
+
+    def has_symbol(self, symbol: str) -> bool:
+        return symbol in self.states
+
+    def _features(self, state: Dict, close: float, volume: float) -> Optional[np.ndarray]:
+        """
+        Feature vector of a bar, with the same features as MLAnomalyDetector
+        
+        Args:
+            state (Dict): Symbol state holding the previous bar
+            close (float): Close price
+            volume (float): Traded volume
+            
+        Returns:
+            Optional[np.ndarray]: close, volume, returns and volume_change, or
+            None when the changes are undefined
+        """
+        last, state['last'] = state['last'], (float(close), float(volume))
+        if last is None or last[0] == 0 or last[1] == 0:
+            return None
         
-        # Fit and predict
-        self.isolation_forest.fit(features)
-        predictions = self.isolation_forest.predict(features)
-        scores = self.isolation_forest.score_samples(features)
+        features = np.array([close, volume, close / last[0] - 1, volume / last[1] - 1], dtype=float)
+        return features if np.isfinite(features).all() else None
+
+    def _score(self, state: Dict, X: np.ndarray) -> np.ndarray:
+        """
+        Score samples with the whole forest, in the style of score_samples
+        
+        Each group's score is -2 ** (-depth / c(max_samples)), so averaging the
+        normalized path lengths of every tree and mapping them back gives the
+        score of a single forest holding all the trees.
+        
+        Args:
+            state (Dict): Symbol state holding the tree groups
+            X (np.ndarray): Feature vectors, (n, 4)
+            
+        Returns:
+            np.ndarray: Scores, lower is more anomalous
+        """
+        total_trees = 0
+        normalized_depth = np.zeros(len(X))
+        for group in state['groups']:
+            normalized_depth += -np.log2(-group.score_samples(X)) * group.n_estimators
+            total_trees += group.n_estimators
+        return -np.exp2(-normalized_depth / total_trees)
+
+    def _fit_group(self, state: Dict, window: np.ndarray) -> None:
+        group = IsolationForest(
+            n_estimators=self.trees_per_group,
+            max_samples=min(self.max_samples, len(window)),
+            random_state=self.random_state + state['fits']
+        )
+        state['groups'].append(group.fit(window))
+        state['fits'] += 1
+
+    def _refresh(self, state: Dict) -> None:
+        """
+        Replace the oldest tree group (or build every group on first use) and
+        recompute the contamination threshold over the current window
+        
+        Args:
+            state (Dict): Symbol state
+        """
+        window = np.asarray(state['window'])
+        for _ in range(self.n_groups if not state['groups'] else 1):
+            self._fit_group(state, window)
+        state['offset'] = np.percentile(self._score(state, window), 100 * self.contamination)
+        state['since_refresh'] = 0
+
+    def update(self, symbol: str, date, close: float, volume: float) -> List[AnomalyResult]:
+        """
+        Add a new bar for a symbol and score it
+        
+        Args:
+            symbol (str): Stock symbol
+            date: Date of the bar
+            close (float): Close price
+            volume (float): Traded volume
+            
+        Returns:
+            List[AnomalyResult]: The anomaly detected on this bar, if any
+        """
+        state = self._get_state(symbol)
+        features = self._features(state, close, volume)
+        if features is None:
+            return []
         
         anomalies = []
-        for i in range(len(data)):
-            if i < 1:  # Skip first row due to returns calculation
-                continue
-                
-            if predictions[i-1] == -1:  # -1 indicates anomaly
+        if state['groups']:
+            score = self._score(state, features[np.newaxis])[0]
+            if score < state['offset']:
                 anomalies.append(AnomalyResult(
-                    date=data['date'].iloc[i],
-                    score=-scores[i-1],  # Negative score for anomalies
+                    date=date,
+                    score=-score,  # Negative score for anomalies
                     threshold=self.contamination,
                     is_anomaly=True,
-                    method='isolation_forest',
+                    method='online_isolation_forest',
                     details={
-                        'price': data['close'].iloc[i],
-                        'volume': data['volume'].iloc[i],
-                        'returns': data['close'].pct_change().iloc[i],
-                        'volume_change': data['volume'].pct_change().iloc[i],
-                        'raw_score': scores[i-1]
+                        'price': features[0],
+                        'volume': features[1],
+                        'returns': features[2],
+                        'volume_change': features[3],
+                        'raw_score': score
                     }
                 ))
-                
+        
+        state['window'].append(features)
+        state['since_refresh'] += 1
+        if state['groups'] and state['since_refresh'] >= self.refresh_interval:
+            self._refresh(state)
+        elif not state['groups'] and len(state['window']) >= self.min_samples:
+            self._refresh(state)
         return anomalies
 
-class LSTMAnomalyDetector:
-    def __init__(self, sequence_length: int = 10, threshold: float = 2.0):
+    def warm_up(self, symbol: str, data: pd.DataFrame) -> List[AnomalyResult]:
         """
-        Initialize the LSTM-based anomaly detector
+        Feed historical bars for a symbol in date order
+        
+        Args:
+            symbol (str): Stock symbol
+            data (pd.DataFrame): DataFrame with 'date', 'close' and 'volume'
+            
+        Returns:
+            List[AnomalyResult]: Anomalies detected while replaying the history
+        """
+        anomalies = []
+        for date, close, volume in zip(data['date'], data['close'], data['volume']):
+            anomalies.extend(self.update(symbol, date, close, volume))
+        return anomalies
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """
+        Drop the state of one symbol, or of all symbols
+        
+        Args:
+            symbol (str, optional): Symbol to reset
+        """
+        if symbol is None:
+            self.states.clear()
+        else:
+            self.states.pop(symbol, None)
+
+class SequenceForecastDetector(ABC):
+    METHOD = 'sequence_forecast'
+    # Model name of the checkpoints in the registry
+    CHECKPOINT_NAME = 'sequence_forecast'
+
+    def __init__(self, sequence_length: int = 10, threshold: float = 2.0,
+                 registry: Optional[ModelRegistry] = None):
+        """
+        Initialize a detector that flags bars its one-step forecast misses
+        
+        Subclasses predict the next scaled close from the previous
+        sequence_length closes by implementing train() and _predict_sequences(),
+        and checkpoint their fitted state with _restore_checkpoint().
+        A bar is anomalous when its absolute forecast error exceeds threshold
+        standard deviations of all forecast errors.
         
         Args:
             sequence_length (int): Number of time steps to use for prediction
             threshold (float): Threshold for anomaly detection
+            registry (ModelRegistry, optional): Registry the fitted model of
+                each symbol is checkpointed to
         """
         self.sequence_length = sequence_length
         self.threshold = threshold
-        self.model = self._build_model()
+        self.registry = registry
         self.scaler = StandardScaler()
+        self._checkpoint = None
+        # (close fingerprint, error mean, error std) of the fitted model
+        self._error_stats = None
+        # (close fingerprint, scaled predictions) of the last full forecast pass
+        self._forecast = None
+
+    @staticmethod
+    def _close_fingerprint(data: pd.DataFrame) -> str:
+        return data_fingerprint(data[['date', 'close']])
+
+    def _forget_forecasts(self) -> None:
+        """
+        Drop the recorded error stats and forecasts, e.g. after the weights change
+        """
+        self._error_stats = None
+        self._forecast = None
+
+    def _fit_error_stats(self, data: pd.DataFrame, scaled_data: np.ndarray) -> Tuple[float, float]:
+        """
+        Record the mean and std of the forecast errors over every bar of data
+        
+        These are the statistics a full detection run on data thresholds
+        against, so scoring a subset of rows with them flags exactly the bars
+        the full run would. The forecasts are kept too, so a detection run on
+        the same data reuses them instead of forecasting again. Call after the
+        model and scaler are fitted.
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            scaled_data (np.ndarray): data's closes scaled with the fitted scaler
+            
+        Returns:
+            Tuple[float, float]: Error mean and standard deviation
+        """
+        fingerprint = self._close_fingerprint(data)
+        predictions = self._predict_scaled(scaled_data)
+        errors = np.abs(scaled_data[self.sequence_length:] - predictions)
+        self._error_stats = (fingerprint, np.mean(errors), np.std(errors))
+        self._forecast = (fingerprint, predictions)
+        return self._error_stats[1:]
+
+    def _error_stats_for(self, data: pd.DataFrame, scaled_data: np.ndarray) -> Tuple[float, float]:
+        """
+        Error mean and std of the fitted model on data, computed if not known
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            scaled_data (np.ndarray): data's closes scaled with the fitted scaler
+            
+        Returns:
+            Tuple[float, float]: Error mean and standard deviation
+        """
+        if self._error_stats is not None and self._error_stats[0] == self._close_fingerprint(data):
+            return self._error_stats[1:]
+        return self._fit_error_stats(data, scaled_data)
+
+    def _recorded_forecast(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Forecasts of the last full pass, if it was made on data with the current model
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            
+        Returns:
+            Optional[np.ndarray]: Scaled predictions of every window, (n, 1)
+        """
+        if self._forecast is not None and self._forecast[0] == self._close_fingerprint(data):
+            return self._forecast[1]
+        return None
+
+    @property
+    @abstractmethod
+    def checkpoint_key(self) -> str:
+        """
+        Key of the model parameters and inputs a checkpoint depends on
+        """
+
+    @abstractmethod
+    def _restore_checkpoint(self, record: ModelRecord) -> None:
+        """
+        Load the fitted state and error stats of a checkpoint unless already loaded
+        
+        Args:
+            record (ModelRecord): Checkpoint to load
+        """
+
+    def _checkpoint_compatible(self, record: ModelRecord) -> bool:
+        return True
+
+    def _latest_checkpoint(self, symbol: Optional[str]) -> Optional[ModelRecord]:
+        """
+        Newest checkpoint of a symbol this detector can load
+        
+        Args:
+            symbol (str, optional): Stock symbol
+            
+        Returns:
+            Optional[ModelRecord]: Checkpoint, None without a registry or checkpoint
+        """
+        if self.registry is None or symbol is None:
+            return None
+        record = self.registry.latest(symbol, self.CHECKPOINT_NAME, self.checkpoint_key)
+        return record if record is not None and self._checkpoint_compatible(record) else None
+
+    def has_checkpoint(self, symbol: str) -> bool:
+        """
+        Whether the registry holds a loadable checkpoint for a symbol
+        
+        Args:
+            symbol (str): Stock symbol
+            
+        Returns:
+            bool: True if a checkpoint is stored
+        """
+        return self._latest_checkpoint(symbol) is not None
+
+    def detect_checkpoint_batch(self, data: pd.DataFrame, symbol: str,
+                                rows: Optional[np.ndarray] = None) -> Optional[AnomalyBatch]:
+        """
+        Score data with the checkpoint of a symbol, without training
+        
+        Used by incremental runs, which load only the recent bars. The
+        threshold is relative to the error mean and std stored with the
+        checkpoint, i.e. of the history it was trained on, and the checkpoint
+        only moves forward when a full run trains the model.
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data, including the
+                sequence_length bars before the first scored row
+            symbol (str): Stock symbol
+            rows (np.ndarray, optional): Positions in data to score, all bars
+                after the first sequence by default
+            
+        Returns:
+            Optional[AnomalyBatch]: Detected anomalies, None if there is no
+            checkpoint with error stats to score with
+        """
+        record = self._latest_checkpoint(symbol)
+        if record is None:
+            return None
+        # Read the stats from the payload, the loaded ones may be of other data
+        error_stats = self.registry.load(record).get('error_stats')
+        if error_stats is None:
+            return None
+        self._restore_checkpoint(record)
+        
+        scaled_data = self._scale(data, fit_scaler=False)
+        rows = np.arange(len(scaled_data)) if rows is None else np.unique(np.asarray(rows, dtype=np.int64))
+        rows = rows[(rows >= self.sequence_length) & (rows < len(scaled_data))]
+        if len(rows) == 0:
+            y_true = y_pred = np.empty((0, 1))
+        else:
+            y_true, y_pred = scaled_data[rows], self._predict_scaled(scaled_data, rows - self.sequence_length)
+        return self._collect_forecast_anomalies(
+            data, y_true, y_pred, self.scaler, positions=rows, error_stats=error_stats[1:]
+        )
+
+    def required_features(self) -> Tuple[str, ...]:
+        """
+        Features this detector reads, see FeatureStore
+        
+        Scaling stays in the detector: the scaler is model state that is
+        fitted on, or restored for, each symbol.
+        """
+        return ('close',)
+
+    def prepare_sequences(self, data: pd.DataFrame, fit_scaler: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Prepare sequences for LSTM model
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            fit_scaler (bool): Fit the scaler on this data instead of reusing it
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: X (sequences) and y (targets), as
+            read-only strided views of the scaled data
+        """
+        scaled_data = self._scale(data, fit_scaler)
+        return self._windows(scaled_data)
+
+    def _scale(self, data: pd.DataFrame, fit_scaler: bool = True) -> np.ndarray:
+        """
+        Scale close prices into a single-feature column
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            fit_scaler (bool): Fit the scaler on this data instead of reusing it
+            
+        Returns:
+            np.ndarray: Scaled close prices with shape (n, 1)
+        """
+        if fit_scaler:
+            return self.scaler.fit_transform(data[['close']].values)
+        return self.scaler.transform(data[['close']].values)
+
+    def _windows(self, scaled_data: np.ndarray,
+                 starts: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sliding windows over scaled data as strided views, without copying
+        
+        Args:
+            scaled_data (np.ndarray): Scaled values with shape (n, 1)
+            starts (np.ndarray, optional): Start positions of the windows to
+                gather, e.g. to skip windows spanning two stacked symbols; the
+                gathered windows are copies
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Read-only views X with shape
+            (n - sequence_length, sequence_length, 1) and y with shape
+            (n - sequence_length, 1), or one window per start
+        """
+        if starts is not None:
+            if len(starts) == 0:
+                return (np.empty((0, self.sequence_length, 1)), np.empty((0, 1)))
+            view = sliding_window_view(scaled_data[:, 0], self.sequence_length)
+            return view[starts][:, :, np.newaxis], scaled_data[starts + self.sequence_length]
+        
+        if len(scaled_data) <= self.sequence_length:
+            return (np.empty((0, self.sequence_length, 1)), np.empty((0, 1)))
+        
+        # (windows, features, steps) -> (windows, steps, features)
+        X = sliding_window_view(scaled_data[:-1], self.sequence_length, axis=0).transpose(0, 2, 1)
+        return X, scaled_data[self.sequence_length:]
+
+    def iter_sequence_batches(self, scaled_data: np.ndarray, batch_size: int,
+                              shuffle: bool = False, seed: Optional[int] = None,
+                              starts: Optional[np.ndarray] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield (X, y) batches of sequences, copying only one batch at a time
+        
+        Args:
+            scaled_data (np.ndarray): Scaled values with shape (n, 1)
+            batch_size (int): Number of sequences per batch
+            shuffle (bool): Visit batches in random order
+            seed (int, optional): Seed for the batch order
+            starts (np.ndarray, optional): Start positions of the windows to use
+            
+        Yields:
+            Tuple[np.ndarray, np.ndarray]: float32 sequence and target batches
+        """
+        if starts is None:
+            X, y = self._windows(scaled_data)
+            count = len(X)
+        else:
+            count = len(starts)
+        
+        offsets = np.arange(0, count, batch_size)
+        if shuffle:
+            offsets = np.random.default_rng(seed).permutation(offsets)
+        for offset in offsets:
+            if starts is None:
+                X_batch, y_batch = X[offset:offset + batch_size], y[offset:offset + batch_size]
+            else:
+                X_batch, y_batch = self._windows(scaled_data, starts[offset:offset + batch_size])
+            yield X_batch.astype(np.float32), y_batch.astype(np.float32)
+
+    @abstractmethod
+    def train(self, data: pd.DataFrame, epochs: int = 50, batch_size: int = 32,
+              symbol: Optional[str] = None) -> TrainingReport:
+        """
+        Fit the forecaster and its scaler on data
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            epochs (int): Number of training epochs, for iterative models
+            batch_size (int): Batch size, for iterative models
+            symbol (str, optional): Stock symbol, used to reuse fitted models
+            
+        Returns:
+            TrainingReport: How training went
+        """
+
+    @abstractmethod
+    def _predict_sequences(self, data: pd.DataFrame, fit_scaler: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict the next value after every sequence of data
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            fit_scaler (bool): Fit the scaler on this data instead of reusing it
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Scaled targets and predictions, (n, 1)
+        """
+
+    @abstractmethod
+    def _predict_scaled(self, scaled_data: np.ndarray, starts: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Predict the value after windows of scaled data
+        
+        Args:
+            scaled_data (np.ndarray): Scaled values with shape (n, 1)
+            starts (np.ndarray, optional): Start positions of the windows to use,
+                defaults to every window
+            
+        Returns:
+            np.ndarray: Scaled predictions, (windows, 1)
+        """
+
+    def detect_lstm_anomalies(self, data: pd.DataFrame,
+                              rows: Optional[np.ndarray] = None) -> List[AnomalyResult]:
+        """
+        Detect anomalies from one-step forecast errors
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            rows (np.ndarray, optional): Positions in data to score, see
+                detect_lstm_batch
+            
+        Returns:
+            List[AnomalyResult]: List of detected anomalies
+        """
+        return self.detect_lstm_batch(data, rows).to_results()
+
+    def detect_lstm_batch(self, data: pd.DataFrame, rows: Optional[np.ndarray] = None) -> AnomalyBatch:
+        """
+        Detect anomalies from one-step forecast errors as a columnar batch
+        
+        When rows are given only those bars are forecast. The threshold is
+        relative to the error mean and std of the full run, so the subset is
+        flagged exactly as the full run would flag it. Training records them
+        for its data with one full forecast pass, which detection on the same
+        data reuses instead of forecasting again; checkpoints store only the
+        mean and std. When they aren't known, the full pass that computes them
+        also provides the candidates' forecasts, so a subset never costs more
+        forecasts than a full run.
+        
+        Args:
+            data (pd.DataFrame): DataFrame with price data
+            rows (np.ndarray, optional): Positions in data to score, all bars by default
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        # Checkpointed weights must be scored with the scaler they were trained with
+        if rows is None:
+            forecast = self._recorded_forecast(data)
+            if forecast is None:
+                y_true, y_pred = self._predict_sequences(data, fit_scaler=self._checkpoint is None)
+            else:
+                y_true, y_pred = self._scale(data, fit_scaler=False)[self.sequence_length:], forecast
+            return self._collect_forecast_anomalies(data, y_true, y_pred, self.scaler)
+        
+        scaled_data = self._scale(data, fit_scaler=self._checkpoint is None)
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        rows = rows[(rows >= self.sequence_length) & (rows < len(scaled_data))]
+        if len(rows) == 0:
+            return self._collect_forecast_anomalies(data, np.empty((0, 1)), np.empty((0, 1)), self.scaler,
+                                                    positions=rows, error_stats=(np.nan, np.nan))
+        
+        error_stats = self._error_stats_for(data, scaled_data)
+        y_true = scaled_data[rows]
+        forecast = self._recorded_forecast(data)
+        if forecast is None:
+            y_pred = self._predict_scaled(scaled_data, rows - self.sequence_length)
+        else:
+            y_pred = forecast[rows - self.sequence_length]
+        return self._collect_forecast_anomalies(
+            data, y_true, y_pred, self.scaler, positions=rows, error_stats=error_stats
+        )
+
+    def _collect_forecast_anomalies(self, data: pd.DataFrame, y_true: np.ndarray, y_pred: np.ndarray,
+                                    scaler: StandardScaler, symbol: Optional[str] = None,
+                                    positions: Optional[np.ndarray] = None,
+                                    error_stats: Optional[Tuple[float, float]] = None) -> AnomalyBatch:
+        """
+        Flag the bars whose forecast error exceeds the threshold
+        
+        Args:
+            data (pd.DataFrame): DataFrame the sequences were built from
+            y_true (np.ndarray): Scaled targets, (n, 1)
+            y_pred (np.ndarray): Scaled predictions, (n, 1)
+            scaler (StandardScaler): Scaler the targets were scaled with
+            symbol (str, optional): Symbol added to the details of each anomaly
+            positions (np.ndarray, optional): Position in data of each target,
+                defaults to every bar after the first sequence
+            error_stats (Tuple[float, float], optional): Error mean and standard
+                deviation, computed from these errors by default
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        # Calculate prediction errors
+        errors = np.abs(y_true - y_pred)
+        if error_stats is None:
+            mean_error = np.mean(errors)
+            std_error = np.std(errors)
+        else:
+            mean_error, std_error = error_stats
+        
+        flagged = np.flatnonzero(errors[:, 0] > self.threshold * std_error)
+        rows = flagged + self.sequence_length if positions is None else positions[flagged]
+        predicted = (scaler.inverse_transform(y_pred[flagged])[:, 0]
+                     if len(flagged) else np.empty(0, dtype=y_pred.dtype))
+        
+        details = {} if symbol is None else {'symbol': np.full(len(flagged), symbol, dtype=object)}
+        details.update({
+            'price': data['close'].to_numpy()[rows],
+            'predicted_price': predicted,
+            'error': errors[flagged, 0],
+            'mean_error': np.full(len(flagged), mean_error),
+            'std_error': np.full(len(flagged), std_error)
+        })
+        return AnomalyBatch.from_arrays(
+            dates=data['date'].iloc[rows].to_numpy(),
+            scores=errors[flagged, 0] / std_error,
+            threshold=self.threshold,
+            method=self.METHOD,
+            details=details
+        )
+
+class LSTMAnomalyDetector(SequenceForecastDetector):
+    METHOD = 'lstm'
+    CHECKPOINT_NAME = 'lstm'
+
+    def __init__(self, sequence_length: int = 10, threshold: float = 2.0,
+                 registry: Optional[ModelRegistry] = None,
+                 warm_start_epochs: int = 5, warm_start_window: int = 250,
+                 stream_batch_size: Optional[int] = None,
+                 training_budget: Optional[TrainingBudget] = None):
+        """
+        Initialize the LSTM-based anomaly detector
+        
+        Args:
+            sequence_length (int): Number of time steps to use for prediction
+            threshold (float): Threshold for anomaly detection
+            registry (ModelRegistry, optional): Registry used to checkpoint the
+                weights and scaler of each symbol between runs
+            warm_start_epochs (int): Fine-tuning epochs when a checkpoint exists
+                and new data has arrived
+            warm_start_window (int): Minimum number of recent bars replayed when
+                fine-tuning, so the model does not overfit a handful of new bars
+            stream_batch_size (int, optional): If set, sequences are fed to the
+                model in generator batches and predictions are made in chunks of
+                this size, so the full 3-D sequence tensor is never materialized
+            training_budget (TrainingBudget, optional): Train with a validation
+                holdout, early stopping and epoch / wall-clock caps instead of
+                always running every epoch
+        """
+        super().__init__(sequence_length, threshold, registry)
+        self._model = None
+        self.warm_start_epochs = warm_start_epochs
+        self.warm_start_window = warm_start_window
+        self.stream_batch_size = stream_batch_size
+        self.training_budget = training_budget
+        self.symbol_scalers = {}
+        self.training_reports = {}
+
+    @property
+    def model(self) -> 'tf.keras.Sequential':
+        """
+        LSTM model, built (and TensorFlow imported) on first access
+        """
+        if self._model is None:
+            self._model = self._build_model()
+        return self._model
+
+    @model.setter
+    def model(self, model: 'tf.keras.Sequential') -> None:
+        self._model = model
+
+    @property
+    def checkpoint_key(self) -> str:
+        """
+        Key of the architecture and inputs a checkpoint depends on
+        """
+        return f"close|sequence_length={self.sequence_length}|lstm(64,32)"
+
+    def _checkpoint_compatible(self, record: ModelRecord) -> bool:
+        return record.metadata.get('tensorflow_version') == _load_tensorflow().__version__
+
+    def _restore_checkpoint(self, record: ModelRecord) -> None:
+        """
+        Load the weights and scaler of a checkpoint unless already loaded
         
-    def _build_model(self) -> Sequential:
+        Args:
+            record (ModelRecord): Checkpoint to load
+        """
+        if self._checkpoint != (record.symbol, record.version):
+            payload = self.registry.load(record)
+            self.model.set_weights(payload['weights'])
+            self.scaler = payload['scaler']
+            self._forget_forecasts()
+            self._error_stats = payload.get('error_stats')
+            self._checkpoint = (record.symbol, record.version)
+
+    def _save_checkpoint(self, symbol: str, data: pd.DataFrame, epochs: int) -> None:
+        # Detection on this data reuses this forecast pass, and later scoring-only
+        # cascade runs reuse the stored error scale instead of a full pass
+        self._fit_error_stats(data, self._scale(data, fit_scaler=False))
+        record = self.registry.save(
+            symbol, self.CHECKPOINT_NAME, self.checkpoint_key,
+            watermark=to_watermark(data['date'].iloc[-1]),
+            payload={'weights': self.model.get_weights(), 'scaler': self.scaler,
+                     'error_stats': self._error_stats},
+            metadata={'tensorflow_version': _load_tensorflow().__version__, 'epochs': epochs, 'training_rows': len(data)}
+        )
+        self._checkpoint = (symbol, record.version)
+        
+    def _build_model(self) -> 'tf.keras.Sequential':
         """
         Build LSTM model architecture
         
         Returns:
             Sequential: Compiled LSTM model
         """
-        model = Sequential([
-            LSTM(64, input_shape=(self.sequence_length, 1), return_sequences=True),
-            Dropout(0.2),
-            LSTM(32),
-            Dropout(0.2),
-            Dense(1)
+        tf = _load_tensorflow()
+        model = tf.keras.Sequential([
+            tf.keras.layers.LSTM(64, input_shape=(self.sequence_length, 1), return_sequences=True),
+            tf.keras.layers.Dropout(0.2),
+            tf.keras.layers.LSTM(32),
+            tf.keras.layers.Dropout(0.2),
+            tf.keras.layers.Dense(1)
         ])
         
         model.compile(optimizer='adam', loss='mse')
         return model
         
-    def prepare_sequences(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    def _fit_sequences(self, data: pd.DataFrame, epochs: int, batch_size: int,
+                       fit_scaler: bool = True) -> TrainingReport:
         """
-        Prepare sequences for LSTM model
+        Fit the model on the sequences of data, streaming them if configured
+        
+        Args:
+            data (pd.DataFrame): Training data
+            epochs (int): Number of training epochs
+            batch_size (int): Batch size for training
+            fit_scaler (bool): Fit the scaler on this data instead of reusing it
+            
+        Returns:
+            TrainingReport: Epochs and time used
+        """
+        return self._fit_scaled(self._scale(data, fit_scaler), epochs, batch_size)
+
+    def _fit_scaled(self, scaled_data: np.ndarray, epochs: int, batch_size: int,
+                    starts: Optional[np.ndarray] = None,
+                    ranges: Optional[Dict[str, slice]] = None) -> TrainingReport:
+        """
+        Fit the model on windows of scaled data in one fit call
+        
+        Args:
+            scaled_data (np.ndarray): Scaled values with shape (n, 1)
+            epochs (int): Number of training epochs
+            batch_size (int): Batch size for training
+            starts (np.ndarray, optional): Start positions of the windows to use,
+                defaults to every window
+            ranges (Dict[str, slice], optional): Each symbol's range of starts,
+                used to hold out the most recent windows of every symbol
+            
+        Returns:
+            TrainingReport: Epochs and time used
+        """
+        started = time.perf_counter()
+        if self.training_budget is not None:
+            return self._fit_budgeted(scaled_data, epochs, batch_size, starts, ranges, started)
+        
+        count = max(len(scaled_data) - self.sequence_length, 0) if starts is None else len(starts)
+        if self.stream_batch_size is None:
+            X, y = self._windows(scaled_data, starts)
+            history = self.model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=0)
+        else:
+            # Batches are already visited in random order by the generator
+            dataset = self._sequence_dataset(scaled_data, batch_size, starts, shuffle=True)
+            history = self.model.fit(dataset, epochs=epochs, shuffle=False, verbose=0)
+        
+        return TrainingReport(
+            symbol=None,
+            epochs=len(history.history.get('loss', [])),
+            max_epochs=epochs,
+            seconds=time.perf_counter() - started,
+            stop_reason='max_epochs',
+            train_sequences=count
+        )
+
+    def _fit_budgeted(self, scaled_data: np.ndarray, epochs: int, batch_size: int,
+                      starts: Optional[np.ndarray], ranges: Optional[Dict[str, slice]],
+                      started: float) -> TrainingReport:
+        """
+        Fit within the training budget, stopping early on the validation loss
+        
+        Args:
+            scaled_data (np.ndarray): Scaled values with shape (n, 1)
+            epochs (int): Requested number of epochs
+            batch_size (int): Batch size for training
+            starts (np.ndarray, optional): Start positions of the windows to use
+            ranges (Dict[str, slice], optional): Each symbol's range of starts
+            started (float): perf_counter() value when fitting began
+            
+        Returns:
+            TrainingReport: Epochs and time used, and why training stopped
+        """
+        tf = _load_tensorflow()
+        budget = self.training_budget
+        max_epochs = min(epochs, budget.max_epochs) if budget.max_epochs else epochs
+        if starts is None:
+            starts = np.arange(max(len(scaled_data) - self.sequence_length, 0))
+            ranges = {None: slice(0, len(starts))}
+        train_starts, validation_starts = self._split_holdout(starts, ranges, budget.validation_fraction)
+        
+        callbacks = []
+        validation_set = None
+        early_stopping = None
+        if len(validation_starts):
+            validation_set = self._sequence_dataset(scaled_data, batch_size, validation_starts, shuffle=False)
+            early_stopping = tf.keras.callbacks.EarlyStopping(
+                monitor='val_loss', patience=budget.patience, min_delta=budget.min_delta,
+                restore_best_weights=True
+            )
+            callbacks.append(early_stopping)
+        time_budget = None
+        if budget.max_seconds is not None:
+            time_budget = _time_budget_callback(budget.max_seconds)
+            callbacks.append(time_budget)
+        
+        history = self.model.fit(
+            self._sequence_dataset(scaled_data, batch_size, train_starts, shuffle=True),
+            validation_data=validation_set, epochs=max_epochs, callbacks=callbacks,
+            shuffle=False, verbose=0
+        )
+        
+        if time_budget is not None and time_budget.exhausted:
+            stop_reason = 'time_budget'
+        elif early_stopping is not None and early_stopping.stopped_epoch > 0:
+            stop_reason = 'early_stopping'
+        else:
+            stop_reason = 'max_epochs'
+        val_losses = history.history.get('val_loss')
+        
+        return TrainingReport(
+            symbol=None,
+            epochs=len(history.history.get('loss', [])),
+            max_epochs=max_epochs,
+            seconds=time.perf_counter() - started,
+            stop_reason=stop_reason,
+            train_sequences=len(train_starts),
+            validation_sequences=len(validation_starts),
+            best_val_loss=float(min(val_losses)) if val_losses else None
+        )
+
+    @staticmethod
+    def _split_holdout(starts: np.ndarray, ranges: Dict[str, slice],
+                       fraction: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hold out the most recent windows of every symbol for validation
+        
+        Args:
+            starts (np.ndarray): Start positions of all windows
+            ranges (Dict[str, slice]): Each symbol's range of starts
+            fraction (float): Fraction of each symbol's windows to hold out
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Training and validation starts
+        """
+        train_parts, validation_parts = [], []
+        for window_range in ranges.values():
+            symbol_starts = starts[window_range]
+            held_out = int(np.ceil(len(symbol_starts) * fraction)) if fraction > 0 else 0
+            if held_out >= len(symbol_starts):
+                held_out = 0
+            cut = len(symbol_starts) - held_out
+            train_parts.append(symbol_starts[:cut])
+            validation_parts.append(symbol_starts[cut:])
+        
+        empty = np.empty(0, dtype=np.int64)
+        return (np.concatenate(train_parts) if train_parts else empty,
+                np.concatenate(validation_parts) if validation_parts else empty)
+
+    def _sequence_dataset(self, scaled_data: np.ndarray, batch_size: int,
+                          starts: Optional[np.ndarray] = None, shuffle: bool = False) -> 'tf.data.Dataset':
+        """
+        Batched, prefetching tf.data pipeline over windows of scaled data
+        
+        In-memory tensors are used unless stream_batch_size is set, in which case
+        windows are generated one batch at a time.
+        
+        Args:
+            scaled_data (np.ndarray): Scaled values with shape (n, 1)
+            batch_size (int): Number of sequences per batch
+            starts (np.ndarray, optional): Start positions of the windows to use
+            shuffle (bool): Shuffle the windows on every epoch
+            
+        Returns:
+            tf.data.Dataset: Dataset of (X, y) float32 batches
+        """
+        tf = _load_tensorflow()
+        if self.stream_batch_size is None:
+            X, y = self._windows(scaled_data, starts)
+            dataset = tf.data.Dataset.from_tensor_slices((X.astype(np.float32), y.astype(np.float32)))
+            if shuffle:
+                dataset = dataset.shuffle(max(len(X), 1), reshuffle_each_iteration=True)
+            return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+        
+        count = max(len(scaled_data) - self.sequence_length, 0) if starts is None else len(starts)
+        num_batches = -(-count // batch_size)
+        return tf.data.Dataset.from_generator(
+            lambda: self.iter_sequence_batches(scaled_data, batch_size, shuffle=shuffle, starts=starts),
+            output_signature=(
+                tf.TensorSpec(shape=(None, self.sequence_length, 1), dtype=tf.float32),
+                tf.TensorSpec(shape=(None, 1), dtype=tf.float32)
+            )
+        ).apply(tf.data.experimental.assert_cardinality(num_batches)).prefetch(tf.data.AUTOTUNE)
+
+    def _predict_sequences(self, data: pd.DataFrame, fit_scaler: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict the next value after every sequence of data
         
         Args:
             data (pd.DataFrame): DataFrame with price data
+            fit_scaler (bool): Fit the scaler on this data instead of reusing it
             
         Returns:
-            Tuple[np.ndarray, np.ndarray]: X (sequences) and y (targets)
+            Tuple[np.ndarray, np.ndarray]: Scaled targets and predictions, (n, 1)
         """
-        # Scale the data
-        scaled_data = self.scaler.fit_transform(data[['close']].values)
+        scaled_data = self._scale(data, fit_scaler)
+        return scaled_data[self.sequence_length:], self._predict_scaled(scaled_data)
+
+    def _predict_scaled(self, scaled_data: np.ndarray, starts: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Predict the value after windows of scaled data in one pass
         
-        X, y = [], []
-        for i in range(len(scaled_data) - self.sequence_length):
-            X.append(scaled_data[i:(i + self.sequence_length)])
-            y.append(scaled_data[i + self.sequence_length])
+        Args:
+            scaled_data (np.ndarray): Scaled values with shape (n, 1)
+            starts (np.ndarray, optional): Start positions of the windows to use,
+                defaults to every window
             
-        return np.array(X), np.array(y)
+        Returns:
+            np.ndarray: Scaled predictions, (windows, 1)
+        """
+        if self.stream_batch_size is None:
+            X, _ = self._windows(scaled_data, starts)
+            return self.model.predict(X)
         
-    def train(self, data: pd.DataFrame, epochs: int = 50, batch_size: int = 32) -> None:
+        predictions = [
+            self.model.predict_on_batch(X_batch)
+            for X_batch, _ in self.iter_sequence_batches(scaled_data, self.stream_batch_size, starts=starts)
+        ]
+        return np.concatenate(predictions) if predictions else np.empty((0, 1))
+
+    def _stack_symbols(self, data_by_symbol: Dict[str, pd.DataFrame],
+                       fit_scalers: bool) -> Tuple[np.ndarray, np.ndarray, Dict[str, slice]]:
         """
-        Train the LSTM model
+        Scale each symbol with its own scaler and stack them into one series
         
         Args:
-            data (pd.DataFrame): Training data
+            data_by_symbol (Dict[str, pd.DataFrame]): Price data keyed by symbol
+            fit_scalers (bool): Fit every symbol's scaler on this data; otherwise
+                only symbols without a scaler get one fitted
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray, Dict[str, slice]]: Stacked scaled
+            values (n, 1), start positions of the windows that stay within one
+            symbol, and each symbol's range of windows
+        """
+        scaled_parts, start_parts, ranges = [], [], {}
+        offset = windows = 0
+        for symbol, data in data_by_symbol.items():
+            closes = data[['close']].values
+            if fit_scalers or symbol not in self.symbol_scalers:
+                self.symbol_scalers[symbol] = StandardScaler().fit(closes)
+            scaled = self.symbol_scalers[symbol].transform(closes)
+            
+            count = max(len(scaled) - self.sequence_length, 0)
+            scaled_parts.append(scaled)
+            start_parts.append(offset + np.arange(count))
+            ranges[symbol] = slice(windows, windows + count)
+            offset += len(scaled)
+            windows += count
+        
+        if not scaled_parts:
+            return np.empty((0, 1)), np.empty(0, dtype=np.int64), ranges
+        return np.concatenate(scaled_parts), np.concatenate(start_parts), ranges
+
+    def train_many(self, data_by_symbol: Dict[str, pd.DataFrame], epochs: int = 50,
+                   batch_size: int = 32) -> Dict[str, TrainingReport]:
+        """
+        Train one shared model on many symbols in a single fit call
+        
+        Each symbol is scaled with its own scaler, stored in symbol_scalers, and
+        the sequences of all symbols are mixed in shared batches. All symbols
+        stop together, so each report has the epochs and stop reason of the
+        shared fit, its own sequence counts, its share of the fit time in
+        proportion to its training sequences and, with a training budget, the
+        loss on its own holdout windows.
+        
+        Args:
+            data_by_symbol (Dict[str, pd.DataFrame]): Training data keyed by symbol
             epochs (int): Number of training epochs
             batch_size (int): Batch size for training
+            
+        Returns:
+            Dict[str, TrainingReport]: Report of each symbol, also kept in
+            training_reports
         """
-        X, y = self.prepare_sequences(data)
-        self.model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=0)
+        scaled_data, starts, ranges = self._stack_symbols(data_by_symbol, fit_scalers=True)
+        shared = self._fit_scaled(scaled_data, epochs, batch_size, starts, ranges)
+        # The weights no longer match any single-symbol checkpoint
+        self._checkpoint = None
+        self._forget_forecasts()
         
-    def detect_lstm_anomalies(self, data: pd.DataFrame) -> List[AnomalyResult]:
+        fraction = self.training_budget.validation_fraction if self.training_budget is not None else 0.0
+        splits = {
+            symbol: self._split_holdout(starts[window_range], {symbol: slice(None)}, fraction)
+            for symbol, window_range in ranges.items()
+        }
+        validation_losses = self._validation_losses(scaled_data, {symbol: split[1] for symbol, split in splits.items()})
+        
+        reports = {}
+        for symbol, (train_starts, validation_starts) in splits.items():
+            reports[symbol] = TrainingReport(
+                symbol=symbol,
+                epochs=shared.epochs,
+                max_epochs=shared.max_epochs,
+                seconds=shared.seconds * len(train_starts) / max(shared.train_sequences, 1),
+                stop_reason=shared.stop_reason,
+                train_sequences=len(train_starts),
+                validation_sequences=len(validation_starts),
+                best_val_loss=validation_losses.get(symbol)
+            )
+        self.training_reports.update(reports)
+        logger.info(
+            f"Trained LSTM for {len(reports)} symbols: {shared.epochs}/{shared.max_epochs} epochs "
+            f"in {shared.seconds:.2f}s ({shared.stop_reason})"
+        )
+        return reports
+
+    def _validation_losses(self, scaled_data: np.ndarray,
+                           validation_starts: Dict[str, np.ndarray]) -> Dict[str, float]:
         """
-        Detect anomalies using LSTM predictions
+        Mean squared error of the model on each symbol's holdout windows
         
         Args:
-            data (pd.DataFrame): DataFrame with price data
+            scaled_data (np.ndarray): Stacked scaled values with shape (n, 1)
+            validation_starts (Dict[str, np.ndarray]): Holdout window starts of
+                each symbol
             
         Returns:
-            List[AnomalyResult]: List of detected anomalies
+            Dict[str, float]: Loss of every symbol with holdout windows, from
+            one prediction pass
         """
-        X, y_true = self.prepare_sequences(data)
-        y_pred = self.model.predict(X)
+        validation_starts = {symbol: symbol_starts for symbol, symbol_starts in validation_starts.items()
+                             if len(symbol_starts)}
+        if not validation_starts:
+            return {}
+        all_starts = np.concatenate(list(validation_starts.values()))
+        squared_errors = (scaled_data[all_starts + self.sequence_length] - self._predict_scaled(scaled_data, all_starts)) ** 2
         
-        # Calculate prediction errors
-        errors = np.abs(y_true - y_pred)
-        mean_error = np.mean(errors)
-        std_error = np.std(errors)
+        losses = {}
+        offset = 0
+        for symbol, symbol_starts in validation_starts.items():
+            losses[symbol] = float(np.mean(squared_errors[offset:offset + len(symbol_starts)]))
+            offset += len(symbol_starts)
+        return losses
+
+    def detect_many_batch(self, data_by_symbol: Dict[str, pd.DataFrame]) -> Dict[str, AnomalyBatch]:
+        """
+        Detect anomalies for many symbols with one prediction pass
         
-        anomalies = []
-        for i in range(len(data) - self.sequence_length):
-            if errors[i][0] > self.threshold * std_error:
-                anomalies.append(AnomalyResult(
-                    date=data['date'].iloc[i + self.sequence_length],
-                    score=errors[i][0] / std_error,
-                    threshold=self.threshold,
-                    is_anomaly=True,
-                    method='lstm',
-                    details={
-                        'price': data['close'].iloc[i + self.sequence_length],
-                        'predicted_price': self.scaler.inverse_transform(y_pred[i])[0][0],
-                        'error': errors[i][0],
-                        'mean_error': mean_error,
-                        'std_error': std_error
-                    }
-                ))
-                
-        return anomalies 
\ No newline at end of file
+        Errors and thresholds are computed per symbol, exactly as if each symbol
+        had been scored on its own.
+        
+        Args:
+            data_by_symbol (Dict[str, pd.DataFrame]): Price data keyed by symbol
+            
+        Returns:
+            Dict[str, AnomalyBatch]: Detected anomalies keyed by symbol
+        """
+        scaled_data, starts, ranges = self._stack_symbols(data_by_symbol, fit_scalers=False)
+        y_true = scaled_data[starts + self.sequence_length]
+        y_pred = self._predict_scaled(scaled_data, starts)
+        
+        return {
+            symbol: self._collect_forecast_anomalies(
+                data, y_true[ranges[symbol]], y_pred[ranges[symbol]],
+                self.symbol_scalers[symbol], symbol=symbol
+            )
+            for symbol, data in data_by_symbol.items()
+        }
+
+    def detect_many(self, data_by_symbol: Dict[str, pd.DataFrame]) -> Dict[str, List[AnomalyResult]]:
+        """
+        Detect anomalies for many symbols with one prediction pass
+        
+        Args:
+            data_by_symbol (Dict[str, pd.DataFrame]): Price data keyed by symbol
+            
+        Returns:
+            Dict[str, List[AnomalyResult]]: Detected anomalies keyed by symbol
+        """
+        return {symbol: batch.to_results() for symbol, batch in self.detect_many_batch(data_by_symbol).items()}
+        
+    def train(self, data: pd.DataFrame, epochs: int = 50, batch_size: int = 32,
+              symbol: Optional[str] = None) -> TrainingReport:
+        """
+        Train the LSTM model
+        
+        With a registry and a symbol, the symbol's checkpoint is restored first.
+        Training is skipped if the checkpoint already covers the data, and only
+        a short warm-start fine-tune runs when new bars have arrived. Without a
+        checkpoint the model is trained from scratch and checkpointed.
+        
+        Args:
+            data (pd.DataFrame): Training data
+            epochs (int): Number of training epochs
+            batch_size (int): Batch size for training
+            symbol (str, optional): Stock symbol used to look up checkpoints
+            
+        Returns:
+            TrainingReport: Epochs and seconds the symbol used, also kept in
+            training_reports
+        """
+        report = self._train(data, epochs, batch_size, symbol)
+        report.symbol = symbol
+        self.training_reports[symbol] = report
+        logger.info(
+            f"Trained LSTM for {symbol}: {report.epochs}/{report.max_epochs} epochs "
+            f"in {report.seconds:.2f}s ({report.stop_reason})"
+        )
+        return report
+
+    def _train(self, data: pd.DataFrame, epochs: int, batch_size: int,
+               symbol: Optional[str]) -> TrainingReport:
+        if self.registry is None or symbol is None:
+            report = self._fit_sequences(data, epochs, batch_size)
+            self._checkpoint = None
+            self._forget_forecasts()
+            return report
+        
+        record = self._latest_checkpoint(symbol)
+        if record is None:
+            # Cold start from fresh weights rather than another symbol's
+            self.model = self._build_model()
+            self.scaler = StandardScaler()
+            report = self._fit_sequences(data, epochs, batch_size)
+            self._save_checkpoint(symbol, data, report.epochs)
+            return report
+        
+        self._restore_checkpoint(record)
+        new_rows = int((pd.to_datetime(data['date']) > pd.Timestamp(record.watermark)).sum())
+        if new_rows == 0:
+            return TrainingReport(symbol=symbol, epochs=0, max_epochs=0, seconds=0.0,
+                                  stop_reason='up_to_date', train_sequences=0)
+        
+        # Fine-tune on the new bars plus a replay window, keeping the checkpoint scaler
+        recent = data.tail(max(new_rows, self.warm_start_window) + self.sequence_length)
+        if len(recent) > self.sequence_length:
+            report = self._fit_sequences(recent, self.warm_start_epochs, batch_size, fit_scaler=False)
+        else:
+            report = TrainingReport(symbol=symbol, epochs=0, max_epochs=self.warm_start_epochs,
+                                    seconds=0.0, stop_reason='no_sequences', train_sequences=0)
+        self._save_checkpoint(symbol, data, report.epochs)
+        return report
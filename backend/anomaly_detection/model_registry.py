@@ -0,0 +1,269 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+import joblib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field, asdict
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ModelRecord:
+    symbol: str
+    model_name: str
+    feature_key: str
+    version: int
+    watermark: str
+    trained_at: str
+    path: str
+    metadata: Dict = field(default_factory=dict)
+
+def to_watermark(date) -> str:
+    """
+    Normalize the date of the last training bar into a watermark string
+
+    Args:
+        date: Date of the last bar in the training data
+
+    Returns:
+        str: ISO formatted watermark
+    """
+    return pd.Timestamp(date).isoformat()
+
+class ModelRegistry:
+    def __init__(self, root_dir: str = "models", max_loaded: int = 8,
+                 keep_versions: Optional[int] = 5):
+        """
+        Initialize the on-disk registry of fitted models
+
+        Models are stored per symbol, model name and feature set under root_dir,
+        one joblib file per version, with an index.json describing every
+        version and the training-data watermark it was fitted on.
+
+        Args:
+            root_dir (str): Directory holding the registry
+            max_loaded (int): Loaded payloads kept in memory, evicting the
+                least recently used
+            keep_versions (int, optional): Versions kept on disk per model, the
+                older ones are deleted on save; None keeps every version
+        """
+        if keep_versions is not None and keep_versions < 1:
+            raise ValueError("keep_versions must be at least 1")
+        self.root_dir = root_dir
+        self.max_loaded = max_loaded
+        self.keep_versions = keep_versions
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict:
+        # Loaded payloads are reloaded on demand; locks can't be pickled
+        return {'root_dir': self.root_dir, 'max_loaded': self.max_loaded,
+                'keep_versions': self.keep_versions}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(**state)
+
+    def _remember(self, path: str, payload: Dict[str, Any]) -> None:
+        # Callers hold self._lock
+        self._loaded[path] = payload
+        self._loaded.move_to_end(path)
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+
+    def _delete_versions(self, records: List[ModelRecord]) -> None:
+        # Callers hold self._lock
+        for record in records:
+            self._loaded.pop(record.path, None)
+            if os.path.exists(record.path):
+                os.remove(record.path)
+        if records:
+            logger.info(f"Pruned {len(records)} old versions of {records[0].model_name} for {records[0].symbol}")
+
+    @staticmethod
+    def _slug(value: str) -> str:
+        slug = re.sub(r'[^A-Za-z0-9._-]+', '_', value)
+        if slug != value:
+            # Keep distinct keys apart after sanitizing
+            slug = f"{slug}-{hashlib.sha1(value.encode()).hexdigest()[:8]}"
+        return slug
+
+    def _model_dir(self, symbol: str, model_name: str, feature_key: str) -> str:
+        return os.path.join(self.root_dir, self._slug(symbol), self._slug(model_name),
+                            hashlib.sha1(feature_key.encode()).hexdigest()[:16])
+
+    def _read_index(self, model_dir: str) -> List[ModelRecord]:
+        index_path = os.path.join(model_dir, 'index.json')
+        if not os.path.exists(index_path):
+            return []
+        with open(index_path) as f:
+            return [ModelRecord(**record) for record in json.load(f)]
+
+    def _write_index(self, model_dir: str, records: List[ModelRecord]) -> None:
+        index_path = os.path.join(model_dir, 'index.json')
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump([asdict(record) for record in records], f, indent=2)
+        os.replace(tmp_path, index_path)
+
+    def versions(self, symbol: str, model_name: str, feature_key: str) -> List[ModelRecord]:
+        """
+        List all stored versions of a model, oldest first
+
+        Args:
+            symbol (str): Stock symbol
+            model_name (str): Model name, e.g. 'isolation_forest'
+            feature_key (str): Feature set and model parameters the model uses
+
+        Returns:
+            List[ModelRecord]: Stored versions
+        """
+        return self._read_index(self._model_dir(symbol, model_name, feature_key))
+
+    def latest(self, symbol: str, model_name: str, feature_key: str,
+               watermark: Optional[str] = None) -> Optional[ModelRecord]:
+        """
+        Get the newest version of a model
+
+        Args:
+            symbol (str): Stock symbol
+            model_name (str): Model name
+            feature_key (str): Feature set and model parameters the model uses
+            watermark (str, optional): Only consider versions trained on exactly
+                this watermark
+
+        Returns:
+            Optional[ModelRecord]: Newest matching version, if any
+        """
+        records = self.versions(symbol, model_name, feature_key)
+        if watermark is not None:
+            records = [record for record in records if record.watermark == watermark]
+        return records[-1] if records else None
+
+    def save(self, symbol: str, model_name: str, feature_key: str, watermark: str,
+             payload: Dict[str, Any], metadata: Optional[Dict] = None) -> ModelRecord:
+        """
+        Store a new version of a fitted model
+
+        Args:
+            symbol (str): Stock symbol
+            model_name (str): Model name
+            feature_key (str): Feature set and model parameters the model uses
+            watermark (str): Watermark of the training data
+            payload (Dict[str, Any]): Fitted objects, e.g. scaler and model
+            metadata (Dict, optional): Extra information stored in the index
+
+        Returns:
+            ModelRecord: Record of the stored version
+        """
+        model_dir = self._model_dir(symbol, model_name, feature_key)
+        with self._lock:
+            os.makedirs(model_dir, exist_ok=True)
+            records = self._read_index(model_dir)
+            version = records[-1].version + 1 if records else 1
+            path = os.path.join(model_dir, f"v{version:04d}.joblib")
+            joblib.dump(payload, path)
+
+            record = ModelRecord(
+                symbol=symbol,
+                model_name=model_name,
+                feature_key=feature_key,
+                version=version,
+                watermark=watermark,
+                trained_at=datetime.utcnow().isoformat(),
+                path=path,
+                metadata=metadata or {}
+            )
+            records.append(record)
+            keep = len(records) if self.keep_versions is None else self.keep_versions
+            # The index stops listing pruned versions before their files go
+            self._write_index(model_dir, records[-keep:])
+            self._delete_versions(records[:-keep])
+            self._remember(path, payload)
+
+        logger.info(f"Stored {model_name} v{version} for {symbol} (watermark {watermark})")
+        return record
+
+    def load(self, record: ModelRecord) -> Dict[str, Any]:
+        """
+        Load the fitted objects of a stored version, caching the most recently
+        used ones in memory
+
+        Args:
+            record (ModelRecord): Version to load
+
+        Returns:
+            Dict[str, Any]: Fitted objects
+        """
+        with self._lock:
+            payload = self._loaded.get(record.path)
+            if payload is None:
+                payload = joblib.load(record.path)
+            self._remember(record.path, payload)
+            return payload
+
+class RefitPolicy(ABC):
+    @abstractmethod
+    def should_refit(self, record: ModelRecord, payload: Dict[str, Any],
+                     features: pd.DataFrame) -> bool:
+        """
+        Decide whether a stored model must be refitted before scoring
+
+        Args:
+            record (ModelRecord): Newest stored version
+            payload (Dict[str, Any]): Fitted objects of that version
+            features (pd.DataFrame): Unscaled features about to be scored
+
+        Returns:
+            bool: True if the model should be refitted
+        """
+
+class ManualRefitPolicy(RefitPolicy):
+    """Never refit automatically; refits only happen when forced by the caller"""
+
+    def should_refit(self, record, payload, features) -> bool:
+        return False
+
+class AgeRefitPolicy(RefitPolicy):
+    def __init__(self, max_age: timedelta = timedelta(days=7)):
+        """
+        Refit once the stored model is older than max_age
+
+        Args:
+            max_age (timedelta): Maximum age of a stored model
+        """
+        self.max_age = max_age
+
+    def should_refit(self, record, payload, features) -> bool:
+        return datetime.utcnow() - datetime.fromisoformat(record.trained_at) > self.max_age
+
+class DriftRefitPolicy(RefitPolicy):
+    def __init__(self, max_shift: float = 1.0, recent_rows: int = 20):
+        """
+        Refit when recent features drift away from the training distribution
+
+        Drift is the largest absolute mean of the most recent rows after scaling
+        with the stored scaler, i.e. a mean shift measured in training standard
+        deviations.
+
+        Args:
+            max_shift (float): Largest tolerated mean shift
+            recent_rows (int): Number of most recent rows to compare
+        """
+        self.max_shift = max_shift
+        self.recent_rows = recent_rows
+
+    def should_refit(self, record, payload, features) -> bool:
+        recent = payload['scaler'].transform(features.tail(self.recent_rows))
+        shift = float(np.abs(recent.mean(axis=0)).max()) if len(recent) else 0.0
+        if shift > self.max_shift:
+            logger.info(f"Feature drift {shift:.2f} for {record.symbol} exceeds {self.max_shift}")
+            return True
+        return False
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Tuple, Optional, Sequence, Union
+from .statistical_methods import AnomalyResult, _bollinger_kernel
+
+PanelInput = Union[pd.DataFrame, np.ndarray]
+
+class PanelStatisticalDetector:
+    def __init__(self, window_size: int = 20, num_std: float = 2.0):
+        """
+        Initialize the panel (multi-symbol) statistical anomaly detector
+
+        Scores a symbols x time matrix in one vectorized pass with the same rules
+        as StatisticalAnomalyDetector, so each symbol gets exactly the anomalies
+        the single-symbol detector would report for its row.
+
+        Args:
+            window_size (int): Size of the rolling window for calculations
+            num_std (float): Number of standard deviations for threshold
+        """
+        self.window_size = window_size
+        self.num_std = num_std
+
+    def _as_panel(self, values: PanelInput, symbols: Optional[Sequence[str]] = None,
+                  dates: Optional[Sequence] = None) -> Tuple[np.ndarray, List[str], List]:
+        """
+        Normalize a wide DataFrame or ndarray into a symbols x time array
+
+        Args:
+            values (PanelInput): DataFrame indexed by symbol with one column per
+                date, or a 2-D array with one row per symbol
+            symbols (Sequence[str], optional): Row labels for array input
+            dates (Sequence, optional): Column labels for array input
+
+        Returns:
+            Tuple[np.ndarray, List[str], List]: Values, symbols and dates
+        """
+        if isinstance(values, pd.DataFrame):
+            symbols = list(values.index) if symbols is None else list(symbols)
+            dates = list(values.columns) if dates is None else list(dates)
+            values = values.to_numpy()
+        else:
+            values = np.asarray(values)
+            if values.ndim != 2:
+                raise ValueError("Panel input must be a 2-D symbols x time array")
+            symbols = list(range(values.shape[0])) if symbols is None else list(symbols)
+            dates = list(range(values.shape[1])) if dates is None else list(dates)
+
+        if values.shape != (len(symbols), len(dates)):
+            raise ValueError(
+                f"Panel shape {values.shape} does not match {len(symbols)} symbols x {len(dates)} dates"
+            )
+        return values, symbols, dates
+
+    def _rolling_moments(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rolling mean and standard deviation of every symbol along the time axis
+
+        Args:
+            values (np.ndarray): Symbols x time array
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Rolling mean and std, symbols x time
+        """
+        rolling = pd.DataFrame(values.T).rolling(window=self.window_size)
+        return rolling.mean().to_numpy().T, rolling.std().to_numpy().T
+
+    def _flagged_cells(self, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get (symbol, time) positions of flagged cells, skipping the warm-up period
+
+        Args:
+            mask (np.ndarray): Boolean symbols x time anomaly mask
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Symbol rows and time columns, ordered
+            by symbol and then by date
+        """
+        mask = mask.copy()
+        mask[:, :self.window_size] = False
+        return np.nonzero(mask)
+
+    def detect_bollinger_anomalies(self, closes: PanelInput, symbols: Optional[Sequence[str]] = None,
+                                   dates: Optional[Sequence] = None) -> Dict[str, List[AnomalyResult]]:
+        """
+        Detect Bollinger Band anomalies for every symbol in a panel
+
+        Args:
+            closes (PanelInput): Symbols x time close prices
+            symbols (Sequence[str], optional): Row labels for array input
+            dates (Sequence, optional): Column labels for array input
+
+        Returns:
+            Dict[str, List[AnomalyResult]]: Anomalies keyed by symbol
+        """
+        price, symbols, dates = self._as_panel(closes, symbols, dates)
+        middle, std = self._rolling_moments(price)
+        upper = middle + (std * self.num_std)
+        lower = middle - (std * self.num_std)
+        upper_deviation, lower_deviation, mask, scores = _bollinger_kernel(price, upper, lower)
+
+        anomalies = {symbol: [] for symbol in symbols}
+        for row, col in zip(*self._flagged_cells(mask)):
+            symbol = symbols[row]
+            anomalies[symbol].append(AnomalyResult(
+                date=dates[col],
+                score=scores[row, col],
+                threshold=self.num_std,
+                is_anomaly=True,
+                method='bollinger_bands',
+                details={
+                    'symbol': symbol,
+                    'price': price[row, col],
+                    'middle_band': middle[row, col],
+                    'upper_band': upper[row, col],
+                    'lower_band': lower[row, col],
+                    'upper_deviation': upper_deviation[row, col],
+                    'lower_deviation': lower_deviation[row, col]
+                }
+            ))
+        return anomalies
+
+    def _detect_zscore(self, panel: PanelInput, symbols: Optional[Sequence[str]],
+                       dates: Optional[Sequence], detail_key: str,
+                       method: str) -> Dict[str, List[AnomalyResult]]:
+        values, symbols, dates = self._as_panel(panel, symbols, dates)
+        mean, std = self._rolling_moments(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = (values - mean) / std
+
+        anomalies = {symbol: [] for symbol in symbols}
+        for row, col in zip(*self._flagged_cells(np.abs(z_scores) > self.num_std)):
+            symbol = symbols[row]
+            z_score = z_scores[row, col]
+            anomalies[symbol].append(AnomalyResult(
+                date=dates[col],
+                score=abs(z_score),
+                threshold=self.num_std,
+                is_anomaly=True,
+                method=method,
+                details={
+                    'symbol': symbol,
+                    detail_key: values[row, col],
+                    'z_score': z_score,
+                    'rolling_mean': mean[row, col],
+                    'rolling_std': std[row, col]
+                }
+            ))
+        return anomalies
+
+    def detect_zscore_anomalies(self, closes: PanelInput, symbols: Optional[Sequence[str]] = None,
+                                dates: Optional[Sequence] = None) -> Dict[str, List[AnomalyResult]]:
+        """
+        Detect price Z-score anomalies for every symbol in a panel
+
+        Args:
+            closes (PanelInput): Symbols x time close prices
+            symbols (Sequence[str], optional): Row labels for array input
+            dates (Sequence, optional): Column labels for array input
+
+        Returns:
+            Dict[str, List[AnomalyResult]]: Anomalies keyed by symbol
+        """
+        return self._detect_zscore(closes, symbols, dates, 'price', 'zscore')
+
+    def detect_volume_anomalies(self, volumes: PanelInput, symbols: Optional[Sequence[str]] = None,
+                                dates: Optional[Sequence] = None) -> Dict[str, List[AnomalyResult]]:
+        """
+        Detect volume Z-score anomalies for every symbol in a panel
+
+        Args:
+            volumes (PanelInput): Symbols x time traded volumes
+            symbols (Sequence[str], optional): Row labels for array input
+            dates (Sequence, optional): Column labels for array input
+
+        Returns:
+            Dict[str, List[AnomalyResult]]: Anomalies keyed by symbol
+        """
+        return self._detect_zscore(volumes, symbols, dates, 'volume', 'volume_zscore')
+
+    def detect_anomalies(self, closes: PanelInput, volumes: Optional[PanelInput] = None,
+                         symbols: Optional[Sequence[str]] = None,
+                         dates: Optional[Sequence] = None) -> Dict[str, List[AnomalyResult]]:
+        """
+        Detect anomalies with all statistical methods for every symbol in a panel
+
+        Args:
+            closes (PanelInput): Symbols x time close prices
+            volumes (PanelInput, optional): Symbols x time volumes with the same layout
+            symbols (Sequence[str], optional): Row labels for array input
+            dates (Sequence, optional): Column labels for array input
+
+        Returns:
+            Dict[str, List[AnomalyResult]]: Bollinger, Z-score and volume anomalies
+            keyed by symbol
+        """
+        results = [
+            self.detect_bollinger_anomalies(closes, symbols, dates),
+            self.detect_zscore_anomalies(closes, symbols, dates)
+        ]
+        if volumes is not None:
+            results.append(self.detect_volume_anomalies(volumes, symbols, dates))
+
+        return {
+            symbol: [anomaly for result in results for anomaly in result[symbol]]
+            for symbol in results[0]
+        }
+
+    @staticmethod
+    def pivot(data: pd.DataFrame, column: str) -> pd.DataFrame:
+        """
+        Pivot long-format bars into a symbols x time panel
+
+        Args:
+            data (pd.DataFrame): DataFrame with 'symbol', 'date' and the column
+            column (str): Column to pivot, e.g. 'close' or 'volume'
+
+        Returns:
+            pd.DataFrame: Panel indexed by symbol with one column per date
+        """
+        return data.pivot(index='symbol', columns='date', values=column)
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Tuple, Sequence
+from dataclasses import dataclass
+from .statistical_methods import _bollinger_kernel
+
+@dataclass
+class SweepResult:
+    window_sizes: List[int]
+    num_stds: List[float]
+    counts: Dict[str, pd.DataFrame]
+    mean_scores: Dict[str, pd.DataFrame]
+
+class StatisticalParameterSweep:
+    def __init__(self, window_sizes: Sequence[int], num_stds: Sequence[float]):
+        """
+        Initialize a window_size / num_std grid for the statistical detectors
+
+        Rolling moments for every window come from one pair of cumulative sums
+        per column and every threshold is evaluated against them, so a full grid
+        costs little more than a single detection run.
+
+        Args:
+            window_sizes (Sequence[int]): Rolling window sizes to evaluate
+            num_stds (Sequence[float]): Standard deviation thresholds to evaluate
+        """
+        self.window_sizes = sorted(set(int(w) for w in window_sizes))
+        self.num_stds = sorted(set(float(k) for k in num_stds))
+        if not self.window_sizes or self.window_sizes[0] < 2:
+            raise ValueError("window_sizes must contain sizes of at least 2")
+
+    @staticmethod
+    def _cumulative_sums(values: np.ndarray) -> Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Cumulative sums shared by the rolling moments of every window
+
+        Values are shifted by their mean to limit cancellation error. A running
+        count of value changes lets flat windows report an exact zero std, and a
+        running count of NaNs marks the windows pandas leaves NaN.
+
+        Args:
+            values (np.ndarray): Column values
+
+        Returns:
+            Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Shift,
+            cumulative sum, cumulative sum of squares (both skipping NaNs),
+            cumulative change count and cumulative NaN count, each with a
+            leading zero
+        """
+        missing = np.isnan(values)
+        shift = float(np.nanmean(values)) if len(values) and not missing.all() else 0.0
+        centered = values - shift
+        changes = np.concatenate([[0], (values[1:] != values[:-1]).astype(np.int64)])
+        zero = np.zeros(1)
+        return (
+            shift,
+            np.concatenate([zero, np.nancumsum(centered)]),
+            np.concatenate([zero, np.nancumsum(centered * centered)]),
+            np.concatenate([[0], np.cumsum(changes)]),
+            np.concatenate([[0], np.cumsum(missing, dtype=np.int64)])
+        )
+
+    @staticmethod
+    def _rolling_moments(values: np.ndarray, sums: Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+                         window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rolling mean and sample std (ddof=1) for one window from cumulative sums
+
+        Args:
+            values (np.ndarray): Column values
+            sums (Tuple): Output of _cumulative_sums
+            window (int): Rolling window size
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Rolling mean and std, NaN before the
+            first full window and for windows containing a NaN, like
+            pandas rolling() with the default min_periods
+        """
+        shift, total, total_sq, changes, nans = sums
+        n = len(values)
+        mean = np.full(n, np.nan)
+        std = np.full(n, np.nan)
+        if n < window:
+            return mean, std
+
+        window_sum = total[window:] - total[:-window]
+        window_sq = total_sq[window:] - total_sq[:-window]
+        variance = np.maximum((window_sq - window_sum * window_sum / window) / (window - 1), 0.0)
+        mean[window - 1:] = shift + window_sum / window
+        std[window - 1:] = np.sqrt(variance)
+
+        # A window is flat when no value changed after its first element
+        flat = (changes[window:] - changes[1:n - window + 2]) == 0
+        flat_rows = np.flatnonzero(flat) + window - 1
+        mean[flat_rows] = values[flat_rows]
+        std[flat_rows] = 0.0
+
+        incomplete = np.flatnonzero(nans[window:] - nans[:-window]) + window - 1
+        mean[incomplete] = np.nan
+        std[incomplete] = np.nan
+        return mean, std
+
+    def sweep(self, data: pd.DataFrame) -> SweepResult:
+        """
+        Evaluate every window_size / num_std combination on one series
+
+        Args:
+            data (pd.DataFrame): DataFrame with 'close' and 'volume'
+
+        Returns:
+            SweepResult: Anomaly counts and mean anomaly scores per method, each
+            a window_size x num_std DataFrame
+        """
+        close = data['close'].to_numpy(dtype=float)
+        volume = data['volume'].to_numpy(dtype=float)
+        close_sums = self._cumulative_sums(close)
+        volume_sums = self._cumulative_sums(volume)
+
+        methods = ['bollinger_bands', 'zscore', 'volume_zscore']
+        shape = (len(self.window_sizes), len(self.num_stds))
+        counts = {method: np.zeros(shape, dtype=np.int64) for method in methods}
+        scores = {method: np.full(shape, np.nan) for method in methods}
+
+        for row, window in enumerate(self.window_sizes):
+            close_mean, close_std = self._rolling_moments(close, close_sums, window)
+            volume_mean, volume_std = self._rolling_moments(volume, volume_sums, window)
+
+            # Like the detectors, skip the first window_size rows
+            price = close[window:]
+            close_mean, close_std = close_mean[window:], close_std[window:]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                close_z = np.abs((price - close_mean) / close_std)
+                volume_z = np.abs((volume[window:] - volume_mean[window:]) / volume_std[window:])
+
+            for col, num_std in enumerate(self.num_stds):
+                upper = close_mean + (close_std * num_std)
+                lower = close_mean - (close_std * num_std)
+                _, _, mask, bollinger_scores = _bollinger_kernel(price, upper, lower)
+
+                for method, method_mask, method_scores in [
+                    ('bollinger_bands', mask, bollinger_scores),
+                    ('zscore', close_z > num_std, close_z),
+                    ('volume_zscore', volume_z > num_std, volume_z)
+                ]:
+                    count = int(method_mask.sum())
+                    counts[method][row, col] = count
+                    if count:
+                        scores[method][row, col] = method_scores[method_mask].mean()
+
+        def as_frame(values: np.ndarray) -> pd.DataFrame:
+            return pd.DataFrame(
+                values,
+                index=pd.Index(self.window_sizes, name='window_size'),
+                columns=pd.Index(self.num_stds, name='num_std')
+            )
+
+        return SweepResult(
+            window_sizes=self.window_sizes,
+            num_stds=self.num_stds,
+            counts={method: as_frame(values) for method, values in counts.items()},
+            mean_scores={method: as_frame(values) for method, values in scores.items()}
+        )
@@ -1,10 +1,15 @@
 import numpy as np
 import pandas as pd
-from typing import Tuple, List, Dict
+import math
+import random
+from collections import deque
+from typing import Tuple, List, Dict, Optional, Sequence, Iterator, Union
 from dataclasses import dataclass
+from .feature_store import ROLLING_STATS, FeatureStore, rolling_feature
 
 @dataclass
 class AnomalyResult:
+    __slots__ = ('date', 'score', 'threshold', 'is_anomaly', 'method', 'details')
     date: str
     score: float
     threshold: float
@@ -12,17 +17,395 @@ class AnomalyResult:
     method: str
     details: Dict
 
+class AnomalyBatch:
+    def __init__(self, dates: Sequence, scores: Sequence[float], thresholds: Sequence[float],
+                 method_codes: Sequence[int], method_names: Sequence[str],
+                 details: Optional[Dict[str, np.ndarray]] = None,
+                 detail_masks: Optional[Dict[str, np.ndarray]] = None,
+                 is_anomaly: Optional[Sequence[bool]] = None):
+        """
+        Columnar (struct-of-arrays) collection of anomaly results
+        
+        Detectors fill the columns straight from their NumPy arrays; AnomalyResult
+        objects are only built when the batch is iterated or converted.
+        
+        Args:
+            dates (Sequence): Anomaly dates
+            scores (Sequence[float]): Anomaly scores
+            thresholds (Sequence[float]): Detection thresholds
+            method_codes (Sequence[int]): Index of each row's method in method_names
+            method_names (Sequence[str]): Method names referenced by method_codes
+            details (Dict[str, np.ndarray], optional): Typed detail columns
+            detail_masks (Dict[str, np.ndarray], optional): Rows that carry each
+                detail column, all rows if a column has no mask
+            is_anomaly (Sequence[bool], optional): Anomaly flags, all True by default
+        """
+        self.dates = np.asarray(dates)
+        self.scores = np.asarray(scores, dtype=float)
+        self.thresholds = np.asarray(thresholds, dtype=float)
+        self.method_codes = np.asarray(method_codes, dtype=np.int16)
+        self.method_names = tuple(method_names)
+        self.details = details or {}
+        self.detail_masks = detail_masks or {}
+        self.is_anomaly = (np.ones(len(self.scores), dtype=bool) if is_anomaly is None
+                           else np.asarray(is_anomaly, dtype=bool))
+        self._results = None
+
+    @classmethod
+    def from_arrays(cls, dates: Sequence, scores: Sequence[float], threshold: float,
+                    method: str, details: Optional[Dict[str, np.ndarray]] = None) -> 'AnomalyBatch':
+        """
+        Build a batch of anomalies from a single method
+        
+        Args:
+            dates (Sequence): Anomaly dates
+            scores (Sequence[float]): Anomaly scores
+            threshold (float): Detection threshold shared by all rows
+            method (str): Detection method
+            details (Dict[str, np.ndarray], optional): Typed detail columns
+            
+        Returns:
+            AnomalyBatch: Batch of anomalies
+        """
+        n = len(scores)
+        return cls(
+            dates=dates,
+            scores=scores,
+            thresholds=np.full(n, threshold, dtype=float),
+            method_codes=np.zeros(n, dtype=np.int16),
+            method_names=(method,),
+            details=details
+        )
+
+    @classmethod
+    def from_results(cls, results: Sequence[AnomalyResult]) -> 'AnomalyBatch':
+        """
+        Build a batch from AnomalyResult objects
+        
+        Args:
+            results (Sequence[AnomalyResult]): Anomaly results
+            
+        Returns:
+            AnomalyBatch: Batch holding the same anomalies
+        """
+        method_names = list(dict.fromkeys(result.method for result in results))
+        codes = {method: code for code, method in enumerate(method_names)}
+        detail_keys = list(dict.fromkeys(key for result in results for key in result.details))
+        
+        details, detail_masks = {}, {}
+        for key in detail_keys:
+            mask = np.array([key in result.details for result in results], dtype=bool)
+            details[key] = _to_column([result.details.get(key) for result in results])
+            if not mask.all():
+                detail_masks[key] = mask
+        
+        dates = np.empty(len(results), dtype=object)
+        dates[:] = [result.date for result in results]
+        batch = cls(
+            dates=dates,
+            scores=[result.score for result in results],
+            thresholds=[result.threshold for result in results],
+            method_codes=[codes[result.method] for result in results],
+            method_names=method_names,
+            details=details,
+            detail_masks=detail_masks,
+            is_anomaly=[result.is_anomaly for result in results]
+        )
+        batch._results = list(results)
+        return batch
+
+    @classmethod
+    def concat(cls, batches: Sequence['AnomalyBatch']) -> 'AnomalyBatch':
+        """
+        Concatenate batches, possibly from different methods
+        
+        Args:
+            batches (Sequence[AnomalyBatch]): Batches to concatenate in order
+            
+        Returns:
+            AnomalyBatch: Combined batch
+        """
+        method_names = list(dict.fromkeys(name for batch in batches for name in batch.method_names))
+        codes = {method: code for code, method in enumerate(method_names)}
+        detail_keys = list(dict.fromkeys(key for batch in batches for key in batch.details))
+        
+        details, detail_masks = {}, {}
+        for key in detail_keys:
+            parts, masks = [], []
+            for batch in batches:
+                if key in batch.details:
+                    parts.append(batch.details[key])
+                    masks.append(batch.detail_masks.get(key, np.ones(len(batch), dtype=bool)))
+                else:
+                    parts.append(np.full(len(batch), None, dtype=object))
+                    masks.append(np.zeros(len(batch), dtype=bool))
+            details[key] = _concat_columns(parts)
+            mask = np.concatenate(masks) if masks else np.zeros(0, dtype=bool)
+            if not mask.all():
+                detail_masks[key] = mask
+        
+        remapped = [np.array([codes[name] for name in batch.method_names], dtype=np.int16)[batch.method_codes]
+                    for batch in batches]
+        return cls(
+            dates=_concat_columns([batch.dates for batch in batches]),
+            scores=np.concatenate([batch.scores for batch in batches]) if batches else [],
+            thresholds=np.concatenate([batch.thresholds for batch in batches]) if batches else [],
+            method_codes=np.concatenate(remapped) if batches else [],
+            method_names=method_names,
+            details=details,
+            detail_masks=detail_masks,
+            is_anomaly=np.concatenate([batch.is_anomaly for batch in batches]) if batches else None
+        )
+
+    @property
+    def methods(self) -> np.ndarray:
+        """
+        Method name of every row
+        
+        Returns:
+            np.ndarray: Object array of method names
+        """
+        return np.array(self.method_names, dtype=object)[self.method_codes]
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def _date_list(self) -> List:
+        # Goes through pandas so datetime64 columns come back as Timestamps
+        return pd.Series(self.dates, dtype=self.dates.dtype).tolist()
+
+    def _build(self, i: int, date) -> AnomalyResult:
+        details = {}
+        for key, column in self.details.items():
+            mask = self.detail_masks.get(key)
+            if mask is None or mask[i]:
+                details[key] = column[i]
+        return AnomalyResult(
+            date=date,
+            score=self.scores[i],
+            threshold=float(self.thresholds[i]),
+            is_anomaly=bool(self.is_anomaly[i]),
+            method=self.method_names[self.method_codes[i]],
+            details=details
+        )
+
+    def to_results(self) -> List[AnomalyResult]:
+        """
+        Convert to AnomalyResult objects, building them once on first use
+        
+        Returns:
+            List[AnomalyResult]: Anomaly results in batch order
+        """
+        if self._results is None:
+            self._results = [self._build(i, date) for i, date in enumerate(self._date_list())]
+        return self._results
+
+    def __iter__(self) -> Iterator[AnomalyResult]:
+        return iter(self.to_results())
+
+    def __getitem__(self, i: int) -> AnomalyResult:
+        return self.to_results()[i]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Tabular view of the batch with one column per detail field
+        
+        Returns:
+            pd.DataFrame: Anomalies with date, score, threshold, method and details
+        """
+        frame = pd.DataFrame({
+            'date': self.dates,
+            'score': self.scores,
+            'threshold': self.thresholds,
+            'is_anomaly': self.is_anomaly,
+            'method': self.methods
+        })
+        for key, column in self.details.items():
+            frame[key] = column
+            if key in self.detail_masks:
+                frame.loc[~self.detail_masks[key], key] = None
+        return frame
+
+def _to_column(values: Union[List, np.ndarray]) -> np.ndarray:
+    """
+    Convert detail values to a typed column, falling back to objects
+    """
+    try:
+        column = np.asarray(values)
+    except (ValueError, TypeError):
+        column = None
+    if column is None or column.ndim != 1 or column.dtype.kind not in 'biufcMm':
+        column = np.empty(len(values), dtype=object)
+        column[:] = list(values)
+    return column
+
+def _concat_columns(parts: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Concatenate columns, using an object column when dtypes differ
+    """
+    if not parts:
+        return np.empty(0, dtype=object)
+    if all(part.dtype == parts[0].dtype for part in parts):
+        return np.concatenate(parts)
+    column = np.empty(sum(len(part) for part in parts), dtype=object)
+    offset = 0
+    for part in parts:
+        column[offset:offset + len(part)] = list(pd.Series(part, dtype=part.dtype))
+        offset += len(part)
+    return column
+
+def _bollinger_kernel(price: np.ndarray, upper: np.ndarray,
+                      lower: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Element-wise Bollinger Band deviations, anomaly mask and scores
+    
+    Works on arrays of any shape, e.g. one series or a symbols x time panel.
+    
+    Args:
+        price (np.ndarray): Close prices
+        upper (np.ndarray): Upper band
+        lower (np.ndarray): Lower band
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Upper deviation,
+        lower deviation (both in percent), anomaly mask and anomaly scores
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        upper_deviation = (price - upper) / upper * 100
+        lower_deviation = (price - lower) / lower * 100
+    
+    mask = (price > upper) | (price < lower)
+    
+    # Same tie-breaking as max(abs(upper), abs(lower)) in the row loop
+    abs_upper = np.abs(upper_deviation)
+    abs_lower = np.abs(lower_deviation)
+    scores = np.where(abs_lower > abs_upper, abs_lower, abs_upper)
+    return upper_deviation, lower_deviation, mask, scores
+
 class StatisticalAnomalyDetector:
-    def __init__(self, window_size: int = 20, num_std: float = 2.0):
+    def __init__(self, window_size: int = 20, num_std: float = 2.0, vectorized: bool = True,
+                 feature_store: Optional[FeatureStore] = None):
         """
         Initialize the statistical anomaly detector
         
         Args:
             window_size (int): Size of the rolling window for calculations
             num_std (float): Number of standard deviations for threshold
+            vectorized (bool): Compute anomaly masks with NumPy and only build
+                results for flagged rows instead of looping over every row
+            feature_store (FeatureStore, optional): Store rolling statistics
+                missing from the data are computed and cached in; they are
+                computed on every call if not given
         """
         self.window_size = window_size
         self.num_std = num_std
+        self.vectorized = vectorized
+        self.feature_store = feature_store
+
+    def required_features(self, methods: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+        """
+        Features this detector reads, see FeatureStore
+        
+        Args:
+            methods (Sequence[str], optional): Statistical methods that will run,
+                any of 'bollinger_bands', 'zscore' and 'volume'; defaults to all
+            
+        Returns:
+            Tuple[str, ...]: Feature names
+        """
+        methods = ('bollinger_bands', 'zscore', 'volume') if methods is None else methods
+        columns = []
+        if 'bollinger_bands' in methods or 'zscore' in methods:
+            columns.append('close')
+        if 'volume' in methods:
+            columns.append('volume')
+        return tuple(rolling_feature(column, stat, self.window_size)
+                     for column in columns for stat in ROLLING_STATS)
+
+    def _with_rolling_stats(self, data: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+        """
+        Extend data with the rolling statistics of columns from the feature store
+        
+        The store fingerprints data on every lookup, so callers needing several
+        columns fetch them here in one lookup instead of one per column.
+        
+        Args:
+            data (pd.DataFrame): DataFrame containing the columns
+            columns (Sequence[str]): Columns to aggregate
+            
+        Returns:
+            pd.DataFrame: data itself without a store or when it already
+            carries the statistics, the store's feature frame otherwise
+        """
+        names = [rolling_feature(column, stat, self.window_size)
+                 for column in columns for stat in ROLLING_STATS]
+        if self.feature_store is None or all(name in data.columns for name in names):
+            return data
+        return self.feature_store.get(data, names)
+
+    def _rolling_stats(self, data: pd.DataFrame, column: str) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """
+        Get the rolling mean, std and Z-score of a column over the detector window
+        
+        Statistics are read from data when it was built by a FeatureStore,
+        otherwise they are computed, through the detector's store if it has
+        one, from a single rolling window over the column.
+        
+        Args:
+            data (pd.DataFrame): DataFrame containing the column
+            column (str): Column to aggregate
+            
+        Returns:
+            Tuple[pd.Series, pd.Series, pd.Series]: Rolling mean, rolling std
+            and Z-scores aligned with data
+        """
+        mean_name, std_name, zscore_name = (rolling_feature(column, stat, self.window_size)
+                                            for stat in ROLLING_STATS)
+        data = self._with_rolling_stats(data, [column])
+        
+        if mean_name in data.columns and std_name in data.columns:
+            mean, std = data[mean_name], data[std_name]
+        else:
+            rolling = data[column].rolling(window=self.window_size)
+            mean, std = rolling.mean(), rolling.std()
+        z_scores = data[zscore_name] if zscore_name in data.columns else (data[column] - mean) / std
+        return mean.rename(column), std.rename(column), z_scores.rename(column)
+
+    def threshold_ratios(self, data: pd.DataFrame,
+                         columns: Sequence[str] = ('close', 'volume')) -> np.ndarray:
+        """
+        Largest absolute rolling Z-score of each bar relative to num_std
+        
+        A ratio of 1 or more means a Z-score detector flags the bar; bars
+        without a full window get 0.
+        
+        Args:
+            data (pd.DataFrame): DataFrame with the columns
+            columns (Sequence[str]): Columns whose Z-scores are compared
+            
+        Returns:
+            np.ndarray: Ratio per bar
+        """
+        data = self._with_rolling_stats(data, columns)
+        ratios = np.zeros(len(data))
+        for column in columns:
+            z = np.abs(self._rolling_stats(data, column)[2].to_numpy(dtype=float))
+            ratios = np.fmax(ratios, z / self.num_std)
+        return ratios
+
+    def _flagged_positions(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Get row positions of flagged rows, skipping the rolling warm-up period
+        
+        Args:
+            mask (np.ndarray): Boolean anomaly mask aligned with the data rows
+            
+        Returns:
+            np.ndarray: Positions of flagged rows
+        """
+        mask = np.asarray(mask, dtype=bool).copy()
+        mask[:self.window_size] = False
+        return np.flatnonzero(mask)
 
     def calculate_bollinger_bands(self, data: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
@@ -34,8 +417,7 @@ class StatisticalAnomalyDetector:
         Returns:
             Tuple[pd.Series, pd.Series, pd.Series]: Middle band, upper band, lower band
         """
-        middle_band = data['close'].rolling(window=self.window_size).mean()
-        std = data['close'].rolling(window=self.window_size).std()
+        middle_band, std, _ = self._rolling_stats(data, 'close')
         
         upper_band = middle_band + (std * self.num_std)
         lower_band = middle_band - (std * self.num_std)
@@ -54,6 +436,9 @@ class StatisticalAnomalyDetector:
         """
         middle_band, upper_band, lower_band = self.calculate_bollinger_bands(data)
         
+        if self.vectorized:
+            return self._collect_bollinger_anomalies(data, middle_band, upper_band, lower_band).to_results()
+        
         anomalies = []
         for i in range(len(data)):
             if i < self.window_size:
@@ -89,6 +474,56 @@ class StatisticalAnomalyDetector:
                 
         return anomalies
 
+    def _collect_bollinger_anomalies(self, data: pd.DataFrame, middle_band: pd.Series,
+                                     upper_band: pd.Series, lower_band: pd.Series) -> AnomalyBatch:
+        """
+        Build Bollinger Band anomalies from vectorized band masks
+        
+        Args:
+            data (pd.DataFrame): DataFrame with 'close' prices and 'date'
+            middle_band (pd.Series): Rolling mean of close prices
+            upper_band (pd.Series): Upper Bollinger Band
+            lower_band (pd.Series): Lower Bollinger Band
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        price = data['close'].to_numpy()
+        upper = upper_band.to_numpy()
+        lower = lower_band.to_numpy()
+        
+        upper_deviation, lower_deviation, mask, scores = _bollinger_kernel(price, upper, lower)
+        positions = self._flagged_positions(mask)
+        
+        return AnomalyBatch.from_arrays(
+            dates=data['date'].iloc[positions].to_numpy(),
+            scores=scores[positions],
+            threshold=self.num_std,
+            method='bollinger_bands',
+            details={
+                'price': price[positions],
+                'middle_band': middle_band.to_numpy()[positions],
+                'upper_band': upper[positions],
+                'lower_band': lower[positions],
+                'upper_deviation': upper_deviation[positions],
+                'lower_deviation': lower_deviation[positions]
+            }
+        )
+
+    def detect_bollinger_batch(self, data: pd.DataFrame) -> AnomalyBatch:
+        """
+        Detect anomalies using Bollinger Bands as a columnar batch
+        
+        Args:
+            data (pd.DataFrame): DataFrame with 'close' prices and 'date'
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        if not self.vectorized:
+            return AnomalyBatch.from_results(self.detect_bollinger_anomalies(data))
+        return self._collect_bollinger_anomalies(data, *self.calculate_bollinger_bands(data))
+
     def calculate_zscore(self, data: pd.DataFrame) -> pd.Series:
         """
         Calculate Z-scores for price data
@@ -99,10 +534,7 @@ class StatisticalAnomalyDetector:
         Returns:
             pd.Series: Z-scores
         """
-        rolling_mean = data['close'].rolling(window=self.window_size).mean()
-        rolling_std = data['close'].rolling(window=self.window_size).std()
-        z_scores = (data['close'] - rolling_mean) / rolling_std
-        return z_scores
+        return self._rolling_stats(data, 'close')[2]
 
     def detect_zscore_anomalies(self, data: pd.DataFrame) -> List[AnomalyResult]:
         """
@@ -114,7 +546,12 @@ class StatisticalAnomalyDetector:
         Returns:
             List[AnomalyResult]: List of detected anomalies
         """
-        z_scores = self.calculate_zscore(data)
+        rolling_mean, rolling_std, z_scores = self._rolling_stats(data, 'close')
+        
+        if self.vectorized:
+            return self._collect_zscore_anomalies(
+                data, 'close', z_scores, rolling_mean, rolling_std, method='zscore'
+            ).to_results()
         
         anomalies = []
         for i in range(len(data)):
@@ -137,13 +574,64 @@ class StatisticalAnomalyDetector:
                     details={
                         'price': data['close'].iloc[i],
                         'z_score': z_score,
-                        'rolling_mean': data['close'].rolling(window=self.window_size).mean().iloc[i],
-                        'rolling_std': data['close'].rolling(window=self.window_size).std().iloc[i]
+                        'rolling_mean': rolling_mean.iloc[i],
+                        'rolling_std': rolling_std.iloc[i]
                     }
                 ))
                 
         return anomalies
 
+    def _collect_zscore_anomalies(self, data: pd.DataFrame, column: str, z_scores: pd.Series,
+                                  rolling_mean: pd.Series, rolling_std: pd.Series,
+                                  method: str) -> AnomalyBatch:
+        """
+        Build Z-score anomalies from a vectorized threshold mask
+        
+        Args:
+            data (pd.DataFrame): DataFrame with the scored column and 'date'
+            column (str): Scored column, 'close' or 'volume'
+            z_scores (pd.Series): Rolling Z-scores of the column
+            rolling_mean (pd.Series): Rolling mean of the column
+            rolling_std (pd.Series): Rolling standard deviation of the column
+            method (str): Method name reported on each result
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        z = z_scores.to_numpy()
+        positions = self._flagged_positions(np.abs(z) > self.num_std)
+        detail_key = 'price' if column == 'close' else column
+        
+        return AnomalyBatch.from_arrays(
+            dates=data['date'].iloc[positions].to_numpy(),
+            scores=np.abs(z[positions]),
+            threshold=self.num_std,
+            method=method,
+            details={
+                detail_key: data[column].to_numpy()[positions],
+                'z_score': z[positions],
+                'rolling_mean': rolling_mean.to_numpy()[positions],
+                'rolling_std': rolling_std.to_numpy()[positions]
+            }
+        )
+
+    def detect_zscore_batch(self, data: pd.DataFrame) -> AnomalyBatch:
+        """
+        Detect anomalies using Z-score method as a columnar batch
+        
+        Args:
+            data (pd.DataFrame): DataFrame with 'close' prices and 'date'
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        if not self.vectorized:
+            return AnomalyBatch.from_results(self.detect_zscore_anomalies(data))
+        rolling_mean, rolling_std, z_scores = self._rolling_stats(data, 'close')
+        return self._collect_zscore_anomalies(
+            data, 'close', z_scores, rolling_mean, rolling_std, method='zscore'
+        )
+
     def detect_volume_anomalies(self, data: pd.DataFrame) -> List[AnomalyResult]:
         """
         Detect volume anomalies using Z-score method
@@ -154,9 +642,12 @@ class StatisticalAnomalyDetector:
         Returns:
             List[AnomalyResult]: List of detected anomalies
         """
-        volume_mean = data['volume'].rolling(window=self.window_size).mean()
-        volume_std = data['volume'].rolling(window=self.window_size).std()
-        volume_z_scores = (data['volume'] - volume_mean) / volume_std
+        volume_mean, volume_std, volume_z_scores = self._volume_zscores(data)
+        
+        if self.vectorized:
+            return self._collect_zscore_anomalies(
+                data, 'volume', volume_z_scores, volume_mean, volume_std, method='volume_zscore'
+            ).to_results()
         
         anomalies = []
         for i in range(len(data)):
@@ -184,4 +675,345 @@ class StatisticalAnomalyDetector:
                     }
                 ))
                 
-        return anomalies 
\ No newline at end of file
+        return anomalies
+
+    def _volume_zscores(self, data: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """
+        Calculate rolling volume mean, std and Z-scores
+        
+        Args:
+            data (pd.DataFrame): DataFrame with 'volume'
+            
+        Returns:
+            Tuple[pd.Series, pd.Series, pd.Series]: Rolling mean, rolling std, Z-scores
+        """
+        return self._rolling_stats(data, 'volume')
+
+    def detect_volume_batch(self, data: pd.DataFrame) -> AnomalyBatch:
+        """
+        Detect volume anomalies using Z-score method as a columnar batch
+        
+        Args:
+            data (pd.DataFrame): DataFrame with 'volume' and 'date'
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        if not self.vectorized:
+            return AnomalyBatch.from_results(self.detect_volume_anomalies(data))
+        volume_mean, volume_std, volume_z_scores = self._volume_zscores(data)
+        return self._collect_zscore_anomalies(
+            data, 'volume', volume_z_scores, volume_mean, volume_std, method='volume_zscore'
+        )
+
+class _SkiplistNode:
+    __slots__ = ('value', 'next', 'width')
+
+    def __init__(self, value: float, next: List, width: List):
+        self.value = value
+        self.next = next
+        self.width = width
+
+_SKIPLIST_END = _SkiplistNode(math.inf, [], [])
+
+class _IndexableSkiplist:
+    def __init__(self, expected_size: int = 100, seed: int = 42):
+        """
+        Sorted multiset with O(log n) insert, remove and access by rank
+        
+        Args:
+            expected_size (int): Expected number of values, sets the level count
+            seed (int): Seed for the random node levels
+        """
+        self.size = 0
+        self.max_levels = int(1 + math.log(max(expected_size, 2), 2))
+        self.head = _SkiplistNode(None, [_SKIPLIST_END] * self.max_levels, [1] * self.max_levels)
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int) -> float:
+        node = self.head
+        i += 1
+        for level in reversed(range(self.max_levels)):
+            while node.width[level] <= i:
+                i -= node.width[level]
+                node = node.next[level]
+        return node.value
+
+    def insert(self, value: float) -> None:
+        chain = [None] * self.max_levels
+        steps_at_level = [0] * self.max_levels
+        node = self.head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].value <= value:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        
+        depth = min(self.max_levels, 1 - int(math.log(1.0 - self._random.random(), 2.0)))
+        new_node = _SkiplistNode(value, [None] * depth, [None] * depth)
+        steps = 0
+        for level in range(depth):
+            prev_node = chain[level]
+            new_node.next[level] = prev_node.next[level]
+            prev_node.next[level] = new_node
+            new_node.width[level] = prev_node.width[level] - steps
+            prev_node.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(depth, self.max_levels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, value: float) -> None:
+        chain = [None] * self.max_levels
+        node = self.head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+        if chain[0].next[0].value != value:
+            raise KeyError(f"{value} not found")
+        
+        depth = len(chain[0].next[0].next)
+        for level in range(depth):
+            prev_node = chain[level]
+            prev_node.width[level] += prev_node.next[level].width[level] - 1
+            prev_node.next[level] = prev_node.next[level].next[level]
+        for level in range(depth, self.max_levels):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+class SlidingMedianMAD:
+    def __init__(self, window_size: int):
+        """
+        Sliding-window median and median absolute deviation (MAD)
+        
+        Values are kept in an indexable skiplist, so each update costs O(log w)
+        and the MAD is selected from the two sorted halves around the median in
+        O(log^2 w). Non-finite values make the window statistics NaN until
+        they leave the window.
+        
+        Args:
+            window_size (int): Number of values in the window
+        """
+        self.window_size = window_size
+        self.window = deque()
+        self.sorted_values = _IndexableSkiplist(expected_size=window_size)
+        self.invalid_count = 0
+
+    def push(self, value: float) -> None:
+        """
+        Add a value to the window, evicting the oldest one when full
+        
+        Args:
+            value (float): New value
+        """
+        value = float(value)
+        if len(self.window) == self.window_size:
+            self._discard(self.window.popleft())
+        self.window.append(value)
+        if math.isfinite(value):
+            self.sorted_values.insert(value)
+        else:
+            self.invalid_count += 1
+
+    def _discard(self, value: float) -> None:
+        if math.isfinite(value):
+            self.sorted_values.remove(value)
+        else:
+            self.invalid_count -= 1
+
+    def is_full(self) -> bool:
+        return len(self.window) == self.window_size
+
+    def median(self) -> float:
+        """
+        Median of the values in the window
+        
+        Returns:
+            float: Window median
+        """
+        n = len(self.sorted_values)
+        if self.invalid_count or n == 0:
+            return math.nan
+        half = n // 2
+        if n % 2:
+            return self.sorted_values[half]
+        return (self.sorted_values[half - 1] + self.sorted_values[half]) / 2
+
+    def mad(self, median: Optional[float] = None) -> float:
+        """
+        Median absolute deviation of the values in the window
+        
+        Args:
+            median (float, optional): Window median if already computed
+            
+        Returns:
+            float: Window MAD
+        """
+        if median is None:
+            median = self.median()
+        if math.isnan(median):
+            return math.nan
+        
+        n = len(self.sorted_values)
+        half = n // 2
+        if n % 2:
+            return self._kth_deviation(half, median)
+        return (self._kth_deviation(half - 1, median) + self._kth_deviation(half, median)) / 2
+
+    def _kth_deviation(self, k: int, median: float) -> float:
+        """
+        k-th smallest absolute deviation from the median (0-based)
+        
+        Values below the split point give deviations that grow as the rank
+        drops, values above it give deviations that grow with the rank, so
+        this is a selection over two sorted sequences.
+        """
+        values = self.sorted_values
+        half = len(values) // 2
+        left_size = half
+        right_size = len(values) - half
+        
+        def left(j: int) -> float:
+            return median - values[half - 1 - j]
+        
+        def right(j: int) -> float:
+            return values[half + j] - median
+        
+        # Binary search the number of deviations taken from the left half
+        low = max(0, k + 1 - right_size)
+        high = min(k + 1, left_size)
+        while low < high:
+            taken = (low + high) // 2
+            if left(taken) < right(k - taken):
+                low = taken + 1
+            else:
+                high = taken
+        taken = low
+        
+        candidates = []
+        if taken > 0:
+            candidates.append(left(taken - 1))
+        if k - taken >= 0:
+            candidates.append(right(k - taken))
+        return max(candidates)
+
+class RobustAnomalyDetector:
+    def __init__(self, window_size: int = 20, threshold: float = 3.5):
+        """
+        Initialize the robust (median/MAD) anomaly detector
+        
+        Scores each value with the modified Z-score 0.6745 * (x - median) / MAD
+        over a sliding window, which single spikes barely move.
+        
+        Args:
+            window_size (int): Size of the rolling window for calculations
+            threshold (float): Modified Z-score threshold
+        """
+        self.window_size = window_size
+        self.threshold = threshold
+        self.streams = {}
+
+    def _score(self, value: float, median: float, mad: float) -> float:
+        if mad == 0 or math.isnan(mad):
+            return math.nan
+        return 0.6745 * (value - median) / mad
+
+    def detect_robust_batch(self, data: pd.DataFrame, column: str = 'close') -> AnomalyBatch:
+        """
+        Detect anomalies using a sliding median and MAD as a columnar batch
+        
+        Args:
+            data (pd.DataFrame): DataFrame with the column and 'date'
+            column (str): Column to score, e.g. 'close' or 'volume'
+            
+        Returns:
+            AnomalyBatch: Detected anomalies
+        """
+        values = data[column].to_numpy()
+        medians = np.full(len(values), np.nan)
+        mads = np.full(len(values), np.nan)
+        
+        window = SlidingMedianMAD(self.window_size)
+        for i, value in enumerate(values):
+            window.push(value)
+            if i >= self.window_size:
+                medians[i] = window.median()
+                mads[i] = window.mad(medians[i])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            robust_z = np.where(mads > 0, 0.6745 * (values - medians) / mads, np.nan)
+        positions = np.flatnonzero(np.abs(robust_z) > self.threshold)
+        
+        return AnomalyBatch.from_arrays(
+            dates=data['date'].iloc[positions].to_numpy(),
+            scores=np.abs(robust_z[positions]),
+            threshold=self.threshold,
+            method='robust_mad',
+            details={
+                'price' if column == 'close' else column: values[positions],
+                'robust_z': robust_z[positions],
+                'rolling_median': medians[positions],
+                'rolling_mad': mads[positions]
+            }
+        )
+
+    def detect_robust_anomalies(self, data: pd.DataFrame, column: str = 'close') -> List[AnomalyResult]:
+        """
+        Detect anomalies using a sliding median and MAD
+        
+        Args:
+            data (pd.DataFrame): DataFrame with the column and 'date'
+            column (str): Column to score, e.g. 'close' or 'volume'
+            
+        Returns:
+            List[AnomalyResult]: List of detected anomalies
+        """
+        return self.detect_robust_batch(data, column).to_results()
+
+    def update(self, symbol: str, date, value: float, column: str = 'close') -> Optional[AnomalyResult]:
+        """
+        Add a new value for a symbol and score it
+        
+        Args:
+            symbol (str): Stock symbol
+            date: Date of the value
+            value (float): New value
+            column (str): Column the value belongs to, e.g. 'close' or 'volume'
+            
+        Returns:
+            Optional[AnomalyResult]: Anomaly if the value is flagged
+        """
+        key = (symbol, column)
+        if key not in self.streams:
+            self.streams[key] = {'bars': 0, 'window': SlidingMedianMAD(self.window_size)}
+        stream = self.streams[key]
+        stream['window'].push(value)
+        stream['bars'] += 1
+        
+        # Like the batch method, skip the first window_size values
+        if stream['bars'] <= self.window_size:
+            return None
+        
+        median = stream['window'].median()
+        mad = stream['window'].mad(median)
+        robust_z = self._score(float(value), median, mad)
+        if not abs(robust_z) > self.threshold:
+            return None
+        
+        return AnomalyResult(
+            date=date,
+            score=abs(robust_z),
+            threshold=self.threshold,
+            is_anomaly=True,
+            method='robust_mad',
+            details={
+                'price' if column == 'close' else column: value,
+                'robust_z': robust_z,
+                'rolling_median': median,
+                'rolling_mad': mad
+            }
+        )
\ No newline at end of file
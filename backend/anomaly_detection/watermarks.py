@@ -0,0 +1,117 @@
+import os
+import json
+import logging
+import threading
+import pandas as pd
+from typing import Dict, Iterable, Optional
+from .model_registry import to_watermark
+
+logger = logging.getLogger(__name__)
+
+class WatermarkStore:
+    def __init__(self, path: str = "watermarks.json"):
+        """
+        Initialize the JSON store of detection watermarks
+
+        The watermark of a symbol and method is the date of the last bar that
+        method has scored, so an incremental run only reports anomalies after
+        it. The file maps symbol -> method -> ISO formatted watermark.
+
+        Args:
+            path (str): JSON file holding the watermarks
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict:
+        # Locks can't be pickled
+        return {'path': self.path}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state['path'])
+
+    def _read(self) -> Dict[str, Dict[str, str]]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def _write(self, watermarks: Dict[str, Dict[str, str]]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(watermarks, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, symbol: str, method: str) -> Optional[str]:
+        """
+        Get the watermark of a symbol and method
+
+        Args:
+            symbol (str): Stock symbol
+            method (str): Detection method
+
+        Returns:
+            Optional[str]: Date of the last scored bar, None if never scored
+        """
+        with self._lock:
+            return self._read().get(symbol, {}).get(method)
+
+    def get_many(self, symbol: str, methods: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Get the watermarks of several methods with a single read
+
+        Args:
+            symbol (str): Stock symbol
+            methods (Iterable[str]): Detection methods
+
+        Returns:
+            Dict[str, Optional[str]]: Watermark of each method
+        """
+        with self._lock:
+            stored = self._read().get(symbol, {})
+        return {method: stored.get(method) for method in methods}
+
+    def update(self, symbol: str, watermarks: Dict[str, object]) -> None:
+        """
+        Persist new watermarks of a symbol
+
+        Watermarks never move backwards, so replaying old data can't make a
+        later run report anomalies twice.
+
+        Args:
+            symbol (str): Stock symbol
+            watermarks (Dict[str, object]): Date of the last scored bar per method
+        """
+        if not watermarks:
+            return
+        with self._lock:
+            stored = self._read()
+            symbol_watermarks = stored.setdefault(symbol, {})
+            for method, date in watermarks.items():
+                watermark = to_watermark(date)
+                current = symbol_watermarks.get(method)
+                if current is None or pd.Timestamp(watermark) > pd.Timestamp(current):
+                    symbol_watermarks[method] = watermark
+            self._write(stored)
+        logger.info(f"Updated watermarks for {symbol}: {symbol_watermarks}")
+
+    def reset(self, symbol: Optional[str] = None, method: Optional[str] = None) -> None:
+        """
+        Forget watermarks so the next run rescans the full history
+
+        Args:
+            symbol (str, optional): Only reset this symbol, all symbols if None
+            method (str, optional): Only reset this method of the symbol
+        """
+        with self._lock:
+            stored = self._read()
+            if symbol is None:
+                stored = {}
+            elif method is None:
+                stored.pop(symbol, None)
+            else:
+                stored.get(symbol, {}).pop(method, None)
+            self._write(stored)
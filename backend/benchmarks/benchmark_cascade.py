@@ -0,0 +1,74 @@
+"""
+Benchmark the hybrid detector cascade against full Isolation Forest and forecaster runs
+
+Usage (from the backend directory):
+    python -m benchmarks.benchmark_cascade --rows 20000 --forecaster ar --registry
+"""
+import argparse
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
+from anomaly_detection.cascade import CascadeConfig
+from anomaly_detection.hybrid_detection import HybridAnomalyDetector
+from anomaly_detection.model_registry import ModelRegistry, ManualRefitPolicy
+
+def make_data(rows: int, seed: int):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(scale=0.5, size=rows))
+    volume = rng.integers(1000, 5000, size=rows).astype(float)
+    spikes = rng.choice(np.arange(50, rows), size=max(1, rows // 200), replace=False)
+    close[spikes] += rng.choice([-1, 1], size=len(spikes)) * 4.0
+    volume[spikes[::2]] *= 5
+    return pd.DataFrame({
+        'date': pd.date_range('1960-01-01', periods=rows, freq='D'),
+        'close': close,
+        'volume': volume
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--forecaster', choices=['lstm', 'ar'], default='ar')
+    parser.add_argument('--registry', action='store_true',
+                        help='Reuse registered models so runs are scoring-only')
+    args = parser.parse_args()
+
+    data = make_data(args.rows, seed=42)
+    configs = [
+        CascadeConfig(near_threshold=1.0, margin_before=0, margin_after=0),
+        CascadeConfig(near_threshold=0.8),
+        CascadeConfig(),
+        CascadeConfig(near_threshold=0.5),
+    ]
+
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root) if args.registry else None
+        detector = HybridAnomalyDetector(
+            methods=['zscore', 'volume', 'isolation_forest', 'lstm'],
+            forecaster=args.forecaster,
+            model_registry=registry,
+            refit_policy=ManualRefitPolicy(),
+            cache_size=0
+        )
+        if registry is not None:
+            # Fit and register the models once, as a previous run would have
+            detector.detect_anomalies(data, symbol='BENCH')
+
+        print(f"rows={args.rows:,} forecaster={args.forecaster} registry={'yes' if registry else 'no'}\n")
+        print(f"{'near':>6}{'margins':>9}{'scored':>9}{'full s':>9}{'cascade s':>11}"
+              f"{'IF recall':>11}{'fc recall':>11}{'fc extra':>10}")
+        for config in configs:
+            report = detector.evaluate_cascade(data, symbol='BENCH', cascade=config)
+            margins = f"{config.margin_before}/{config.margin_after}"
+            print(f"{config.near_threshold:>6.2f}{margins:>9}{report.scored_fraction:>9.1%}"
+                  f"{report.full_seconds:>9.2f}{report.cascade_seconds:>11.2f}"
+                  f"{report.recall.get('isolation_forest', float('nan')):>11.3f}"
+                  f"{report.recall.get('lstm', float('nan')):>11.3f}"
+                  f"{report.extra.get('lstm', 0):>10}")
+
+if __name__ == "__main__":
+    main()
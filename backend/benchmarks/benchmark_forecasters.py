@@ -0,0 +1,65 @@
+"""
+Benchmark the LSTM and autoregressive forecasters on injected price spikes
+
+Usage (from the backend directory):
+    python -m benchmarks.benchmark_forecasters --rows 5000 --epochs 10
+"""
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
+from anomaly_detection.autoregressive import AutoregressiveAnomalyDetector
+from anomaly_detection.ml_models import LSTMAnomalyDetector
+
+def make_data(rows: int, spike_rate: float, spike_size: float, seed: int):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(scale=0.5, size=rows))
+    spikes = rng.choice(np.arange(50, rows), size=max(1, int(rows * spike_rate)), replace=False)
+    close[spikes] += rng.choice([-1, 1], size=len(spikes)) * spike_size * 0.5
+    data = pd.DataFrame({
+        'date': pd.date_range('2000-01-01', periods=rows, freq='D'),
+        'close': close
+    })
+    return data, set(data['date'].iloc[spikes])
+
+def run(detector, data, spike_dates, epochs):
+    start = time.perf_counter()
+    detector.train(data, epochs=epochs)
+    train_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    anomalies = detector.detect_lstm_anomalies(data)
+    detect_seconds = time.perf_counter() - start
+
+    flagged = {anomaly.date for anomaly in anomalies}
+    recall = len(flagged & spike_dates) / len(spike_dates)
+    precision = len(flagged & spike_dates) / len(flagged) if flagged else 0.0
+    return train_seconds, detect_seconds, len(flagged), recall, precision
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--spike-rate', type=float, default=0.005)
+    parser.add_argument('--spike-size', type=float, default=8.0,
+                        help='Spike height in standard deviations of daily moves')
+    parser.add_argument('--skip-lstm', action='store_true')
+    args = parser.parse_args()
+
+    data, spike_dates = make_data(args.rows, args.spike_rate, args.spike_size, seed=42)
+    detectors = [('autoregressive (ridge)', AutoregressiveAnomalyDetector())]
+    if not args.skip_lstm:
+        detectors.append((f'lstm ({args.epochs} epochs)', LSTMAnomalyDetector()))
+
+    print(f"rows={args.rows:,} spikes={len(spike_dates)} spike_size={args.spike_size} sd\n")
+    print(f"{'forecaster':<26}{'train s':>10}{'detect s':>10}{'flagged':>9}{'recall':>8}{'precision':>11}")
+    for name, detector in detectors:
+        train_s, detect_s, flagged, recall, precision = run(detector, data, spike_dates, args.epochs)
+        print(f"{name:<26}{train_s:>10.3f}{detect_s:>10.3f}{flagged:>9}{recall:>8.2f}{precision:>11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark import time and memory of the detectors, with and without TensorFlow
+
+Usage (from the backend directory):
+    python -m benchmarks.benchmark_import_time --repeats 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Each scenario runs in a fresh interpreter so nothing is cached between them
+SCENARIOS = [
+    ('statistical_methods', "import anomaly_detection.statistical_methods"),
+    ('hybrid_detection (lazy)', "import anomaly_detection.hybrid_detection"),
+    ('hybrid_detection + tensorflow (eager, as before)',
+     "import tensorflow, tensorflow.keras.layers, tensorflow.keras.models\n"
+     "import anomaly_detection.hybrid_detection"),
+    ('Hybrid(statistical + isolation_forest)',
+     "from anomaly_detection.hybrid_detection import HybridAnomalyDetector\n"
+     "HybridAnomalyDetector(methods=['bollinger_bands', 'zscore', 'volume', 'isolation_forest'])"),
+    ('LSTMAnomalyDetector().model',
+     "from anomaly_detection.ml_models import LSTMAnomalyDetector\n"
+     "LSTMAnomalyDetector().model"),
+]
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+exec(compile(sys.argv[1], '<scenario>', 'exec'))
+seconds = time.perf_counter() - start
+print(json.dumps({
+    'seconds': seconds,
+    'max_rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'tensorflow_loaded': 'tensorflow' in sys.modules
+}))
+"""
+
+def run_scenario(code: str) -> dict:
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL='3')
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD, code],
+        capture_output=True, text=True, check=True, env=env
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"median of {args.repeats} fresh interpreters\n")
+    print(f"{'scenario':<50}{'seconds':>10}{'max RSS MiB':>14}{'tensorflow':>12}")
+    for name, code in SCENARIOS:
+        runs = [run_scenario(code) for _ in range(args.repeats)]
+        seconds = statistics.median(run['seconds'] for run in runs)
+        rss = statistics.median(run['max_rss_mib'] for run in runs)
+        loaded = 'yes' if runs[0]['tensorflow_loaded'] else 'no'
+        print(f"{name:<50}{seconds:>10.3f}{rss:>14.1f}{loaded:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark per-symbol LSTM training and detection against the batched multi-symbol mode
+
+Usage (from the backend directory):
+    python -m benchmarks.benchmark_lstm_multi_symbol --symbols 100 --rows 250 --epochs 2
+"""
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+
+from anomaly_detection.ml_models import LSTMAnomalyDetector
+
+def make_data(symbols: int, rows: int, seed: int):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2020-01-01', periods=rows, freq='D')
+    return {
+        f"SYM{i:04d}": pd.DataFrame({
+            'date': dates,
+            'close': rng.uniform(20, 500) + np.cumsum(rng.normal(scale=1.0, size=rows))
+        })
+        for i in range(symbols)
+    }
+
+def per_symbol(data_by_symbol, epochs, batch_size):
+    detector = LSTMAnomalyDetector()
+    anomalies = {}
+    for symbol, data in data_by_symbol.items():
+        detector.train(data, epochs=epochs, batch_size=batch_size)
+        anomalies[symbol] = detector.detect_lstm_anomalies(data)
+    return anomalies
+
+def batched(data_by_symbol, epochs, batch_size):
+    detector = LSTMAnomalyDetector()
+    detector.train_many(data_by_symbol, epochs=epochs, batch_size=batch_size)
+    return detector.detect_many(data_by_symbol)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=100)
+    parser.add_argument('--rows', type=int, default=250)
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    data_by_symbol = make_data(args.symbols, args.rows, seed=42)
+    print(f"symbols={args.symbols} rows={args.rows} epochs={args.epochs} batch_size={args.batch_size}\n")
+    print(f"{'strategy':<40}{'seconds':>10}{'anomalies':>11}")
+    for name, fn in [('per symbol (fit + predict per symbol)', per_symbol),
+                     ('train_many + detect_many', batched)]:
+        start = time.perf_counter()
+        anomalies = fn(data_by_symbol, args.epochs, args.batch_size)
+        seconds = time.perf_counter() - start
+        total = sum(len(results) for results in anomalies.values())
+        print(f"{name:<40}{seconds:>10.2f}{total:>11}")
+
+if __name__ == "__main__":
+    main()
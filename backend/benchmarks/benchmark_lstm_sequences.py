@@ -0,0 +1,63 @@
+"""
+Benchmark LSTM sequence windowing: copied Python-loop windows against strided views
+
+Usage (from the backend directory):
+    python -m benchmarks.benchmark_lstm_sequences --rows 1000000
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from anomaly_detection.ml_models import LSTMAnomalyDetector
+
+def legacy_prepare_sequences(detector: LSTMAnomalyDetector, data: pd.DataFrame):
+    """Windowing as implemented before strided views: a list of slices copied by np.array"""
+    scaled_data = detector.scaler.fit_transform(data[['close']].values)
+    X, y = [], []
+    for i in range(len(scaled_data) - detector.sequence_length):
+        X.append(scaled_data[i:(i + detector.sequence_length)])
+        y.append(scaled_data[i + detector.sequence_length])
+    return np.array(X), np.array(y)
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 2**20
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--sequence-length', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=4096)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    data = pd.DataFrame({
+        'date': pd.date_range('2015-01-01', periods=args.rows, freq='min'),
+        'close': 100 + np.cumsum(rng.normal(scale=0.05, size=args.rows))
+    })
+    detector = LSTMAnomalyDetector(sequence_length=args.sequence_length)
+
+    (X_old, y_old), old_seconds, old_peak = measure(legacy_prepare_sequences, detector, data)
+    (X_new, y_new), new_seconds, new_peak = measure(detector.prepare_sequences, data)
+    assert np.array_equal(X_old, X_new) and np.array_equal(y_old, y_new)
+    del X_old, y_old
+
+    def consume_batches():
+        scaled_data = detector._scale(data)
+        return sum(len(X) for X, _ in detector.iter_sequence_batches(scaled_data, args.batch_size))
+    _, batch_seconds, batch_peak = measure(consume_batches)
+
+    print(f"rows={args.rows:,} sequence_length={args.sequence_length}\n")
+    print(f"{'strategy':<34}{'seconds':>10}{'peak MiB':>12}")
+    print(f"{'python loop + np.array (copies)':<34}{old_seconds:>10.3f}{old_peak:>12.1f}")
+    print(f"{'strided views':<34}{new_seconds:>10.3f}{new_peak:>12.1f}")
+    print(f"{f'generator batches of {args.batch_size}':<34}{batch_seconds:>10.3f}{batch_peak:>12.1f}")
+
+if __name__ == "__main__":
+    main()
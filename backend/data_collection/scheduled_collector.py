@@ -38,6 +38,12 @@ def collect_daily_data():
     today = datetime.now(est).date()
     
     try:
+        # Create any missing stocks in one statement before collecting
+        db.get_stock_ids(
+            [company["symbol"] for company in COMPANIES],
+            {company["symbol"]: {"company_name": company["name"]} for company in COMPANIES}
+        )
+        
         for company in COMPANIES:
             symbol = company["symbol"]
             print(f"Collecting data for {symbol}")
@@ -1,10 +1,14 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime
+import os
+import json
 import logging
-from typing import List
+import pandas as pd
+from typing import List, Optional
 from .fetch_data import StockDataFetcher
 from ..data_storage.database import DatabaseManager
+from ..anomaly_detection.incremental import IncrementalStatisticalDetector
 
 # Configure logging
 logging.basicConfig(
@@ -14,11 +18,86 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class DataIngestionScheduler:
-    def __init__(self, symbols: List[str], db_manager: DatabaseManager):
+    def __init__(self, symbols: List[str], db_manager: DatabaseManager,
+                 detector: Optional[IncrementalStatisticalDetector] = None,
+                 snapshot_path: Optional[str] = None):
+        """
+        Initialize the daily ingestion scheduler
+        
+        Args:
+            symbols (List[str]): Stock symbols to ingest
+            db_manager (DatabaseManager): Database the bars are stored in
+            detector (IncrementalStatisticalDetector, optional): Scores new bars
+                as they are ingested
+            snapshot_path (str, optional): JSON file the detector state is saved
+                to after every ingestion; if it exists, its state is loaded so a
+                restart doesn't replay the stored history. A given detector keeps
+                its configuration, and a snapshot taken with another window
+                size is ignored with a warning
+        """
         self.scheduler = BackgroundScheduler()
         self.symbols = symbols
         self.db_manager = db_manager
         self.data_fetcher = StockDataFetcher()
+        self.detector = detector
+        self.snapshot_path = snapshot_path
+        if snapshot_path is not None and os.path.exists(snapshot_path):
+            self.load_snapshot()
+
+    def load_snapshot(self):
+        """
+        Load the detector state saved at snapshot_path
+
+        Without a detector, one is rebuilt from the snapshot. Otherwise the
+        state is loaded into the given detector, keeping its configuration.
+        """
+        with open(self.snapshot_path) as f:
+            snapshot = json.load(f)
+        if self.detector is None:
+            self.detector = IncrementalStatisticalDetector.restore(snapshot)
+        else:
+            try:
+                self.detector.load_snapshot(snapshot)
+            except ValueError as e:
+                logger.warning(f"Ignoring detector snapshot {self.snapshot_path}: {str(e)}")
+                return
+        logger.info(f"Restored detector state of {len(self.detector.states)} symbols from {self.snapshot_path}")
+
+    def save_snapshot(self):
+        """
+        Write the detector state to snapshot_path, atomically
+        """
+        if self.detector is None or self.snapshot_path is None:
+            return
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.detector.snapshot(), f)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def score_new_bars(self, symbol: str, df: pd.DataFrame):
+        """
+        Score newly fetched bars with the incremental detector
+        
+        The detector is warmed up from the stored history the first time a
+        symbol is seen, so later runs only pay for the new bars. Bars at or
+        before the last one the detector has seen are skipped.
+        
+        Args:
+            symbol (str): Stock symbol
+            df (pd.DataFrame): Newly fetched bars
+        """
+        if not self.detector.has_symbol(symbol):
+            history = self.db_manager.get_stock_data(symbol)
+            if not history.empty:
+                self.detector.warm_up(symbol, history.sort_values('date'))
+        
+        df = df.sort_values('date')
+        for date, close, volume in zip(df['date'], df['close'], df['volume']):
+            for anomaly in self.detector.update(symbol, date, close, volume):
+                logger.info(f"{anomaly.method} anomaly for {symbol} on {date} (score {anomaly.score:.2f})")
 
     def fetch_and_store_data(self):
         """
@@ -30,11 +109,15 @@ class DataIngestionScheduler:
             
             for symbol, df in data.items():
                 if not df.empty:
-                    # Store the data in the database
+                    # Score against the history stored so far, then store the data
+                    if self.detector is not None:
+                        self.score_new_bars(symbol, df)
                     self.db_manager.store_stock_data(symbol, df)
                     logger.info(f"Successfully stored data for {symbol}")
                 else:
                     logger.warning(f"No data fetched for {symbol}")
+            
+            self.save_snapshot()
                     
         except Exception as e:
             logger.error(f"Error in data ingestion: {str(e)}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -20,6 +20,10 @@ class Stock(Base):
 
 class StockPrice(Base):
     __tablename__ = 'stock_prices'
+    # One bar per stock and date; store_stock_data upserts on this key
+    __table_args__ = (
+        UniqueConstraint('stock_id', 'date', name='uq_stock_prices_stock_id_date'),
+    )
     
     id = Column(Integer, primary_key=True)
     stock_id = Column(Integer, ForeignKey('stocks.id'), nullable=False)
@@ -36,6 +40,11 @@ class StockPrice(Base):
 
 class Anomaly(Base):
     __tablename__ = 'anomalies'
+    # One anomaly per stock, date and method; score is indexed for top-k queries
+    __table_args__ = (
+        UniqueConstraint('stock_id', 'date', 'detection_method', name='uq_anomalies_stock_id_date_method'),
+        Index('ix_anomalies_score', 'score'),
+    )
     
     id = Column(Integer, primary_key=True)
     stock_id = Column(Integer, ForeignKey('stocks.id'), nullable=False)
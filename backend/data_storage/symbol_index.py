@@ -0,0 +1,213 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from .models import Stock
+
+logger = logging.getLogger(__name__)
+
+# One index per database URL, shared by every DatabaseManager in the process
+_indexes: Dict[str, 'SymbolIndex'] = {}
+_indexes_lock = threading.Lock()
+
+def get_symbol_index(engine) -> 'SymbolIndex':
+    """
+    Get the process-wide symbol index of a database
+
+    Args:
+        engine (Engine): Engine of the database
+
+    Returns:
+        SymbolIndex: Index shared by all engines with the same URL
+    """
+    key = engine.url.render_as_string(hide_password=False)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = SymbolIndex(engine)
+        return _indexes[key]
+
+class SymbolIndex:
+    def __init__(self, engine, missing_ttl: float = 60.0, max_missing: int = 10000):
+        """
+        Initialize the in-memory symbol <-> stock id index
+
+        The stocks table is read once on first use. Symbols created through
+        ensure() are added as they are inserted, and a symbol another process
+        created is picked up by a single lookup the first time it is missed.
+        Misses are remembered for missing_ttl seconds, so repeated lookups of
+        an unknown symbol don't query the database each time.
+
+        Args:
+            engine (Engine): Engine of the database holding the stocks table
+            missing_ttl (float): Seconds a symbol found missing is reported
+                missing without a lookup
+            max_missing (int): Maximum number of remembered misses
+        """
+        self.engine = engine
+        self.missing_ttl = missing_ttl
+        self.max_missing = max_missing
+        self._ids: Dict[str, int] = {}
+        self._symbols: Dict[int, str] = {}
+        # Symbol -> monotonic time it was found missing, oldest first
+        self._missing: 'OrderedDict[str, float]' = OrderedDict()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._ids)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.get_id(symbol) is not None
+
+    def load(self) -> None:
+        """Reload the whole index from the stocks table"""
+        with self.engine.connect() as connection:
+            rows = connection.execute(select(Stock.__table__.c.id, Stock.__table__.c.symbol)).all()
+        with self._lock:
+            self._ids = {symbol: stock_id for stock_id, symbol in rows}
+            self._symbols = {stock_id: symbol for stock_id, symbol in rows}
+            self._missing.clear()
+            self._loaded = True
+        logger.info(f"Loaded {len(rows)} symbols into the symbol index")
+
+    def clear(self) -> None:
+        """Forget all symbols, the next lookup reloads the index"""
+        with self._lock:
+            self._ids = {}
+            self._symbols = {}
+            self._missing.clear()
+            self._loaded = False
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def _add(self, rows: Iterable) -> None:
+        with self._lock:
+            for stock_id, symbol in rows:
+                self._ids[symbol] = stock_id
+                self._symbols[stock_id] = symbol
+                self._missing.pop(symbol, None)
+
+    def _known_missing(self, symbol: str) -> bool:
+        with self._lock:
+            missed_at = self._missing.get(symbol)
+            if missed_at is None:
+                return False
+            if time.monotonic() - missed_at < self.missing_ttl:
+                return True
+            del self._missing[symbol]
+            return False
+
+    def _remember_missing(self, symbol: str) -> None:
+        with self._lock:
+            self._missing[symbol] = time.monotonic()
+            self._missing.move_to_end(symbol)
+            while len(self._missing) > self.max_missing:
+                self._missing.popitem(last=False)
+
+    def _select(self, connection, symbols: List[str]) -> List:
+        table = Stock.__table__
+        return connection.execute(
+            select(table.c.id, table.c.symbol).where(table.c.symbol.in_(symbols))
+        ).all()
+
+    def get_id(self, symbol: str) -> Optional[int]:
+        """
+        Get the id of a stock
+
+        Args:
+            symbol (str): Stock symbol
+
+        Returns:
+            Optional[int]: Stock id, None if the symbol doesn't exist
+        """
+        self._ensure_loaded()
+        stock_id = self._ids.get(symbol)
+        if stock_id is None and not self._known_missing(symbol):
+            # Another process may have created it since the index was loaded
+            with self.engine.connect() as connection:
+                rows = self._select(connection, [symbol])
+            self._add(rows)
+            stock_id = self._ids.get(symbol)
+            if stock_id is None:
+                self._remember_missing(symbol)
+        return stock_id
+
+    def get_symbol(self, stock_id: int) -> Optional[str]:
+        """
+        Get the symbol of a stock id
+
+        Args:
+            stock_id (int): Stock id
+
+        Returns:
+            Optional[str]: Stock symbol, None if the id isn't indexed
+        """
+        self._ensure_loaded()
+        return self._symbols.get(stock_id)
+
+    def ensure(self, symbols: Iterable[str],
+               details: Optional[Dict[str, Dict[str, Optional[str]]]] = None) -> Dict[str, int]:
+        """
+        Get the ids of stocks, creating the unknown ones in one statement
+
+        Creation is race-safe: concurrent callers inserting the same symbol
+        rely on INSERT .. ON CONFLICT (symbol) DO NOTHING and then re-select,
+        so every caller ends up with the id of the single stored row.
+
+        Args:
+            symbols (Iterable[str]): Stock symbols
+            details (Dict[str, Dict], optional): company_name and sector of
+                symbols that may need to be created
+
+        Returns:
+            Dict[str, int]: Stock id of every symbol
+        """
+        symbols = list(dict.fromkeys(symbols))
+        self._ensure_loaded()
+        missing = [symbol for symbol in symbols if symbol not in self._ids]
+        if missing:
+            details = details or {}
+            rows = [{
+                'symbol': symbol,
+                'company_name': details.get(symbol, {}).get('company_name'),
+                'sector': details.get(symbol, {}).get('sector'),
+                'created_at': datetime.utcnow()
+            } for symbol in missing]
+            self._insert_missing(rows)
+            with self.engine.connect() as connection:
+                self._add(self._select(connection, missing))
+            logger.info(f"Indexed new symbols: {missing}")
+        return {symbol: self._ids[symbol] for symbol in symbols}
+
+    def _insert_missing(self, rows: List[Dict]) -> None:
+        """
+        Insert stocks, ignoring the ones that already exist
+
+        Args:
+            rows (List[Dict]): Stock rows to insert
+        """
+        dialect = self.engine.dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            statement = insert(Stock.__table__).on_conflict_do_nothing(index_elements=['symbol'])
+            with self.engine.begin() as connection:
+                connection.execute(statement, rows)
+            return
+
+        # Without ON CONFLICT, a duplicate insert just loses the race
+        for row in rows:
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(Stock.__table__.insert(), row)
+            except IntegrityError:
+                pass
@@ -44,19 +44,19 @@ async def get_stocks():
 @app.get("/api/stock-data")
 async def get_stock_data(symbol: str, start: Optional[str] = None, end: Optional[str] = None):
     """Get historical stock data"""
+    # Resolved from the in-memory symbol index, no stocks query per request
+    stock_id = db.symbols.get_id(symbol)
+    if stock_id is None:
+        raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
+    
     session = db.Session()
     try:
         # Convert string dates to datetime
         start_date = datetime.fromisoformat(start.replace('Z', '+00:00')) if start else None
         end_date = datetime.fromisoformat(end.replace('Z', '+00:00')) if end else None
         
-        # Get stock
-        stock = session.query(Stock).filter(Stock.symbol == symbol).first()
-        if not stock:
-            raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
-        
         # Query stock prices
-        query = session.query(StockPrice).filter(StockPrice.stock_id == stock.id)
+        query = session.query(StockPrice).filter(StockPrice.stock_id == stock_id)
         if start_date:
             query = query.filter(StockPrice.date >= start_date)
         if end_date:
@@ -86,19 +86,19 @@ async def get_stock_data(symbol: str, start: Optional[str] = None, end: Optional
 @app.get("/api/anomalies")
 async def get_anomalies(symbol: str, start: Optional[str] = None, end: Optional[str] = None):
     """Get detected anomalies"""
+    # Resolved from the in-memory symbol index, no stocks query per request
+    stock_id = db.symbols.get_id(symbol)
+    if stock_id is None:
+        raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
+    
     session = db.Session()
     try:
         # Convert string dates to datetime
         start_date = datetime.fromisoformat(start.replace('Z', '+00:00')) if start else None
         end_date = datetime.fromisoformat(end.replace('Z', '+00:00')) if end else None
         
-        # Get stock
-        stock = session.query(Stock).filter(Stock.symbol == symbol).first()
-        if not stock:
-            raise HTTPException(status_code=404, detail=f"Stock {symbol} not found")
-        
         # Query anomalies
-        query = session.query(Anomaly).filter(Anomaly.stock_id == stock.id)
+        query = session.query(Anomaly).filter(Anomaly.stock_id == stock_id)
         if start_date:
             query = query.filter(Anomaly.date >= start_date)
         if end_date:
@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+
+# The backend packages are imported from the backend directory, as the app does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+@pytest.fixture
+def prices() -> pd.DataFrame:
+    """Daily random walk with price and volume spikes"""
+    rng = np.random.default_rng(42)
+    rows = 2000
+    close = 100 + np.cumsum(rng.normal(scale=0.5, size=rows))
+    volume = rng.integers(1000, 5000, size=rows).astype(float)
+    spikes = rng.choice(np.arange(50, rows), size=20, replace=False)
+    close[spikes] += 4.0
+    volume[spikes[::2]] *= 5
+    return pd.DataFrame({
+        'date': pd.date_range('2000-01-01', periods=rows, freq='D'),
+        'open': close,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': volume
+    })
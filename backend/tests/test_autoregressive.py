@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from anomaly_detection.autoregressive import AutoregressiveAnomalyDetector
+
+SPIKES = [100, 230, 370, 480, 555]
+
+@pytest.fixture
+def spiky() -> pd.DataFrame:
+    """Smooth seasonal closes with a few injected price spikes"""
+    rng = np.random.default_rng(0)
+    steps = np.arange(600)
+    close = 100 + 5 * np.sin(steps / 15) + rng.normal(scale=0.1, size=len(steps))
+    close[SPIKES] += 3.0
+    return pd.DataFrame({'date': pd.date_range('2020-01-01', periods=len(steps), freq='D'), 'close': close})
+
+def _positions(data, anomalies):
+    return data.index[data['date'].isin([anomaly.date for anomaly in anomalies])].tolist()
+
+def test_ar_forecaster_flags_injected_spikes(spiky):
+    detector = AutoregressiveAnomalyDetector()
+    report = detector.train(spiky)
+    assert report.train_sequences == len(spiky) - detector.sequence_length
+    anomalies = detector.detect_lstm_anomalies(spiky)
+    flagged = _positions(spiky, anomalies)
+
+    assert set(SPIKES) <= set(flagged)
+    # Other flags are echoes of a spike still inside the forecast window
+    assert all(any(0 < row - spike <= detector.sequence_length for spike in SPIKES)
+               for row in set(flagged) - set(SPIKES))
+    scores = {row: anomaly.score for row, anomaly in zip(flagged, anomalies)}
+    for spike in SPIKES:
+        echoes = [scores[row] for row in flagged if 0 < row - spike <= detector.sequence_length]
+        assert scores[spike] > max(echoes, default=0)
+
+def test_ar_forecast_matches_explicit_windows(spiky):
+    detector = AutoregressiveAnomalyDetector(sequence_length=5)
+    detector.train(spiky)
+    scaled = detector._scale(spiky, fit_scaler=False)
+    X, _ = detector._windows(scaled)
+    expected = X[:, :, 0] @ detector.coef_ + detector.intercept_
+    assert np.allclose(detector._predict_scaled(scaled)[:, 0], expected)
+    assert np.allclose(detector._predict_scaled(scaled, np.array([0, 7, 42]))[:, 0], expected[[0, 7, 42]])
+
+def test_ar_detect_requires_training(spiky):
+    with pytest.raises(RuntimeError):
+        AutoregressiveAnomalyDetector().detect_lstm_anomalies(spiky)
+    with pytest.raises(ValueError):
+        AutoregressiveAnomalyDetector().train(spiky.iloc[:10])
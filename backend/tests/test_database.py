@@ -0,0 +1,98 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import event, text
+from data_storage.database import DatabaseManager
+
+def _bars(rows=5, start='2024-01-01'):
+    return pd.DataFrame({
+        'date': pd.bdate_range(start, periods=rows, tz='America/New_York'),
+        'open': 10.0, 'high': 11.0, 'low': 9.0, 'close': 10.5,
+        'volume': np.arange(rows, dtype=float) * 100
+    })
+
+def _stored(db, symbol):
+    return db.get_stock_data(symbol).sort_values('date').reset_index(drop=True)
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    yield db
+    db.engine.dispose()
+
+@pytest.fixture
+def postgres_db():
+    url = os.environ.get('TEST_POSTGRES_URL')
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    db = DatabaseManager(url)
+    yield db
+    with db.engine.begin() as connection:
+        connection.execute(text("DELETE FROM stock_prices WHERE stock_id IN "
+                                "(SELECT id FROM stocks WHERE symbol LIKE 'ZZTEST%')"))
+    db.engine.dispose()
+
+def test_missing_volume_is_stored_as_zero(sqlite_db):
+    bars = _bars()
+    bars.loc[2, 'volume'] = np.nan
+    report = sqlite_db.store_stock_data('NANVOL', bars)
+    assert report.rows == 5
+    assert _stored(sqlite_db, 'NANVOL')['volume'].tolist() == [0, 100, 0, 300, 400]
+
+def test_reingesting_upserts(sqlite_db):
+    sqlite_db.store_stock_data('UPSERT', _bars())
+    updated = _bars(rows=7)
+    updated['close'] = 12.0
+    sqlite_db.store_stock_data('UPSERT', updated)
+    stored = _stored(sqlite_db, 'UPSERT')
+    assert len(stored) == 7
+    assert (stored['close'] == 12.0).all()
+
+@pytest.mark.parametrize('strategy', ['executemany', 'copy'])
+def test_postgres_strategies_upsert(postgres_db, strategy):
+    symbol = f"ZZTEST{strategy[:4].upper()}"
+    bars = _bars()
+    bars.loc[1, 'volume'] = np.nan
+    postgres_db.store_stock_data(symbol, bars, strategy=strategy)
+    bars['close'] = 12.0
+    postgres_db.store_stock_data(symbol, pd.concat([bars, _bars(rows=2, start='2024-02-01')]),
+                                 strategy=strategy)
+    stored = _stored(postgres_db, symbol)
+    assert len(stored) == 7
+    assert stored['volume'].iloc[1] == 0
+    assert (stored['close'].iloc[:5] == 12.0).all()
+
+def _record_queries(db):
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+def test_unknown_symbol_lookups_are_cached(sqlite_db):
+    sqlite_db.symbols.get_id('NOPE')
+    statements = _record_queries(sqlite_db)
+    for _ in range(3):
+        assert sqlite_db.get_stock_data('NOPE').empty
+        assert sqlite_db.get_anomalies('NOPE') == []
+    assert statements == []
+
+    # Creating the symbol drops the cached miss
+    sqlite_db.store_stock_data('NOPE', _bars())
+    assert sqlite_db.symbols.get_id('NOPE') is not None
+    assert len(_stored(sqlite_db, 'NOPE')) == 5
+
+def test_cached_miss_expires(sqlite_db):
+    sqlite_db.symbols.missing_ttl = 0.0
+    assert sqlite_db.symbols.get_id('LATER') is None
+    # Another process creates the symbol
+    with sqlite_db.engine.begin() as connection:
+        connection.execute(text("INSERT INTO stocks (symbol) VALUES ('LATER')"))
+    assert sqlite_db.symbols.get_id('LATER') is not None
+
+def test_get_anomalies_filters_by_symbol(sqlite_db):
+    ids = sqlite_db.symbols.ensure(['AAA', 'BBB'])
+    sqlite_db.store_anomaly(ids['AAA'], '2024-01-02', 'price', 'zscore', 3.0, 2.0)
+    sqlite_db.store_anomaly(ids['BBB'], '2024-01-03', 'price', 'zscore', 4.0, 2.0)
+    assert [anomaly['stock_id'] for anomaly in sqlite_db.get_anomalies('AAA')] == [ids['AAA']]
+    assert len(sqlite_db.get_anomalies()) == 2
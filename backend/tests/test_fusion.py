@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from anomaly_detection.fusion import consensus_anomalies, weighted_anomalies
+from anomaly_detection.statistical_methods import AnomalyResult
+
+METHODS = ['zscore', 'bollinger_bands', 'isolation_forest', 'lstm']
+
+def _grouped(all_anomalies):
+    # Per-date grouping of the loop fusion used before AnomalyMatrix
+    groups = {}
+    for method, anomalies in all_anomalies.items():
+        for anomaly in anomalies:
+            group = groups.setdefault(anomaly.date, {'methods': set(), 'anomalies': [], 'by_method': []})
+            group['methods'].add(method)
+            group['anomalies'].append(anomaly)
+            group['by_method'].append(method)
+    return groups
+
+def _loop_consensus(all_anomalies, min_methods):
+    consensus = []
+    for date, group in _grouped(all_anomalies).items():
+        if len(group['anomalies']) >= min_methods:
+            best = max(group['anomalies'], key=lambda x: x.score)
+            consensus.append((best, group['methods'], len(group['anomalies'])))
+    return sorted(consensus, key=lambda x: x[0].date)
+
+def _loop_weighted(all_anomalies, method_weights):
+    weighted = []
+    for date, group in _grouped(all_anomalies).items():
+        score = 0.0
+        for method, anomaly in zip(group['by_method'], group['anomalies']):
+            score += method_weights.get(method, 0.0) * anomaly.score
+        if score > 0:
+            best = max(group['anomalies'], key=lambda x: x.score)
+            weighted.append((date, score, best, group['methods']))
+    return sorted(weighted, key=lambda x: x[0])
+
+def _same_score(a, b):
+    return (math.isnan(a) and math.isnan(b)) or a == b
+
+def _anomalies(seed, as_strings=False):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-01', periods=60, freq='D')
+    all_anomalies = {}
+    for method in METHODS:
+        anomalies = []
+        for position in rng.choice(len(dates), size=25, replace=False):
+            # Coarse scores make ties across methods common
+            score = float(rng.integers(1, 6)) if rng.random() < 0.9 else math.nan
+            date = dates[position]
+            anomalies.append(AnomalyResult(
+                date=str(date.date()) if as_strings else date,
+                score=score,
+                threshold=2.0,
+                is_anomaly=True,
+                method=method,
+                details={'source': method, 'position': int(position)}
+            ))
+        all_anomalies[method] = anomalies
+    return all_anomalies
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('as_strings', [False, True])
+@pytest.mark.parametrize('min_methods', [1, 2, 3])
+def test_consensus_matches_loop(seed, as_strings, min_methods):
+    all_anomalies = _anomalies(seed, as_strings)
+    result = consensus_anomalies(all_anomalies, min_methods)
+    expected = _loop_consensus(all_anomalies, min_methods)
+
+    assert len(result) == len(expected)
+    for anomaly, (best, methods, count) in zip(result, expected):
+        assert anomaly.date == best.date
+        assert _same_score(anomaly.score, best.score)
+        assert anomaly.method == best.method
+        assert anomaly.details['position'] == best.details['position']
+        assert anomaly.details['method_count'] == count
+        assert anomaly.details['detecting_methods'] == [m for m in METHODS if m in methods]
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('as_strings', [False, True])
+def test_weighted_matches_loop(seed, as_strings):
+    all_anomalies = _anomalies(seed, as_strings)
+    method_weights = {'zscore': 0.3, 'bollinger_bands': 0.1, 'isolation_forest': 0.35}
+    result = weighted_anomalies(all_anomalies, method_weights)
+    expected = _loop_weighted(all_anomalies, method_weights)
+
+    assert len(result) == len(expected)
+    for anomaly, (date, score, best, methods) in zip(result, expected):
+        assert anomaly.date == date
+        # Sums are accumulated in the same order, so they are bit-identical
+        assert anomaly.score == score
+        assert anomaly.details['weighted_score'] == score
+        assert anomaly.details['position'] == best.details['position']
+        assert anomaly.details['detecting_methods'] == [m for m in METHODS if m in methods]
+
+def test_fusion_of_nothing_is_empty():
+    assert consensus_anomalies({}) == []
+    assert weighted_anomalies({method: [] for method in METHODS}, {'zscore': 1.0}) == []
@@ -0,0 +1,127 @@
+import time
+import pandas as pd
+import pytest
+from anomaly_detection.cascade import CascadeConfig
+from anomaly_detection.autoregressive import AutoregressiveAnomalyDetector
+from anomaly_detection.hybrid_detection import HybridAnomalyDetector
+from anomaly_detection.model_registry import ModelRegistry, RefitPolicy, to_watermark
+from anomaly_detection.watermarks import WatermarkStore
+
+def _slow(method, seconds):
+    def run(*args, **kwargs):
+        time.sleep(seconds)
+        return method(*args, **kwargs)
+    return run
+
+@pytest.fixture
+def threaded():
+    detector = HybridAnomalyDetector(
+        methods=['zscore', 'isolation_forest', 'lstm'], forecaster='ar',
+        executor='thread', max_workers=1, detector_timeout=1.0, cache_size=0
+    )
+    yield detector
+    detector.close()
+
+def test_timeout_is_per_detector(threaded, prices):
+    # Queued behind each other on one worker, together they exceed the timeout
+    threaded.ml_detector.detect_isolation_forest_anomalies = _slow(
+        threaded.ml_detector.detect_isolation_forest_anomalies, 0.6)
+    threaded.lstm_detector.detect_lstm_anomalies = _slow(threaded.lstm_detector.detect_lstm_anomalies, 0.6)
+    results = threaded.detect_anomalies(prices, symbol='TEST')
+    assert threaded.timed_out == []
+    assert set(results) == {'zscore', 'isolation_forest', 'lstm'}
+
+def test_timed_out_thread_detector_is_replaced(threaded, prices):
+    abandoned = threaded.ml_detector
+    abandoned.detect_isolation_forest_anomalies = _slow(abandoned.detect_isolation_forest_anomalies, 2.0)
+    results = threaded.detect_anomalies(prices, symbol='TEST')
+    assert threaded.timed_out == ['isolation_forest']
+    assert 'isolation_forest' not in results
+    assert threaded.ml_detector is not abandoned
+    assert threaded.ml_detector.contamination == abandoned.contamination
+
+def _history_loader(prices, calls=None):
+    def load_data(symbol, watermark, warm_up_rows):
+        if calls is not None:
+            calls.append((symbol, watermark, warm_up_rows))
+        if watermark is None:
+            return prices
+        position = int((prices['date'] <= pd.Timestamp(watermark)).sum())
+        return prices.iloc[max(position - warm_up_rows, 0):].reset_index(drop=True)
+    return load_data
+
+@pytest.mark.parametrize('methods', [
+    ['bollinger_bands', 'zscore', 'volume'],
+    ['bollinger_bands', 'zscore', 'volume', 'isolation_forest', 'lstm'],
+])
+def test_incremental_matches_full_run(prices, tmp_path, methods):
+    split = len(prices) - 100
+    watermarks = WatermarkStore(str(tmp_path / 'watermarks.json'))
+    incremental = HybridAnomalyDetector(methods=methods, forecaster='ar', cache_size=0)
+    incremental.detect_incremental(_history_loader(prices.iloc[:split]), 'TEST', watermarks)
+    calls = []
+    new = incremental.detect_incremental(_history_loader(prices, calls), 'TEST', watermarks)
+    # Without a registry the models have to be fitted on the full history
+    uses_models = 'isolation_forest' in methods
+    assert calls == [('TEST', None if uses_models else to_watermark(prices['date'].iloc[split - 1]),
+                      incremental.warm_up_rows())]
+
+    full = HybridAnomalyDetector(methods=methods, forecaster='ar', cache_size=0).detect_anomalies(prices, 'TEST')
+    cutoff = prices['date'].iloc[split - 1]
+    for method in methods:
+        expected = [anomaly for anomaly in full[method] if anomaly.date > cutoff]
+        assert [anomaly.date for anomaly in new[method]] == [anomaly.date for anomaly in expected], method
+        # Rolling sums over a shorter history differ in the last bits
+        assert [anomaly.score for anomaly in new[method]] == pytest.approx(
+            [anomaly.score for anomaly in expected], rel=1e-8), method
+
+ALL_METHODS = ['bollinger_bands', 'zscore', 'volume', 'isolation_forest', 'lstm']
+
+def test_incremental_scores_new_bars_with_stored_models(prices, tmp_path):
+    split = len(prices) - 100
+    cutoff = prices['date'].iloc[split - 1]
+    registry = ModelRegistry(str(tmp_path / 'models'))
+    watermarks = WatermarkStore(str(tmp_path / 'watermarks.json'))
+    incremental = HybridAnomalyDetector(methods=ALL_METHODS, forecaster='ar',
+                                        model_registry=registry, cache_size=0)
+    calls = []
+    incremental.detect_incremental(_history_loader(prices.iloc[:split], calls), 'TEST', watermarks)
+    new = incremental.detect_incremental(_history_loader(prices, calls), 'TEST', watermarks)
+    warm_up_rows = incremental.warm_up_rows()
+    assert calls == [('TEST', None, warm_up_rows), ('TEST', to_watermark(cutoff), warm_up_rows)]
+
+    # The Isolation Forest scores as a scoring-only full run with the stored model
+    full = HybridAnomalyDetector(methods=['isolation_forest'], model_registry=registry,
+                                 cache_size=0).detect_anomalies(prices, 'TEST')
+    expected = [(anomaly.date, anomaly.score) for anomaly in full['isolation_forest'] if anomaly.date > cutoff]
+    assert [(anomaly.date, anomaly.score) for anomaly in new['isolation_forest']] == expected
+
+    # The forecaster scores with its checkpoint, which stays at the first run
+    forecaster = AutoregressiveAnomalyDetector(registry=registry)
+    expected = [anomaly.date for anomaly in forecaster.detect_checkpoint_batch(prices, 'TEST').to_results()
+                if anomaly.date > cutoff]
+    assert [anomaly.date for anomaly in new['lstm']] == expected
+    assert registry.latest('TEST', 'ar', forecaster.checkpoint_key).watermark == to_watermark(cutoff)
+
+class _AlwaysRefit(RefitPolicy):
+    def should_refit(self, record, payload, features) -> bool:
+        return True
+
+def test_incremental_loads_full_history_when_a_refit_is_due(prices, tmp_path):
+    split = len(prices) - 100
+    watermarks = WatermarkStore(str(tmp_path / 'watermarks.json'))
+    incremental = HybridAnomalyDetector(methods=ALL_METHODS, forecaster='ar', refit_policy=_AlwaysRefit(),
+                                        model_registry=ModelRegistry(str(tmp_path / 'models')), cache_size=0)
+    incremental.detect_incremental(_history_loader(prices.iloc[:split]), 'TEST', watermarks)
+    calls = []
+    incremental.detect_incremental(_history_loader(prices, calls), 'TEST', watermarks)
+    warm_up_rows = incremental.warm_up_rows()
+    assert calls == [('TEST', to_watermark(prices['date'].iloc[split - 1]), warm_up_rows),
+                     ('TEST', None, warm_up_rows)]
+
+def test_cascade_is_a_pure_screen(prices):
+    detector = HybridAnomalyDetector(methods=['zscore', 'volume', 'isolation_forest', 'lstm'],
+                                     forecaster='ar', cache_size=0)
+    report = detector.evaluate_cascade(prices, symbol='TEST', cascade=CascadeConfig())
+    assert report.extra == {'isolation_forest': 0, 'lstm': 0}
+    assert report.candidate_bars < report.bars
@@ -0,0 +1,83 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from anomaly_detection.incremental import IncrementalStatisticalDetector, RollingWindow
+from anomaly_detection.statistical_methods import StatisticalAnomalyDetector
+
+def _batch(data, window_size=20):
+    detector = StatisticalAnomalyDetector(window_size=window_size)
+    anomalies = (detector.detect_bollinger_anomalies(data) + detector.detect_zscore_anomalies(data)
+                 + detector.detect_volume_anomalies(data))
+    return sorted((anomaly.method, anomaly.date, anomaly.score) for anomaly in anomalies)
+
+def _assert_same(incremental, batch):
+    incremental = sorted((anomaly.method, anomaly.date, anomaly.score) for anomaly in incremental)
+    assert [row[:2] for row in incremental] == [row[:2] for row in batch]
+    assert [row[2] for row in incremental] == pytest.approx([row[2] for row in batch], rel=1e-6)
+
+@pytest.mark.parametrize('resync_interval', [None, 7])
+def test_rolling_window_matches_pandas_with_nans(resync_interval):
+    rng = np.random.default_rng(0)
+    values = rng.normal(100, 5, size=300)
+    values[[10, 11, 150]] = np.nan
+    values[200:230] = 42.0
+    window = RollingWindow(20, resync_interval)
+    means, stds = [], []
+    for value in values:
+        window.push(value)
+        means.append(window.mean() if window.is_full() else math.nan)
+        stds.append(window.std() if window.is_full() else math.nan)
+    rolling = pd.Series(values).rolling(20)
+    np.testing.assert_allclose(means, rolling.mean(), rtol=1e-9)
+    np.testing.assert_allclose(stds, rolling.std(), rtol=1e-6, atol=1e-9)
+
+def test_incremental_matches_batch(prices):
+    prices.loc[[300, 301, 1200], 'close'] = np.nan
+    prices.loc[700, 'volume'] = np.nan
+    detector = IncrementalStatisticalDetector()
+    _assert_same(detector.warm_up('TEST', prices), _batch(prices))
+
+def test_overlapping_updates_are_skipped(prices):
+    detector = IncrementalStatisticalDetector()
+    detector.warm_up('TEST', prices.iloc[:1500])
+    anomalies = []
+    # Each fetch overlaps the bars already pushed
+    for start in range(1400, len(prices), 100):
+        anomalies += detector.warm_up('TEST', prices.iloc[start:start + 150])
+    expected = [row for row in _batch(prices) if row[1] > prices['date'].iloc[1499]]
+    _assert_same(anomalies, expected)
+    assert detector.states['TEST']['bars'] == len(prices)
+
+def test_snapshot_round_trip(prices):
+    detector = IncrementalStatisticalDetector()
+    detector.warm_up('TEST', prices.iloc[:1000])
+    restored = IncrementalStatisticalDetector.restore(detector.snapshot())
+    assert restored.last_date('TEST') == prices['date'].iloc[999]
+    # A replayed bar is skipped and new bars score as without the restart
+    assert restored.warm_up('TEST', prices.iloc[990:1000]) == []
+    expected = detector.warm_up('TEST', prices.iloc[1000:])
+    _assert_same(restored.warm_up('TEST', prices.iloc[1000:]),
+                 sorted((anomaly.method, anomaly.date, anomaly.score) for anomaly in expected))
+
+def test_load_snapshot_keeps_detector_config(prices):
+    saved = IncrementalStatisticalDetector(num_std=2.0)
+    saved.warm_up('TEST', prices.iloc[:1000])
+    detector = IncrementalStatisticalDetector(num_std=3.0, resync_interval=5)
+    detector.load_snapshot(saved.snapshot())
+    assert detector.num_std == 3.0
+    assert detector.states['TEST']['close'].resync_interval == 5
+
+    expected = IncrementalStatisticalDetector(num_std=3.0)
+    expected.warm_up('TEST', prices.iloc[:1000])
+    _assert_same(detector.warm_up('TEST', prices.iloc[1000:]),
+                 sorted((anomaly.method, anomaly.date, anomaly.score)
+                        for anomaly in expected.warm_up('TEST', prices.iloc[1000:])))
+
+def test_load_snapshot_rejects_other_window_size(prices):
+    saved = IncrementalStatisticalDetector(window_size=20)
+    saved.warm_up('TEST', prices.iloc[:100])
+    detector = IncrementalStatisticalDetector(window_size=30)
+    with pytest.raises(ValueError):
+        detector.load_snapshot(saved.snapshot())
+    assert not detector.has_symbol('TEST')
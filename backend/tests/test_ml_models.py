@@ -0,0 +1,255 @@
+import os
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+import sklearn
+from sklearn.ensemble import IsolationForest
+from anomaly_detection.autoregressive import AutoregressiveAnomalyDetector
+from anomaly_detection.ml_models import (LSTMAnomalyDetector, MLAnomalyDetector, OnlineIsolationForestDetector,
+                                         SequenceForecastDetector, TrainingBudget)
+from anomaly_detection.model_registry import (AgeRefitPolicy, DriftRefitPolicy, ManualRefitPolicy,
+                                              ModelRegistry)
+
+def test_sequence_forecaster_requires_its_model_methods():
+    class TrainOnly(SequenceForecastDetector):
+        def train(self, data, epochs=50, batch_size=32, symbol=None):
+            return None
+
+    class WithoutCheckpoints(TrainOnly):
+        def _predict_sequences(self, data, fit_scaler=True):
+            return None
+
+        def _predict_scaled(self, scaled_data, starts=None):
+            return None
+
+    with pytest.raises(TypeError):
+        TrainOnly()
+    with pytest.raises(TypeError):
+        WithoutCheckpoints()
+    assert AutoregressiveAnomalyDetector().sequence_length == 10
+
+def _spy_predict_scaled(detector):
+    sizes = []
+    predict_scaled = detector._predict_scaled
+    def counting_predict_scaled(scaled_data, starts=None):
+        sizes.append(len(scaled_data) - detector.sequence_length if starts is None else len(starts))
+        return predict_scaled(scaled_data, starts)
+    detector._predict_scaled = counting_predict_scaled
+    return sizes
+
+def test_error_stats_are_recorded_per_data(prices):
+    detector = AutoregressiveAnomalyDetector()
+    data = prices.iloc[:500]
+    detector.train(data)
+    sizes = _spy_predict_scaled(detector)
+
+    scaled = detector._scale(data, fit_scaler=False)
+    errors = np.abs(scaled[detector.sequence_length:] - detector._predict_scaled(scaled))
+    sizes.clear()
+    assert detector._error_stats_for(data, scaled) == (np.mean(errors), np.std(errors))
+    assert sizes == []
+
+    # Other closes are a cache miss, and their stats replace the recorded ones
+    other = prices.iloc[500:900].reset_index(drop=True)
+    other_scaled = detector._scale(other, fit_scaler=False)
+    other_stats = detector._error_stats_for(other, other_scaled)
+    assert sizes == [390]
+    assert other_stats != (np.mean(errors), np.std(errors))
+    assert detector._error_stats_for(other, other_scaled) == other_stats
+    assert sizes == [390]
+
+@pytest.mark.parametrize('recorded', [True, False])
+def test_sequence_forecast_rows_match_the_full_run(prices, recorded):
+    detector = AutoregressiveAnomalyDetector()
+    data = prices.iloc[:800]
+    detector.train(data)
+    full = detector.detect_lstm_batch(data).to_results()
+    rows = np.concatenate([np.arange(0, 800, 7), [5, 12, 12, 799, 900]])
+    if not recorded:
+        detector._forget_forecasts()
+    sizes = _spy_predict_scaled(detector)
+
+    subset = detector.detect_lstm_batch(data, rows).to_results()
+    in_rows = set(data['date'].iloc[rows[rows < len(data)]])
+    assert [(a.date, a.score) for a in subset] == [(a.date, a.score) for a in full if a.date in in_rows]
+    # Unknown stats cost one full pass that also serves the candidates
+    assert sizes == ([] if recorded else [790])
+    assert detector.detect_lstm_batch(data, np.array([3, 1000])).to_results() == []
+
+@pytest.fixture
+def predict_sizes(monkeypatch):
+    """Number of sequences passed to each Keras predict() call"""
+    # Patch the class, a cold start replaces the model instance
+    sizes = []
+    model_class = type(LSTMAnomalyDetector().model)
+    predict = model_class.predict
+    def counting_predict(model, X, *args, **kwargs):
+        sizes.append(len(X))
+        return predict(model, X, *args, **kwargs)
+    monkeypatch.setattr(model_class, 'predict', counting_predict)
+    return sizes
+
+@pytest.mark.parametrize('use_registry', [False, True])
+def test_lstm_cascade_forecasts_no_more_than_a_full_run(prices, tmp_path, predict_sizes, use_registry):
+    data = prices.iloc[:400]
+    rows = np.arange(20, 400, 3)
+
+    def run(cascade):
+        registry = ModelRegistry(str(tmp_path / str(cascade))) if use_registry else None
+        detector = LSTMAnomalyDetector(registry=registry)
+        predict_sizes.clear()
+        detector.train(data, epochs=1, symbol='TEST')
+        detector.detect_lstm_batch(data, rows if cascade else None)
+        return list(predict_sizes), detector
+
+    full_sizes, _ = run(cascade=False)
+    cascade_sizes, detector = run(cascade=True)
+    assert full_sizes == [390]
+    assert cascade_sizes == [390]
+
+    # Reused forecasts flag the candidates exactly as the full run does
+    full = detector.detect_lstm_batch(data).to_results()
+    in_rows = set(data['date'].iloc[rows])
+    assert ([anomaly.date for anomaly in detector.detect_lstm_batch(data, rows).to_results()]
+            == [anomaly.date for anomaly in full if anomaly.date in in_rows])
+
+    if use_registry:
+        # A scoring-only run restored from the checkpoint forecasts only the candidates
+        restored = LSTMAnomalyDetector(registry=detector.registry)
+        predict_sizes.clear()
+        restored.train(data, epochs=1, symbol='TEST')
+        restored.detect_lstm_batch(data, rows)
+        assert predict_sizes == [len(rows)]
+
+def test_train_many_reports_each_symbol(prices):
+    data_by_symbol = {'AAA': prices.iloc[:300], 'BBB': prices.iloc[300:420], 'CCC': prices.iloc[420:425]}
+    detector = LSTMAnomalyDetector(training_budget=TrainingBudget(max_epochs=2, validation_fraction=0.2))
+    reports = detector.train_many(data_by_symbol, epochs=5)
+
+    assert list(reports) == ['AAA', 'BBB', 'CCC']
+    assert detector.training_reports == reports
+    assert [(r.train_sequences, r.validation_sequences) for r in reports.values()] == [(232, 58), (88, 22), (0, 0)]
+    for symbol, report in reports.items():
+        assert report.symbol == symbol
+        assert report.max_epochs == 2
+        assert report.stop_reason == reports['AAA'].stop_reason
+    assert reports['AAA'].best_val_loss > 0 and reports['BBB'].best_val_loss > 0
+    assert reports['CCC'].best_val_loss is None and reports['CCC'].seconds == 0
+    # Time is split by training sequences
+    assert reports['AAA'].seconds == pytest.approx(reports['BBB'].seconds * 232 / 88)
+
+def _online_forest(**kwargs):
+    return OnlineIsolationForestDetector(window_size=100, n_groups=4, trees_per_group=10, **kwargs)
+
+def test_online_forest_threshold_tracks_the_window(prices):
+    detector = _online_forest()
+    detector.warm_up('TEST', prices.iloc[:300])
+    state = detector.states['TEST']
+    window = np.asarray(state['window'])
+    assert len(window) == 100
+    assert state['offset'] == np.percentile(detector._score(state, window), 10)
+
+    # A calmer regime moves the threshold with the window
+    offset = state['offset']
+    calm = prices.iloc[300:450].assign(close=100.0, volume=1e6)
+    calm.loc[calm.index[::2], 'close'] = 100.5
+    detector.warm_up('TEST', calm)
+    window = np.asarray(state['window'])
+    assert state['offset'] != offset
+    assert state['offset'] == np.percentile(detector._score(state, window), 10)
+
+def test_online_forest_replaces_the_oldest_group(prices):
+    detector = _online_forest()
+    bars = prices.iloc[:201]
+    # 100 bars build all four groups, the first bar has no changes
+    detector.warm_up('TEST', bars.iloc[:101])
+    state = detector.states['TEST']
+    first_groups = list(state['groups'])
+    assert [group.random_state for group in first_groups] == [42, 43, 44, 45]
+
+    detector.warm_up('TEST', bars.iloc[101:125])
+    assert list(state['groups']) == first_groups
+
+    detector.warm_up('TEST', bars.iloc[125:126])
+    assert list(state['groups'])[:3] == first_groups[1:]
+    assert [group.random_state for group in state['groups']] == [43, 44, 45, 46]
+
+    # After a full window every group has been replaced
+    detector.warm_up('TEST', bars.iloc[126:])
+    assert not set(map(id, state['groups'])) & set(map(id, first_groups))
+    assert [group.random_state for group in state['groups']] == [46, 47, 48, 49]
+
+def test_online_forest_is_deterministic(prices):
+    def run(random_state):
+        anomalies = _online_forest(random_state=random_state).warm_up('TEST', prices.iloc[:500])
+        return [(anomaly.date, anomaly.score) for anomaly in anomalies]
+
+    assert run(7) == run(7)
+    assert run(7) != run(8)
+
+@pytest.fixture
+def forest_fits(monkeypatch):
+    """Number of IsolationForest.fit() calls"""
+    fits = []
+    fit = IsolationForest.fit
+    def counting_fit(forest, X, *args, **kwargs):
+        fits.append(len(X))
+        return fit(forest, X, *args, **kwargs)
+    monkeypatch.setattr(IsolationForest, 'fit', counting_fit)
+    return fits
+
+def _forest_anomalies(detector, data, **kwargs):
+    return [(anomaly.date, anomaly.score) for anomaly in
+            detector.detect_isolation_forest_anomalies(data, symbol='TEST', **kwargs)]
+
+def test_registered_forest_is_fitted_once(prices, tmp_path, forest_fits):
+    registry = ModelRegistry(str(tmp_path))
+    first = _forest_anomalies(MLAnomalyDetector(registry=registry), prices)
+    # A new detector, as in the next scheduled run, loads the stored model
+    second = _forest_anomalies(MLAnomalyDetector(registry=registry), prices)
+    assert len(forest_fits) == 1
+    assert len(registry.versions('TEST', 'isolation_forest', MLAnomalyDetector().feature_key)) == 1
+
+    fresh = [(anomaly.date, anomaly.score) for anomaly in
+             MLAnomalyDetector().detect_isolation_forest_anomalies(prices)]
+    assert first == second == fresh
+
+def test_stored_forest_is_refitted_when_older_than_max_age(prices, tmp_path, forest_fits):
+    registry = ModelRegistry(str(tmp_path))
+    detector = MLAnomalyDetector(registry=registry, refit_policy=AgeRefitPolicy(max_age=timedelta(days=7)))
+    _forest_anomalies(detector, prices)
+    _forest_anomalies(detector, prices)
+    assert len(forest_fits) == 1
+
+    record = registry.latest('TEST', 'isolation_forest', detector.feature_key)
+    record.trained_at = (datetime.utcnow() - timedelta(days=8)).isoformat()
+    registry._write_index(os.path.dirname(record.path), [record])
+    _forest_anomalies(detector, prices)
+    assert len(forest_fits) == 2
+    assert registry.latest('TEST', 'isolation_forest', detector.feature_key).version == 2
+
+@pytest.mark.parametrize('policy, refits', [(DriftRefitPolicy(max_shift=3.0), True),
+                                            (ManualRefitPolicy(), False)])
+def test_stored_forest_is_refitted_on_drift(prices, tmp_path, forest_fits, policy, refits):
+    detector = MLAnomalyDetector(registry=ModelRegistry(str(tmp_path)), refit_policy=policy)
+    history = prices.iloc[:1000]
+    _forest_anomalies(detector, history)
+    _forest_anomalies(detector, history)
+    assert len(forest_fits) == 1
+
+    # Prices and volumes far outside the training range
+    drifted = prices.assign(close=prices['close'] * 5, volume=prices['volume'] * 5)
+    _forest_anomalies(detector, drifted)
+    assert len(forest_fits) == (2 if refits else 1)
+
+def test_stored_forest_is_refitted_on_request_or_other_sklearn(prices, tmp_path, forest_fits, monkeypatch):
+    detector = MLAnomalyDetector(registry=ModelRegistry(str(tmp_path)), refit_policy=ManualRefitPolicy())
+    _forest_anomalies(detector, prices)
+    _forest_anomalies(detector, prices, force_refit=True)
+    assert len(forest_fits) == 2
+
+    monkeypatch.setattr(sklearn, '__version__', '0.0')
+    _forest_anomalies(detector, prices)
+    assert len(forest_fits) == 3
+    _forest_anomalies(detector, prices)
+    assert len(forest_fits) == 3
@@ -0,0 +1,26 @@
+import os
+import pytest
+from anomaly_detection.model_registry import ModelRegistry, RefitPolicy
+
+def test_old_versions_are_pruned(tmp_path):
+    registry = ModelRegistry(str(tmp_path), keep_versions=2)
+    records = [registry.save('TEST', 'isolation_forest', 'features', f"2024-01-0{i}", {'version': i})
+               for i in range(1, 5)]
+    assert [record.version for record in registry.versions('TEST', 'isolation_forest', 'features')] == [3, 4]
+    assert [os.path.exists(record.path) for record in records] == [False, False, True, True]
+    assert registry.load(registry.latest('TEST', 'isolation_forest', 'features')) == {'version': 4}
+
+def test_loaded_payloads_are_bounded(tmp_path):
+    registry = ModelRegistry(str(tmp_path), max_loaded=2)
+    records = [registry.save(symbol, 'isolation_forest', 'features', '2024-01-01', {'symbol': symbol})
+               for symbol in ('A', 'B', 'C')]
+    assert len(registry._loaded) == 2
+    assert registry.load(records[0]) == {'symbol': 'A'}
+    assert list(registry._loaded) == [records[2].path, records[0].path]
+
+def test_refit_policy_is_abstract():
+    class Incomplete(RefitPolicy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
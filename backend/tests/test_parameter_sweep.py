@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from anomaly_detection.parameter_sweep import StatisticalParameterSweep
+from anomaly_detection.statistical_methods import StatisticalAnomalyDetector
+
+WINDOWS = [10, 20, 50]
+NUM_STDS = [1.5, 2.0, 3.0]
+
+def _detector_counts(data, window, num_std):
+    detector = StatisticalAnomalyDetector(window_size=window, num_std=num_std)
+    return {
+        'bollinger_bands': len(detector.detect_bollinger_anomalies(data)),
+        'zscore': len(detector.detect_zscore_anomalies(data)),
+        'volume_zscore': len(detector.detect_volume_anomalies(data)),
+    }
+
+@pytest.mark.parametrize('missing', [[], [300], [5, 700, 701, 1500]])
+def test_sweep_counts_match_detectors(prices, missing):
+    prices.loc[missing, 'close'] = np.nan
+    prices.loc[missing[::2], 'volume'] = np.nan
+    result = StatisticalParameterSweep(WINDOWS, NUM_STDS).sweep(prices)
+    for window in WINDOWS:
+        for num_std in NUM_STDS:
+            expected = _detector_counts(prices, window, num_std)
+            for method, count in expected.items():
+                assert result.counts[method].loc[window, num_std] == count, (method, window, num_std)
@@ -0,0 +1,68 @@
+import math
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from anomaly_detection.statistical_methods import SlidingMedianMAD, _IndexableSkiplist
+
+def _brute_force_mad(window: np.ndarray) -> float:
+    if np.isnan(window).any():
+        return math.nan
+    return float(np.median(np.abs(window - np.median(window))))
+
+def _series(length: int, duplicates: bool, missing) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    if duplicates:
+        # Few distinct values, so windows are full of ties
+        values = rng.integers(0, 6, length).astype(float)
+    else:
+        values = rng.normal(100, 5, length)
+    values[list(missing)] = np.nan
+    return values
+
+def test_skiplist_matches_sorted_list_with_duplicates():
+    rng = random.Random(3)
+    skiplist = _IndexableSkiplist(expected_size=50)
+    reference = []
+    for _ in range(2000):
+        if reference and rng.random() < 0.45:
+            value = rng.choice(reference)
+            skiplist.remove(value)
+            reference.remove(value)
+        else:
+            value = float(rng.randint(0, 10))
+            skiplist.insert(value)
+            reference.append(value)
+        reference.sort()
+        assert len(skiplist) == len(reference)
+        assert [skiplist[i] for i in range(len(reference))] == reference
+
+def test_skiplist_remove_missing_value_raises():
+    skiplist = _IndexableSkiplist()
+    skiplist.insert(1.0)
+    with pytest.raises(KeyError):
+        skiplist.remove(2.0)
+
+@pytest.mark.parametrize('window_size', [1, 2, 7, 20])
+@pytest.mark.parametrize('duplicates', [False, True])
+@pytest.mark.parametrize('missing', [[], [30], [5, 90, 91, 250]])
+def test_sliding_median_mad_matches_reference(window_size, duplicates, missing):
+    values = _series(400, duplicates, missing)
+    expected_median = pd.Series(values).rolling(window_size).median().to_numpy()
+
+    window = SlidingMedianMAD(window_size)
+    for i, value in enumerate(values):
+        window.push(value)
+        if not window.is_full():
+            continue
+        median = window.median()
+        expected_mad = _brute_force_mad(values[i + 1 - window_size:i + 1])
+        if np.isnan(expected_median[i]):
+            assert math.isnan(median)
+            assert math.isnan(window.mad(median))
+        else:
+            assert median == pytest.approx(expected_median[i])
+            assert window.mad(median) == pytest.approx(expected_mad)
+            assert window.mad() == pytest.approx(expected_mad)
@@ -0,0 +1,65 @@
+import pandas as pd
+
+from anomaly_detection import feature_store
+from anomaly_detection.feature_store import FeatureStore
+from anomaly_detection.statistical_methods import StatisticalAnomalyDetector
+
+def _dates(anomalies):
+    return [anomaly.date for anomaly in anomalies]
+
+def test_detector_has_no_cache_across_calls(prices):
+    detector = StatisticalAnomalyDetector()
+    detector.detect_zscore_anomalies(prices.iloc[:len(prices) // 2])
+    strided = prices.iloc[::2]
+    expected = StatisticalAnomalyDetector().detect_zscore_anomalies(strided.copy())
+    assert _dates(detector.detect_zscore_anomalies(strided)) == _dates(expected)
+
+def test_detector_sees_in_place_edits(prices):
+    detector = StatisticalAnomalyDetector()
+    detector.detect_zscore_anomalies(prices)
+    prices.loc[prices.index[::7], 'close'] += 5
+    expected = StatisticalAnomalyDetector().detect_zscore_anomalies(prices.copy())
+    assert _dates(detector.detect_zscore_anomalies(prices)) == _dates(expected)
+
+def test_feature_store_keys_views_and_edits_apart(prices):
+    detector = StatisticalAnomalyDetector(feature_store=FeatureStore())
+    detector.detect_zscore_anomalies(prices.iloc[:len(prices) // 2])
+    strided = prices.iloc[::2]
+    expected = StatisticalAnomalyDetector().detect_zscore_anomalies(strided.copy())
+    assert _dates(detector.detect_zscore_anomalies(strided)) == _dates(expected)
+
+    prices.loc[prices.index[::7], 'close'] += 5
+    expected = StatisticalAnomalyDetector().detect_zscore_anomalies(prices.copy())
+    assert _dates(detector.detect_zscore_anomalies(prices)) == _dates(expected)
+
+def test_rolling_window_computed_once_per_call(prices, monkeypatch):
+    calls = []
+    rolling = pd.Series.rolling
+    def counting_rolling(self, *args, **kwargs):
+        calls.append(self.name)
+        return rolling(self, *args, **kwargs)
+    monkeypatch.setattr(pd.Series, 'rolling', counting_rolling)
+
+    detector = StatisticalAnomalyDetector()
+    for detect, column in [(detector.detect_zscore_anomalies, 'close'),
+                           (detector.detect_zscore_batch, 'close'),
+                           (detector.detect_bollinger_anomalies, 'close'),
+                           (detector.detect_volume_anomalies, 'volume')]:
+        calls.clear()
+        detect(prices)
+        assert calls == [column]
+
+def test_feature_store_fingerprints_once_per_call(prices, monkeypatch):
+    calls = []
+    fingerprint = feature_store.data_fingerprint
+    def counting_fingerprint(data):
+        calls.append(len(data))
+        return fingerprint(data)
+    monkeypatch.setattr(feature_store, 'data_fingerprint', counting_fingerprint)
+
+    detector = StatisticalAnomalyDetector(feature_store=FeatureStore())
+    for detect in [detector.detect_zscore_anomalies, detector.detect_bollinger_anomalies,
+                   detector.detect_volume_anomalies, detector.threshold_ratios]:
+        calls.clear()
+        detect(prices)
+        assert len(calls) == 1
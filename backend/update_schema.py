@@ -1,9 +1,86 @@
-from sqlalchemy import text
+import sys
+from typing import Dict, Optional
+from sqlalchemy import text, inspect
 from data_storage.database import DatabaseManager
 
-def update_schema():
-    """Update the database schema to add missing columns"""
-    db = DatabaseManager()
+# Unique keys and indexes of data_storage/models.py that existing tables may lack:
+# (table, index name, columns, unique)
+INDEXES = [
+    ('stock_prices', 'uq_stock_prices_stock_id_date', ('stock_id', 'date'), True),
+    ('anomalies', 'uq_anomalies_stock_id_date_method', ('stock_id', 'date', 'detection_method'), True),
+    ('anomalies', 'ix_anomalies_score', ('score',), False),
+]
+
+def dedupe_stock_prices(session) -> int:
+    """Delete duplicate bars, keeping the most recently stored row of each stock and date"""
+    result = session.execute(text("""
+        DELETE FROM stock_prices
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM stock_prices GROUP BY stock_id, date
+        )
+    """))
+    return result.rowcount
+
+def dedupe_anomalies(session) -> int:
+    """Delete duplicate anomalies, keeping the newest row and any verification"""
+    session.execute(text("""
+        UPDATE anomalies SET is_verified = TRUE
+        WHERE id IN (
+            SELECT MAX(id) FROM anomalies
+            GROUP BY stock_id, date, detection_method
+            HAVING COUNT(*) > 1 AND MAX(CASE WHEN is_verified THEN 1 ELSE 0 END) = 1
+        )
+    """))
+    result = session.execute(text("""
+        DELETE FROM anomalies
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM anomalies GROUP BY stock_id, date, detection_method
+        )
+    """))
+    return result.rowcount
+
+DEDUPE = {
+    'stock_prices': dedupe_stock_prices,
+    'anomalies': dedupe_anomalies,
+}
+
+def _has_index(inspector, table: str, name: str, columns, unique: bool) -> bool:
+    """Check for the index by name, or an equivalent index on the same columns"""
+    existing = inspector.get_indexes(table) + inspector.get_unique_constraints(table)
+    # Unique constraints carry no 'unique' key
+    return any(
+        index['name'] == name
+        or (tuple(index['column_names']) == tuple(columns) and (not unique or index.get('unique', True)))
+        for index in existing
+    )
+
+def migrate_indexes(session) -> Dict[str, int]:
+    """
+    Add the composite unique keys and the score index, deduplicating first
+
+    Args:
+        session: Open session; the caller commits
+
+    Returns:
+        Dict[str, int]: Duplicate rows deleted per table
+    """
+    inspector = inspect(session.connection())
+    deleted = {}
+    for table, name, columns, unique in INDEXES:
+        if _has_index(inspector, table, name, columns, unique):
+            continue
+        if unique and table not in deleted:
+            deleted[table] = DEDUPE[table](session)
+            print(f"Removed {deleted[table]} duplicate rows from {table}")
+        session.execute(text(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({', '.join(columns)})"
+        ))
+        print(f"Created index {name} on {table}")
+    return deleted
+
+def update_schema(connection_string: Optional[str] = None):
+    """Update the database schema to add missing columns and indexes"""
+    db = DatabaseManager(connection_string) if connection_string else DatabaseManager()
     session = db.Session()
     
     try:
@@ -37,6 +114,8 @@ def update_schema():
             """))
             print("Added sector column to stocks table")
         
+        migrate_indexes(session)
+        
         session.commit()
         print("Schema update completed successfully")
         
@@ -47,4 +126,4 @@ def update_schema():
         session.close()
 
 if __name__ == "__main__":
-    update_schema() 
\ No newline at end of file
+    update_schema(sys.argv[1] if len(sys.argv) > 1 else None) 
\ No newline at end of file